@@ -0,0 +1,132 @@
+import asyncio
+import time
+from typing import Dict, Any, Optional
+from config import Config
+
+class AccountStateCache:
+    """
+    Cached account state: balance, equity, margin, free margin
+    - Refreshed in the background every refresh_interval_seconds (one
+      account_info call on the MT5 executor thread)
+    - invalidate() on order fill / close wakes the refresher immediately;
+      async readers of an invalidated or too-old state wait for that refresh
+    - Sync readers (stats, Telegram thread) get the cached value; None until
+      the first successful load - never a terminal call on the event loop
+    """
+
+    FIELDS = ("balance", "equity", "margin", "free_margin")
+
+    def __init__(self, config: Config, mt5):
+        self.config = config
+        self.mt5 = mt5  # AsyncMT5Client
+
+        cache_config = config.get("account_cache", {})
+        self.enabled = cache_config.get("enabled", True)
+        self.refresh_interval = cache_config.get("refresh_interval_seconds", 5)
+        self.max_age = cache_config.get("max_age_seconds", 15)
+
+        self.balance: Optional[float] = None
+        self.equity: Optional[float] = None
+        self.margin: Optional[float] = None
+        self.free_margin: Optional[float] = None
+        self.updated_at: Optional[float] = None  # time.monotonic()
+
+        # Bumped by invalidate(); a fetch is current only if none happened meanwhile
+        self._generation = 0
+        self._loaded_generation = -1
+        self._inflight: Optional[asyncio.Future] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task = None
+
+        self.refreshes = 0
+        self.failures = 0
+        self.invalidations = 0
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        await self.refresh()
+        if self.enabled:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def invalidate(self, *_):
+        """Mark the cached state stale (order filled / position closed)"""
+        self._generation += 1
+        self.invalidations += 1
+        if self._loop and self._wake:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def is_fresh(self) -> bool:
+        return (self.enabled and self.updated_at is not None
+                and self._loaded_generation == self._generation
+                and time.monotonic() - self.updated_at <= self.max_age)
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.refresh()
+
+    async def refresh(self):
+        """Fetch account info once; concurrent callers share the same fetch"""
+        task = self._inflight
+        if task is None or task.done():
+            task = self._inflight = asyncio.ensure_future(self._fetch())
+        await asyncio.shield(task)
+
+    async def _fetch(self):
+        generation = self._generation
+        try:
+            info = await self.mt5.get_account_info()
+        except Exception as e:
+            info = None
+            print(f"⚠️ Account info refresh error: {str(e)}")
+        self._apply(info, generation)
+
+    def _apply(self, info: Optional[Dict[str, float]], generation: int):
+        if info is None:
+            self.failures += 1
+            return  # Keep the last known state
+        for field in self.FIELDS:
+            setattr(self, field, info[field])
+        self.updated_at = time.monotonic()
+        self._loaded_generation = generation
+        self.refreshes += 1
+
+    async def get_balance(self) -> Optional[float]:
+        """Balance for order sizing - refetched only when invalidated or too old (None if never loaded)"""
+        if not self.is_fresh():
+            await self.refresh()
+        return self.balance
+
+    def get_balance_sync(self) -> Optional[float]:
+        """Last known balance for sync callers (None if never loaded)"""
+        return self.balance
+
+    def get_stats(self) -> Dict[str, Any]:
+        age = time.monotonic() - self.updated_at if self.updated_at is not None else None
+        return {
+            "enabled": self.enabled,
+            "balance": self.balance,
+            "equity": self.equity,
+            "margin": self.margin,
+            "free_margin": self.free_margin,
+            "age_seconds": round(age, 3) if age is not None else None,
+            "stale": not self.is_fresh(),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "invalidations": self.invalidations
+        }
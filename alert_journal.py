@@ -0,0 +1,190 @@
+import asyncio
+import glob
+import gzip
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+from config import Config
+
+class AlertJournal:
+    """
+    Durable append-only journal of every received alert
+    - 'recv' record when an alert arrives (raw payload + receive time + source)
+    - 'outcome' record when handling finishes (status, message, latency)
+    Records are buffered in memory and written + fsynced in batches by a
+    background task. Segments rotate at max_file_mb and are gzip-compressed.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        journal_config = config.get("alert_journal", {})
+        self.enabled = journal_config.get("enabled", True)
+        self.directory = journal_config.get("directory", "journal")
+        self.flush_interval = journal_config.get("flush_interval_ms", 200) / 1000
+        self.max_bytes = int(journal_config.get("max_file_mb", 50) * 1024 * 1024)
+        self.compress_rotated = journal_config.get("compress_rotated", True)
+
+        # Sequence numbers are unique per process; session separates restarts
+        self.session = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._sequence = itertools.count(1)
+
+        self._buffer: List[str] = []
+        self._inflight: Dict[int, Tuple[int, float]] = {}  # id(alert) -> (seq, perf_counter at receive)
+        self._file = None
+        self._file_path = None
+        self._segment = 0
+        self._write_lock = threading.Lock()
+        self._flush_task = None
+
+        self.records_written = 0
+        self.segments_rotated = 0
+
+    async def start(self):
+        """Open the first segment and start the background flush task"""
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._open_segment()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        print(f"✅ Alert journal started: {self._file_path}")
+
+    async def stop(self):
+        """Flush everything still buffered and close the segment"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await asyncio.to_thread(self.flush)
+        with self._write_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def record_received(self, payload: Any, source: str = "webhook") -> int:
+        """Journal a raw alert payload as it arrives; returns its sequence number"""
+        seq = next(self._sequence)
+        if self.enabled:
+            self._buffer.append(json.dumps({
+                "kind": "recv",
+                "session": self.session,
+                "seq": seq,
+                "ts": time.time(),
+                "source": source,
+                "payload": payload
+            }, default=str))
+        return seq
+
+    def record_outcome(self, seq: int, status: str, message: str = "",
+                       latency_ms: Optional[float] = None):
+        """Journal how an alert was handled"""
+        if not self.enabled:
+            return
+        self._buffer.append(json.dumps({
+            "kind": "outcome",
+            "session": self.session,
+            "seq": seq,
+            "ts": time.time(),
+            "status": status,
+            "message": message,
+            "latency_ms": round(latency_ms, 3) if latency_ms is not None else None
+        }))
+
+    def track(self, alert: Any, seq: int):
+        """Remember which journal record a queued alert belongs to"""
+        self._inflight[id(alert)] = (seq, time.perf_counter())
+
+    def complete(self, alert: Any, status: str, message: str = ""):
+        """Record the outcome of a tracked alert with receive-to-done latency"""
+        tracked = self._inflight.pop(id(alert), None)
+        if tracked is None:
+            return
+        seq, received = tracked
+        self.record_outcome(seq, status, message, (time.perf_counter() - received) * 1000)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._buffer:
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception as e:
+                    print(f"❌ Alert journal flush error: {str(e)}")
+
+    def flush(self):
+        """Write buffered records, fsync once, rotate if the segment is full"""
+        if not self._buffer:
+            return
+        # Swap the buffer - new records keep appending while we write
+        lines, self._buffer = self._buffer, []
+
+        with self._write_lock:
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._open_segment()
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.records_written += len(lines)
+
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+
+    def _open_segment(self):
+        self._segment += 1
+        self._file_path = os.path.join(self.directory, f"alerts-{self.session}-{self._segment:04d}.jsonl")
+        self._file = open(self._file_path, "a", encoding="utf-8")
+
+    def _rotate(self):
+        """Close the full segment, compress it and open the next one"""
+        closed_path = self._file_path
+        self._file.close()
+        self._open_segment()
+        self.segments_rotated += 1
+
+        if self.compress_rotated:
+            with open(closed_path, "rb") as src, gzip.open(closed_path + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(closed_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "file": self._file_path,
+            "buffered": len(self._buffer),
+            "records_written": self.records_written,
+            "segments_rotated": self.segments_rotated,
+            "inflight": len(self._inflight)
+        }
+
+
+def read_journal(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield journal records from a segment file (.jsonl or .jsonl.gz) or a
+    directory of segments, in file-name order
+    """
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "alerts-*.jsonl*")))
+    else:
+        files = [path]
+
+    for file_path in files:
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn last line after a crash - skip it
+                    continue
@@ -1,150 +1,270 @@
-from typing import Dict, Any, List, Optional
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Deque, Callable
 from datetime import datetime, timedelta
 from config import Config
 from models import Alert
 
+# Precompiled validation rules - built once at import, O(1) membership checks
+VALID_SYMBOLS = frozenset(['XAUUSD', 'EURUSD', 'GBPUSD', 'USDJPY', 'USDCAD',
+                           'AUDUSD', 'NZDUSD', 'EURJPY', 'GBPJPY', 'AUDJPY'])
+VALID_TIMEFRAMES = frozenset(['1h', '15m', '5m', '1d'])
+SIGNAL_RULES = {
+    'bias': frozenset(['bull', 'bear']),
+    'trend': frozenset(['bull', 'bear']),
+    'entry': frozenset(['buy', 'sell']),
+    'reversal': frozenset(['reversal_bull', 'reversal_bear', 'bull', 'bear']),
+    'exit': frozenset(['bull', 'bear'])
+}
+
 class AlertProcessor:
-    def __init__(self, config: Config):
+    # Alerts kept per ring buffer for get_recent_alerts()
+    HISTORY_SIZE = 200
+    
+    def __init__(self, config: Config, idempotency_store=None,
+                 clock: Callable[[], float] = time.monotonic):
         self.config = config
-        self.recent_alerts: List[Alert] = []
         self.alert_window = timedelta(minutes=5)
+        # Dedup / history clock (seconds) - a replay drives it from journal timestamps
+        self.clock = clock
+        
+        # Optional persistent delivery-key store (survives restarts)
+        self.idempotency_store = idempotency_store
+        
+        # Dedup index: (type, symbol, tf, signal) -> receive times on self.clock (oldest first)
+        self._dedup_index: Dict[Tuple[str, str, str, str], Deque[float]] = {}
+        # Global (time, key) log in arrival order - lets expiry pop from the front only
+        self._expiry_log: Deque[Tuple[float, Tuple[str, str, str, str]]] = deque()
+        
+        # Ring buffers of (time, alert) for get_recent_alerts()
+        self._recent_all: Deque[Tuple[float, Alert]] = deque(maxlen=self.HISTORY_SIZE)
+        self._recent_by_symbol: Dict[str, Deque[Tuple[float, Alert]]] = {}
+        self._recent_by_type: Dict[str, Deque[Tuple[float, Alert]]] = {}
+        
+        # Reason code of the last rejection (for the decision audit)
+        self.last_reject_reason: Optional[str] = None
     
-    def validate_alert(self, alert_data: Dict[str, Any]) -> bool:
-        """Validate incoming alert"""
+    def validate_alert(self, alert_data: Dict[str, Any]) -> Optional[Alert]:
+        """
+        Validate incoming alert
+        Returns the validated Alert (passed straight to the engine) or None
+        """
+        self.last_reject_reason = None
         try:
             print(f"📨 Received alert: {alert_data}")
             
-            # Add timestamp if not present
-            if 'timestamp' not in alert_data:
-                alert_data['timestamp'] = datetime.now().isoformat()
-            
-            # Store raw_data properly
-            alert = Alert(**alert_data, raw_data=alert_data)
+            alert = self.build_alert(alert_data)
+            if alert is None:
+                return None
             
-            # Clean old alerts BEFORE checking for duplicates
-            self.clean_old_alerts()
-            
-            # Check if alert is duplicate
-            if self.is_duplicate_alert(alert):
-                print("❌ Duplicate alert detected")
-                return False
-                
-            # Check if symbol is valid
-            if not self.is_valid_symbol(alert.symbol):
-                print(f"❌ Invalid symbol: {alert.symbol}")
-                return False
-                
-            # Check if timeframe is valid
-            if alert.tf not in ['1h', '15m', '5m', '1d']:
-                print(f"❌ Invalid timeframe: {alert.tf}")
-                return False
-                
-            # Check if signal type is valid
-            if alert.type == 'bias' or alert.type == 'trend':
-                if alert.signal not in ['bull', 'bear']:
-                    print(f"❌ Invalid signal for {alert.type}: {alert.signal}")
-                    return False
-            elif alert.type == 'entry':
-                if alert.signal not in ['buy', 'sell']:
-                    print(f"❌ Invalid signal for {alert.type}: {alert.signal}")
-                    return False
-            elif alert.type == 'reversal':
-                if alert.signal not in ['reversal_bull', 'reversal_bear', 'bull', 'bear']:
-                    print(f"❌ Invalid signal for {alert.type}: {alert.signal}")
-                    return False
-            elif alert.type == 'exit':
-                if alert.signal not in ['bull', 'bear']:
-                    print(f"❌ Invalid signal for {alert.type}: {alert.signal}")
-                    return False
-                    
-            # Store alert
-            self.recent_alerts.append(alert)
-            
-            print("✅ Alert validation successful")
-            return True
+            return self.accept_alert(alert)
             
         except Exception as e:
             print(f"❌ Alert validation error: {str(e)}")
+            self.last_reject_reason = "validation_error"
             import traceback
             traceback.print_exc()
-            return False
+            return None
     
-    def is_duplicate_alert(self, alert: Alert) -> bool:
-        """Check if this is a duplicate alert"""
-        # Get incoming alert's timestamp
-        incoming_timestamp = datetime.now()
-        if alert.raw_data and isinstance(alert.raw_data, dict):
-            timestamp_str = alert.raw_data.get('timestamp')
-            if timestamp_str:
-                try:
-                    incoming_timestamp = datetime.fromisoformat(timestamp_str)
-                except (ValueError, TypeError):
-                    pass
-        
-        for recent_alert in self.recent_alerts:
-            # Skip alerts older than alert_window relative to incoming alert
-            if recent_alert.raw_data and isinstance(recent_alert.raw_data, dict):
-                recent_timestamp_str = recent_alert.raw_data.get('timestamp')
-                if recent_timestamp_str:
-                    try:
-                        recent_alert_time = datetime.fromisoformat(recent_timestamp_str)
-                        if incoming_timestamp - recent_alert_time >= self.alert_window:
-                            continue  # Skip old alerts (>5 min apart)
-                    except (ValueError, TypeError):
-                        pass  # If timestamp invalid, still check for duplicate
-            
-            if (recent_alert.type == alert.type and
-                recent_alert.symbol == alert.symbol and
-                recent_alert.tf == alert.tf and
-                recent_alert.signal == alert.signal):
-                return True
+    def accept_alert(self, alert: Alert) -> Optional[Alert]:
+        """
+        Stateful half of validation for an already-built Alert
+        Idempotency key + duplicate window; front-end processes build the
+        Alert, the engine process runs this so dedup state has one owner
+        """
+        self.last_reject_reason = None
+        
+        # Check delivery key first - catches retries across restarts
+        store = self.idempotency_store
+        if store is not None and store.enabled:
+            alert.idempotency_key = store.make_key(alert.raw_data)
+            if alert.idempotency_key and store.is_duplicate(alert.idempotency_key):
+                print(f"❌ Duplicate delivery detected (key {alert.idempotency_key})")
+                self.last_reject_reason = "duplicate_delivery"
+                return None
+        
+        # Clean old alerts BEFORE checking for duplicates
+        self.clean_old_alerts()
+        
+        # Check if alert is duplicate
+        if self.is_duplicate_alert(alert):
+            print("❌ Duplicate alert detected")
+            self.last_reject_reason = "duplicate_alert"
+            return None
                 
-        return False
+        # Store alert
+        self.remember_alert(alert)
+        if alert.idempotency_key:
+            store.remember(alert.idempotency_key, alert.symbol)
+        
+        print("✅ Alert validation successful")
+        return alert
+    
+    def release_alert(self, alert: Alert):
+        """
+        Undo accept_alert for an alert that was refused afterwards (queue saturated)
+        Drops its delivery key and duplicate-window entry so the sender's retry is accepted
+        """
+        if alert.idempotency_key and self.idempotency_store is not None:
+            self.idempotency_store.forget(alert.idempotency_key)
+        
+        key = self._dedup_key(alert)
+        times = self._dedup_index.get(key)
+        if times:
+            times.pop()
+            if not times:
+                del self._dedup_index[key]
+    
+    def build_alert(self, alert_data: Dict[str, Any]) -> Optional[Alert]:
+        """
+        Check raw alert fields against the precompiled rule tables and build the Alert once
+        The rules cover everything the Alert validators check, so the model is
+        constructed without a second pydantic validation pass
+        """
+        if not isinstance(alert_data, dict):
+            print("❌ Invalid alert payload: expected JSON object")
+            self.last_reject_reason = "invalid_payload"
+            return None
+        
+        alert_type = alert_data.get('type')
+        symbol = alert_data.get('symbol')
+        signal = alert_data.get('signal')
+        tf = alert_data.get('tf')
+        
+        # Check alert type and signal for that type
+        valid_signals = SIGNAL_RULES.get(alert_type)
+        if valid_signals is None:
+            print(f"❌ Invalid alert type: {alert_type}")
+            self.last_reject_reason = "invalid_type"
+            return None
+        
+        if signal not in valid_signals:
+            print(f"❌ Invalid signal for {alert_type}: {signal}")
+            self.last_reject_reason = "invalid_signal"
+            return None
+        
+        # Check if symbol is valid
+        if not self.is_valid_symbol(symbol):
+            print(f"❌ Invalid symbol: {symbol}")
+            self.last_reject_reason = "invalid_symbol"
+            return None
+        
+        # Check if timeframe is valid
+        if tf not in VALID_TIMEFRAMES:
+            print(f"❌ Invalid timeframe: {tf}")
+            self.last_reject_reason = "invalid_timeframe"
+            return None
+        
+        price = alert_data.get('price')
+        if price is not None:
+            try:
+                price = float(price)
+            except (TypeError, ValueError):
+                print(f"❌ Invalid price: {price}")
+                self.last_reject_reason = "invalid_price"
+                return None
+        
+        strategy = alert_data.get('strategy')
+        
+        # Add receive timestamp if not present
+        if 'timestamp' not in alert_data:
+            alert_data['timestamp'] = datetime.now().isoformat()
+        
+        # raw_data keeps a reference to the decoded body - no copy
+        return Alert.model_construct(
+            type=alert_type,
+            symbol=symbol,
+            signal=signal,
+            tf=tf,
+            price=price,
+            strategy=strategy if isinstance(strategy, str) else None,
+            raw_data=alert_data
+        )
+    
+    @staticmethod
+    def _dedup_key(alert: Alert) -> Tuple[str, str, str, str]:
+        return (alert.type, alert.symbol, alert.tf, alert.signal)
+    
+    def is_duplicate_alert(self, alert: Alert) -> bool:
+        """Check if the same type/symbol/tf/signal was accepted within the alert window"""
+        times = self._dedup_index.get(self._dedup_key(alert))
+        if not times:
+            return False
+        
+        # Lazily drop expired receive times for this key only
+        cutoff = self.clock() - self.alert_window.total_seconds()
+        while times and times[0] <= cutoff:
+            times.popleft()
+        
+        return bool(times)
+    
+    def remember_alert(self, alert: Alert):
+        """Record an accepted alert in the dedup index and history ring buffers"""
+        now = self.clock()
+        key = self._dedup_key(alert)
+        
+        times = self._dedup_index.get(key)
+        if times is None:
+            times = deque()
+            self._dedup_index[key] = times
+        times.append(now)
+        self._expiry_log.append((now, key))
+        
+        entry = (now, alert)
+        self._recent_all.append(entry)
+        
+        by_symbol = self._recent_by_symbol.get(alert.symbol)
+        if by_symbol is None:
+            by_symbol = deque(maxlen=self.HISTORY_SIZE)
+            self._recent_by_symbol[alert.symbol] = by_symbol
+        by_symbol.append(entry)
+        
+        by_type = self._recent_by_type.get(alert.type)
+        if by_type is None:
+            by_type = deque(maxlen=self.HISTORY_SIZE)
+            self._recent_by_type[alert.type] = by_type
+        by_type.append(entry)
     
     def is_valid_symbol(self, symbol: str) -> bool:
         """Check if symbol is valid for trading"""
-        valid_symbols = ['XAUUSD', 'EURUSD', 'GBPUSD', 'USDJPY', 'USDCAD', 
-                        'AUDUSD', 'NZDUSD', 'EURJPY', 'GBPJPY', 'AUDJPY']
-        return symbol in valid_symbols
+        return symbol in VALID_SYMBOLS
     
     def clean_old_alerts(self):
-        """Remove alerts older than the alert window"""
+        """
+        Remove alerts older than the alert window
+        Only expired entries at the front of the expiry log are touched (amortized O(1))
+        """
         try:
-            current_time = datetime.now()
-            cleaned_alerts = []
-            
-            for alert in self.recent_alerts:
-                timestamp_str = None
-                
-                if alert.raw_data and isinstance(alert.raw_data, dict):
-                    timestamp_str = alert.raw_data.get('timestamp')
-                
-                if timestamp_str:
-                    try:
-                        alert_time = datetime.fromisoformat(timestamp_str)
-                        if current_time - alert_time < self.alert_window:
-                            cleaned_alerts.append(alert)
-                    except (ValueError, TypeError):
-                        cleaned_alerts.append(alert)
-                else:
-                    cleaned_alerts.append(alert)
+            cutoff = self.clock() - self.alert_window.total_seconds()
             
-            self.recent_alerts = cleaned_alerts
+            while self._expiry_log and self._expiry_log[0][0] <= cutoff:
+                _, key = self._expiry_log.popleft()
+                times = self._dedup_index.get(key)
+                if times is None:
+                    continue
+                while times and times[0] <= cutoff:
+                    times.popleft()
+                if not times:
+                    del self._dedup_index[key]
             
         except Exception as e:
             print(f"⚠️ Error cleaning alerts: {str(e)}")
     
     def get_recent_alerts(self, alert_type: Optional[str] = None, symbol: Optional[str] = None, tf: Optional[str] = None) -> List[Alert]:
         """Get recent alerts filtered by type, symbol, or timeframe"""
-        filtered = self.recent_alerts
-        
-        if alert_type:
-            filtered = [alert for alert in filtered if alert.type == alert_type]
-            
+        # Start from the narrowest ring buffer available
         if symbol:
-            filtered = [alert for alert in filtered if alert.symbol == symbol]
-            
-        if tf:
-            filtered = [alert for alert in filtered if alert.tf == tf]
-            
-        return filtered
\ No newline at end of file
+            buffer = self._recent_by_symbol.get(symbol, ())
+        elif alert_type:
+            buffer = self._recent_by_type.get(alert_type, ())
+        else:
+            buffer = self._recent_all
+        
+        cutoff = self.clock() - self.alert_window.total_seconds()
+        
+        return [
+            alert for received, alert in buffer
+            if received > cutoff
+            and (not alert_type or alert.type == alert_type)
+            and (not tf or alert.tf == tf)
+        ]
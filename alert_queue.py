@@ -0,0 +1,138 @@
+import asyncio
+import itertools
+from typing import Dict, Any, Callable, Awaitable, Optional, Set
+from config import Config
+from models import Alert
+
+class AlertIngestQueue:
+    """
+    Bounded ingest queue between the webhook and the trading engine
+    1. Webhook validates + enqueues, then returns immediately (202)
+    2. One worker task per symbol drains alerts in arrival order
+    3. Exit/reversal alerts jump ahead of queued entries for the same symbol
+    4. Total backlog is capped - submit() returns False when saturated (429)
+    5. Alerts matching hand_off (entries the engine holds for order netting)
+       are started without waiting for their result, so the worker keeps
+       draining and later same-symbol entries can join the held group
+    6. submit(alert, waiter) resolves the waiter future with the handler's
+       result (batch ingest waits on these to report per-alert outcomes)
+    """
+
+    # Lower number = processed first within a symbol queue
+    PRIORITY_EXIT = 0
+    PRIORITY_NORMAL = 1
+    EXIT_TYPES = ('exit', 'reversal')
+
+    def __init__(self, config: Config, handler: Callable[[Alert], Awaitable[bool]],
+                 hand_off: Optional[Callable[[Alert], bool]] = None):
+        self.config = config
+        self.handler = handler
+        self.hand_off = hand_off
+
+        queue_config = config.get("alert_queue", {})
+        self.max_size = queue_config.get("max_size", 500)
+
+        self.queues: Dict[str, asyncio.PriorityQueue] = {}
+        self.workers: Dict[str, asyncio.Task] = {}
+        self._handed_off: Set[asyncio.Task] = set()
+        self.pending = 0
+        self.is_running = False
+
+        # Arrival counter keeps FIFO order between alerts of equal priority
+        self._sequence = itertools.count()
+
+        # Counters for /queue and /health
+        self.accepted = 0
+        self.rejected = 0
+        self.processed = 0
+        self.failed = 0
+
+    def start(self):
+        """Allow alerts to be queued (workers are spawned lazily per symbol)"""
+        self.is_running = True
+        print(f"✅ Alert ingest queue started (max {self.max_size} pending)")
+
+    async def stop(self):
+        """Stop accepting alerts and cancel all symbol workers"""
+        self.is_running = False
+        tasks = list(self.workers.values()) + list(self._handed_off)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers.clear()
+        print("⏹️ Alert ingest queue stopped")
+
+    def submit(self, alert: Alert, waiter: Optional[asyncio.Future] = None) -> bool:
+        """
+        Queue a validated alert for its symbol worker
+        waiter (optional) gets the handler's result, or False if it raised
+        Returns False if the queue is stopped or saturated
+        """
+        if not self.is_running or self.pending >= self.max_size:
+            self.rejected += 1
+            return False
+
+        symbol = alert.symbol
+        priority = self.PRIORITY_EXIT if alert.type in self.EXIT_TYPES else self.PRIORITY_NORMAL
+
+        queue = self.queues.get(symbol)
+        if queue is None:
+            queue = asyncio.PriorityQueue()
+            self.queues[symbol] = queue
+
+        queue.put_nowait((priority, next(self._sequence), alert, waiter))
+        self.pending += 1
+        self.accepted += 1
+
+        worker = self.workers.get(symbol)
+        if worker is None or worker.done():
+            self.workers[symbol] = asyncio.create_task(self._symbol_worker(symbol, queue))
+
+        return True
+
+    async def _symbol_worker(self, symbol: str, queue: asyncio.PriorityQueue):
+        """Drain one symbol's queue one alert at a time (hand-offs only wait to register)"""
+        while True:
+            _, _, alert, waiter = await queue.get()
+            if self.hand_off and self.hand_off(alert):
+                task = asyncio.create_task(self._run(symbol, queue, alert, waiter))
+                self._handed_off.add(task)
+                task.add_done_callback(self._handed_off.discard)
+                # One loop turn: the handler registers the held alert before the next one starts
+                await asyncio.sleep(0)
+                continue
+            await self._run(symbol, queue, alert, waiter)
+
+    async def _run(self, symbol: str, queue: asyncio.PriorityQueue, alert: Alert,
+                   waiter: Optional[asyncio.Future] = None):
+        result = False
+        try:
+            result = await self.handler(alert)
+            if result:
+                self.processed += 1
+            else:
+                self.failed += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"❌ Alert worker error ({symbol}): {str(e)}")
+        finally:
+            self.pending -= 1
+            queue.task_done()
+            if waiter is not None and not waiter.done():
+                waiter.set_result(bool(result))
+
+    def is_saturated(self) -> bool:
+        return self.pending >= self.max_size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and counters"""
+        return {
+            "running": self.is_running,
+            "depth": self.pending,
+            "max_size": self.max_size,
+            "per_symbol": {symbol: queue.qsize() for symbol, queue in self.queues.items()},
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "processed": self.processed,
+            "failed": self.failed
+        }
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-alert CPU cost of webhook parsing + validation
+Compares the old pipeline (parse, pretty-print, build Alert with raw_data copy,
+rebuild Alert in the engine) against the single-parse, single-validate pipeline
+"""
+
+import json
+import time
+from datetime import datetime
+from config import Config
+from models import Alert
+from alert_processor import AlertProcessor
+
+ALERT_BODIES = [
+    json.dumps({"type": "entry", "symbol": "EURUSD", "signal": "buy", "tf": "5m", "price": 1.0850, "strategy": "ZepixPremium"}).encode(),
+    json.dumps({"type": "trend", "symbol": "XAUUSD", "signal": "bull", "tf": "15m", "price": 2650.0}).encode(),
+    json.dumps({"type": "bias", "symbol": "GBPUSD", "signal": "bear", "tf": "1h", "price": 1.2650}).encode(),
+    json.dumps({"type": "reversal", "symbol": "USDJPY", "signal": "reversal_bull", "tf": "15m", "price": 149.50}).encode(),
+]
+
+def legacy_pipeline(body: bytes):
+    """Old webhook path, minus printing and duplicate detection"""
+    data = json.loads(body)
+    json.dumps(data, indent=2)
+    if 'timestamp' not in data:
+        data['timestamp'] = datetime.now().isoformat()
+    Alert(**data, raw_data=data)   # AlertProcessor.validate_alert
+    return Alert(**data)           # TradingEngine.process_alert
+
+def single_pass_pipeline(body: bytes, processor: AlertProcessor):
+    """New webhook path, minus printing and duplicate detection"""
+    return processor.build_alert(json.loads(body))
+
+def run(label: str, fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(ALERT_BODIES[i % len(ALERT_BODIES)])
+    elapsed = time.perf_counter() - start
+    per_alert_us = elapsed / iterations * 1_000_000
+    print(f"  {label:<14} {per_alert_us:8.2f} µs/alert  ({iterations} alerts in {elapsed:.3f}s)")
+    return per_alert_us
+
+def main(iterations: int = 50000):
+    processor = AlertProcessor(Config())
+
+    # Warm up both paths
+    run("warmup legacy", legacy_pipeline, 1000)
+    run("warmup new", lambda body: single_pass_pipeline(body, processor), 1000)
+
+    print(f"\n{'='*60}")
+    print("ALERT PIPELINE BENCHMARK")
+    print(f"{'='*60}")
+    legacy_us = run("legacy", legacy_pipeline, iterations)
+    new_us = run("single-pass", lambda body: single_pass_pipeline(body, processor), iterations)
+
+    saving = (legacy_us - new_us) / legacy_us * 100 if legacy_us > 0 else 0
+    print(f"\n  CPU saving: {legacy_us - new_us:.2f} µs/alert ({saving:.1f}%)")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Alert pipeline benchmark")
+    parser.add_argument("--iterations", default=50000, type=int)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: engine alert throughput vs number of active symbols
+Entry alerts are pushed through the per-symbol ingest queue into
+TradingEngine with a simulated broker round-trip (place_order) and a
+simulated Telegram post. Compares:
+  legacy     - broker call and Telegram post block the event loop
+  concurrent - broker calls on the MT5 executor thread, Telegram via the outbox,
+               per-symbol locks (same-symbol alerts stay ordered)
+
+Usage:
+    python bench_engine_throughput.py --broker-ms 5 --telegram-ms 60 --alerts 20
+
+Engine state files are written to a scratch directory, never to the live bot's files.
+"""
+
+import asyncio
+import contextlib
+import io
+import itertools
+import os
+import tempfile
+import time
+from config import Config
+
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY', 'USDCAD', 'AUDUSD',
+           'NZDUSD', 'EURJPY', 'GBPJPY', 'AUDJPY', 'XAUUSD']
+
+def build_engine(config: Config, broker_ms: float, telegram_ms: float, legacy: bool):
+    from risk_manager import RiskManager
+    from mt5_client import MT5Client
+    from telegram_bot import TelegramBot
+    from alert_processor import AlertProcessor
+    from trading_engine import TradingEngine
+
+    mt5_client = MT5Client(config)
+    mt5_client.initialized = True
+    ticket = itertools.count(1000)
+
+    def place_order(**kwargs):
+        time.sleep(broker_ms / 1000)   # broker round-trip
+        return next(ticket)
+    mt5_client.place_order = place_order
+
+    telegram = TelegramBot(config)
+    telegram.async_send = not legacy
+    telegram._post_message = lambda message: time.sleep(telegram_ms / 1000)
+
+    engine = TradingEngine(config, RiskManager(config), mt5_client, telegram, AlertProcessor(config))
+    engine.decision_audit.enabled = False
+
+    if legacy:
+        async def run_inline(fn, *args, **kwargs):
+            return fn(*args, **kwargs)
+        engine.mt5.run = run_inline
+    return engine, telegram
+
+async def run_case(config: Config, symbols: int, alerts_per_symbol: int,
+                   broker_ms: float, telegram_ms: float, legacy: bool) -> float:
+    from alert_queue import AlertIngestQueue
+    from models import Alert
+
+    engine, telegram = build_engine(config, broker_ms, telegram_ms, legacy)
+    engine.trend_coalescer.enabled = False
+    active = SYMBOLS[:symbols]
+    for symbol in active:
+        for tf in ('15m', '1h', '1d'):
+            engine.trend_manager.trends["symbols"].setdefault(symbol, {})[tf] = {"trend": "BULLISH", "mode": "AUTO"}
+
+    queue = AlertIngestQueue(config, engine.process_alert, engine.order_netter.eligible)
+    queue.max_size = symbols * alerts_per_symbol + 1
+    queue.start()
+
+    start = time.perf_counter()
+    for i in range(alerts_per_symbol):
+        for symbol in active:
+            price = 2650.0 + i if symbol == 'XAUUSD' else 1.0 + i * 0.001
+            queue.submit(Alert.model_construct(type='entry', symbol=symbol, signal='buy', tf='5m',
+                                               price=price, raw_data={}))
+    while queue.pending > 0:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - start
+
+    await queue.stop()
+    await asyncio.to_thread(telegram.flush_outbox, 30)
+    engine.mt5_executor.stop()
+    return symbols * alerts_per_symbol / elapsed
+
+async def main_async(args):
+    config = Config()  # read from the bot directory before moving to the scratch dir
+    config.config["simulate_orders"] = False
+    config.config["re_entry_config"]["sl_hunt_reentry_enabled"] = False
+    os.chdir(tempfile.mkdtemp(prefix="zepix-bench-"))
+
+    print(f"\n{'='*60}")
+    print("ENGINE THROUGHPUT BENCHMARK")
+    print(f"broker {args.broker_ms}ms/order, telegram {args.telegram_ms}ms/post, "
+          f"{args.alerts} entry alerts per symbol")
+    print(f"{'='*60}")
+    print(f"  {'symbols':>7} {'legacy':>14} {'concurrent':>14} {'speedup':>8}")
+
+    for symbols in args.symbols:
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy = await run_case(config, symbols, args.alerts, args.broker_ms, args.telegram_ms, True)
+            concurrent = await run_case(config, symbols, args.alerts, args.broker_ms, args.telegram_ms, False)
+        print(f"  {symbols:>7} {legacy:>9.1f} al/s {concurrent:>9.1f} al/s {concurrent / legacy:>7.1f}x")
+
+    # Broker calls stay serialized on one thread (MT5 API is not thread-safe)
+    print(f"\n  Concurrent ceiling: {1000 / args.broker_ms:.0f} al/s (one MT5 executor thread)")
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Engine throughput vs active symbols")
+    parser.add_argument("--broker-ms", default=5.0, type=float, help="Simulated order round-trip")
+    parser.add_argument("--telegram-ms", default=60.0, type=float, help="Simulated Telegram post")
+    parser.add_argument("--alerts", default=20, type=int, help="Entry alerts per symbol")
+    parser.add_argument("--symbols", default=[1, 2, 5, 10], type=int, nargs="+")
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one manage_open_trades cycle at 10 / 100 / 1,000 open trades
+Compares the old per-trade loop (one price call + Python SL/TP branches per
+trade) against the TradeBook path (one price call per symbol + vectorized
+SL/TP comparisons). Price calls are charged a simulated cost (--tick-us)
+standing in for an MT5 symbol_info_tick round-trip.
+"""
+
+import random
+import time
+from datetime import datetime
+from models import Trade
+from trade_book import TradeBook
+
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY', 'USDCAD', 'AUDUSD',
+           'NZDUSD', 'EURJPY', 'GBPJPY', 'AUDJPY', 'XAUUSD']
+
+def make_trades(count: int):
+    rng = random.Random(count)
+    trades = []
+    for i in range(count):
+        direction = rng.choice(("buy", "sell"))
+        entry = 1.0 + rng.random() * 0.01
+        offset = 0.002 + rng.random() * 0.003
+        sl = entry - offset if direction == "buy" else entry + offset
+        tp = entry + offset * 1.5 if direction == "buy" else entry - offset * 1.5
+        trades.append(Trade(symbol=SYMBOLS[i % len(SYMBOLS)], entry=entry, sl=sl, tp=tp, lot_size=0.1,
+                            direction=direction, strategy="LOGIC1", trade_id=i,
+                            open_time=datetime.now().isoformat()))
+    return trades
+
+def make_price_source(prices, tick_us: float):
+    def get_current_price(symbol: str) -> float:
+        deadline = time.perf_counter() + tick_us / 1_000_000
+        while time.perf_counter() < deadline:
+            pass
+        return prices[symbol]
+    return get_current_price
+
+def legacy_cycle(trades, get_current_price):
+    """Old manage_open_trades loop, minus the closes"""
+    open_trades = [t for t in trades if t.status != "closed"]
+    sl_hit, tp_hit = [], []
+    for trade in open_trades:
+        current_price = get_current_price(trade.symbol)
+        if current_price == 0:
+            continue
+        if ((trade.direction == "buy" and current_price <= trade.sl) or
+            (trade.direction == "sell" and current_price >= trade.sl)):
+            sl_hit.append(trade)
+            continue
+        if ((trade.direction == "buy" and current_price >= trade.tp) or
+            (trade.direction == "sell" and current_price <= trade.tp)):
+            tp_hit.append(trade)
+    return sl_hit, tp_hit
+
+def book_cycle(book: TradeBook, get_current_price):
+    """New cycle: one price per symbol, vectorized SL/TP"""
+    prices = {symbol: get_current_price(symbol) for symbol in book.symbols()}
+    return book.evaluate_levels(prices)
+
+def timed(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1_000_000
+
+def main(tick_us: float = 20.0, repeats: int = 200):
+    rng = random.Random(7)
+    prices = {symbol: 1.0 + rng.random() * 0.012 for symbol in SYMBOLS}
+
+    print(f"\n{'='*60}")
+    print("OPEN TRADE EVALUATION BENCHMARK")
+    print(f"simulated price call: {tick_us:.0f} µs")
+    print(f"{'='*60}")
+    print(f"  {'trades':>6} {'legacy':>12} {'vectorized':>12} {'speedup':>8}   (µs per cycle)")
+
+    for count in (10, 100, 1000):
+        trades = make_trades(count)
+        book = TradeBook()
+        for trade in trades:
+            book.add(trade)
+
+        source = make_price_source(prices, tick_us)
+        legacy_result = legacy_cycle(trades, source)
+        book_result = book_cycle(book, source)
+        assert {t.trade_id for t in legacy_result[0]} == {t.trade_id for t in book_result[0]}
+        assert {t.trade_id for t in legacy_result[1]} == {t.trade_id for t in book_result[1]}
+
+        legacy_us = timed(lambda: legacy_cycle(trades, source), repeats)
+        book_us = timed(lambda: book_cycle(book, source), repeats)
+        print(f"  {count:>6} {legacy_us:>12.1f} {book_us:>12.1f} {legacy_us / book_us:>7.1f}x")
+
+    # Evaluation cost alone (prices already fetched)
+    print("\n  SL/TP evaluation only (no price calls):")
+    for count in (10, 100, 1000):
+        trades = make_trades(count)
+        book = TradeBook()
+        for trade in trades:
+            book.add(trade)
+        legacy_us = timed(lambda: legacy_cycle(trades, prices.__getitem__), repeats)
+        book_us = timed(lambda: book.evaluate_levels(prices), repeats)
+        print(f"  {count:>6} {legacy_us:>12.1f} {book_us:>12.1f} {legacy_us / book_us:>7.1f}x")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="manage_open_trades cycle cost")
+    parser.add_argument("--tick-us", default=20.0, type=float, help="Simulated cost of one price call")
+    parser.add_argument("--repeats", default=200, type=int)
+    args = parser.parse_args()
+    main(args.tick_us, args.repeats)
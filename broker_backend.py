@@ -0,0 +1,41 @@
+import importlib
+from typing import Any, Optional
+from config import Config
+
+# MetaTrader5 module functions MT5Client relies on - a backend must provide all of them
+# (plus the ORDER_* / TRADE_* constants used to build requests)
+BROKER_API = (
+    "initialize", "login", "shutdown", "last_error", "terminal_info", "account_info",
+    "symbol_info", "symbol_select", "symbol_info_tick",
+    "order_check", "order_send", "positions_get", "history_deals_get"
+)
+
+
+def create_broker_backend(config: Config, terminal: Optional[Any] = None) -> Optional[Any]:
+    """
+    Terminal object MT5Client talks to, picked by broker_backend.type
+    - "mt5": the MetaTrader5 module passed in (None when not installed ->
+      MT5Client keeps its dummy simulation mode)
+    - "simulator": in-process SimulatedMT5 (spread, slippage, latency,
+      server-side SL/TP, account accounting) for Linux / CI / load tests
+    - "package.module:ClassName": custom backend, constructed with the config
+    """
+    backend_type = config.get("broker_backend", {}).get("type", "mt5")
+
+    if backend_type == "mt5":
+        return terminal
+
+    if backend_type == "simulator":
+        from mt5_simulator import SimulatedMT5
+        backend = SimulatedMT5(config)
+    elif ":" in backend_type:
+        module_name, class_name = backend_type.split(":", 1)
+        backend = getattr(importlib.import_module(module_name), class_name)(config)
+    else:
+        raise ValueError(f"Unknown broker backend: {backend_type}")
+
+    missing = [name for name in BROKER_API if not callable(getattr(backend, name, None))]
+    if missing:
+        raise ValueError(f"Broker backend {backend_type} is missing: {', '.join(missing)}")
+    print(f"🔌 Broker backend: {type(backend).__name__}")
+    return backend
@@ -23,6 +23,8 @@ def safe_int_from_env(env_var: str, default: int = 0) -> int:
 class Config:
     def __init__(self):
         self.config_file = "config.json"
+        # Bumped on every load / save - compiled lookup tables rebuild when it changes
+        self.version = 0
         self.default_config = {
             "telegram_token": os.getenv("TELEGRAM_TOKEN", ""),
             "telegram_chat_id": safe_int_from_env("TELEGRAM_CHAT_ID", 0),
@@ -55,6 +57,7 @@ class Config:
                 "XAUUSD": {"volatility": "HIGH", "pip_value": 1.0, "max_lots": 2.0}
             },
             "default_risk_tier": "5000",
+            "telegram_async_send": True,
             "mt5_retries": 3,
             "mt5_wait": 5,
             "simulate_orders": False,
@@ -66,11 +69,130 @@ class Config:
                 "default_trailing_points": 50.0,
                 "default_time_exit_hours": 4.0,
                 "check_interval_seconds": 5
+            },
+            "alert_queue": {
+                "enabled": True,
+                "max_size": 500
+            },
+            "batch_webhook": {
+                "max_alerts": 100
+            },
+            "alert_journal": {
+                "enabled": True,
+                "directory": "journal",
+                "flush_interval_ms": 200,
+                "max_file_mb": 50,
+                "compress_rotated": True
+            },
+            "idempotency": {
+                "enabled": True,
+                "ttl_seconds": 86400,
+                "lru_size": 4096,
+                "db_path": "idempotency.db"
+            },
+            "local_ingress": {
+                "enabled": False,
+                "mode": "unix",
+                "socket_path": "/tmp/zepix_alerts.sock",
+                "udp_host": "127.0.0.1",
+                "udp_port": 5055,
+                "reply": True
+            },
+            "trend_coalescing": {
+                "enabled": True,
+                "window_ms": 250
+            },
+            "frontends": {
+                "workers": 0,
+                "engine_port": 8081,
+                "ipc_address": "",
+                "ipc_timeout_seconds": 10,
+                "ipc_max_timeout_seconds": 120,
+                "state_file": "engine_state.json",
+                "state_interval_ms": 500
+            },
+            "decision_audit": {
+                "enabled": True,
+                "db_path": "decision_audit.db",
+                "flush_interval_ms": 1000
+            },
+            "mt5_executor": {
+                "call_timeout_seconds": 10,
+                "order_timeout_seconds": 30,
+                "latency_samples": 1000
+            },
+            "account_cache": {
+                "enabled": True,
+                "refresh_interval_seconds": 5,
+                "max_age_seconds": 15
+            },
+            "engine_state": {
+                "publish_interval_ms": 250,
+                "call_timeout_seconds": 10
+            },
+            "order_netting": {
+                "enabled": False,
+                "window_ms": 50
+            },
+            "symbol_metadata": {
+                "refresh_interval_seconds": 300
+            },
+            "tick_cache": {
+                "enabled": True,
+                "poll_interval_ms": 250,
+                "max_age_ms": 2000,
+                "idle_seconds": 300
+            },
+            "mt5_watchdog": {
+                "enabled": True,
+                "heartbeat_interval_seconds": 2,
+                "missed_heartbeats": 2,
+                "missed_heartbeat_timeouts": 3,  # heartbeat calls timing out in a row (hung terminal)
+                "reconnect_initial_seconds": 1,
+                "reconnect_max_seconds": 60,
+                "on_disconnect": "fail_fast",  # fail_fast / queue
+                "queue_timeout_seconds": 30
+            },
+            "order_execution": {
+                "deviation_points": 20,
+                "symbol_deviation_points": {},  # e.g. {"XAUUSD": 50}
+                "order_check": False,
+                "max_retries": 3,
+                "retry_budget_ms": 1000,
+                "retry_delay_ms": 25,
+                "latency_samples": 500
+            },
+            "broker_backend": {
+                "type": "mt5",  # mt5 / simulator / package.module:ClassName
+                "simulator": {
+                    "tick_source": "synthetic",  # synthetic / replay / manual
+                    "tick_interval_ms": 250,
+                    "tick_file": "",
+                    "replay_speed": 1.0,
+                    "spread_points": 15,
+                    "volatility_points": 2.0,
+                    "slippage_points": 3,
+                    "latency_ms": 50,
+                    "latency_jitter_ms": 20,
+                    "requote_probability": 0.0,
+                    "commission_per_lot": 0.0,
+                    "balance": 10000.0,
+                    "leverage": 100,
+                    "currency": "USD",
+                    "seed": None,
+                    "symbols": {}
+                }
+            },
+            "strategy_registry": {
+                "LOGIC1": {"entry_tf": "5m", "alignment_tfs": ["1h", "15m"], "enabled": True, "label": "1H+15M→5M"},
+                "LOGIC2": {"entry_tf": "15m", "alignment_tfs": ["1h", "15m"], "enabled": True, "label": "1H+15M→15M"},
+                "LOGIC3": {"entry_tf": "1h", "alignment_tfs": ["1d", "1h"], "enabled": True, "label": "1D+1H→1H"}
             }
         }
         self.load_config()
 
     def load_config(self):
+        self.version += 1
         if os.path.exists(self.config_file):
             with open(self.config_file, 'r') as f:
                 self.config = json.load(f)
@@ -104,6 +226,7 @@ class Config:
             self.save_config()
 
     def save_config(self):
+        self.version += 1
         with open(self.config_file, 'w') as f:
             json.dump(self.config, f, indent=4)
 
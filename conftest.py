@@ -0,0 +1,9 @@
+import pytest
+from config import Config
+
+@pytest.fixture
+def config(tmp_path):
+    """Bot config whose saves go to a scratch file under tmp_path, never the bot's config.json"""
+    config = Config()
+    config.config_file = str(tmp_path / "config.json")
+    return config
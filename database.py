@@ -1,4 +1,5 @@
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 from models import Trade, ReEntryChain
 from typing import List, Dict, Any
@@ -6,8 +7,35 @@ from typing import List, Dict, Any
 class TradeDatabase:
     def __init__(self):
         self.conn = sqlite3.connect('trading_bot.db', check_same_thread=False)
+        # >0 while inside transaction() - commits are deferred to the outermost block
+        self._transaction_depth = 0
         self.create_tables()
 
+    def commit(self):
+        """Commit now, or defer if a batch transaction is open"""
+        if self._transaction_depth == 0:
+            self.conn.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes from several operations into a single commit
+        Rolled back if the block raises. The depth counter is shared by the
+        whole connection, so the block must not await - other coroutines'
+        commits would be deferred (and rolled back) with it
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.conn.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.conn.commit()
+
     def create_tables(self):
         cursor = self.conn.cursor()
         
@@ -111,7 +139,7 @@ class TradeDatabase:
               trade.sl, trade.tp, trade.lot_size, trade.direction, trade.strategy,
               trade.pnl, trade.status, trade.open_time, trade.close_time,
               trade.chain_id, trade.chain_level, trade.is_re_entry))
-        self.conn.commit()
+        self.commit()
 
     def save_chain(self, chain: ReEntryChain):
         cursor = self.conn.cursor()
@@ -121,7 +149,7 @@ class TradeDatabase:
               chain.original_entry, chain.original_sl_distance,
               chain.current_level, chain.total_profit, chain.status,
               chain.created_at, datetime.now().isoformat() if chain.status == "completed" else None))
-        self.conn.commit()
+        self.commit()
 
     def save_sl_event(self, trade_id: str, symbol: str, sl_price: float, 
                      original_entry: float, recovery_attempted: bool = False,
@@ -131,7 +159,7 @@ class TradeDatabase:
             INSERT INTO sl_events VALUES (?,?,?,?,?,?,?,?)
         ''', (None, trade_id, symbol, sl_price, original_entry, 
               datetime.now().isoformat(), recovery_attempted, recovery_successful))
-        self.conn.commit()
+        self.commit()
 
     def get_trade_history(self, days=30) -> List[Dict[str, Any]]:
         cursor = self.conn.cursor()
@@ -186,7 +214,7 @@ class TradeDatabase:
         cursor.execute('''
             UPDATE system_state SET value = '0', updated_at = ? WHERE key = 'lifetime_loss'
         ''', (datetime.now().isoformat(),))
-        self.conn.commit()
+        self.commit()
         
     def get_tp_reentry_stats(self) -> Dict[str, Any]:
         """Get TP re-entry statistics"""
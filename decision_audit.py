@@ -0,0 +1,197 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from config import Config
+
+class DecisionAuditLog:
+    """
+    Append-only audit of the final decision for every alert
+    - One row per alert: stage reached, decision, reject reason code,
+      alignment, computed SL/TP/lot and processing time
+    - Rows are buffered in memory and bulk-inserted (executemany) by a
+      background task, off the event loop
+    - Reason codes are short fixed strings so reports are plain GROUP BYs
+    """
+
+    COLUMNS = ("ts", "alert_type", "symbol", "tf", "signal", "logic", "decision", "stage",
+               "reason", "detail", "alignment_direction", "alignment", "entry", "sl", "tp",
+               "lot_size", "trade_id", "latency_ms")
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        audit_config = config.get("decision_audit", {})
+        self.enabled = audit_config.get("enabled", True)
+        self.db_path = audit_config.get("db_path", "decision_audit.db")
+        self.flush_interval = audit_config.get("flush_interval_ms", 1000) / 1000
+
+        self._buffer: List[Tuple] = []
+        self._lock = threading.Lock()
+        self._flush_task = None
+
+        self.records_written = 0
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.create_tables()
+
+    def create_tables(self):
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS decision_audit (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ts REAL,
+                alert_type TEXT,
+                symbol TEXT,
+                tf TEXT,
+                signal TEXT,
+                logic TEXT,
+                decision TEXT,
+                stage TEXT,
+                reason TEXT,
+                detail TEXT,
+                alignment_direction TEXT,
+                alignment TEXT,
+                entry REAL,
+                sl REAL,
+                tp REAL,
+                lot_size REAL,
+                trade_id TEXT,
+                latency_ms REAL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_decision_audit_ts
+            ON decision_audit (ts)
+        ''')
+        self.conn.commit()
+
+    async def start(self):
+        if self.enabled:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await asyncio.to_thread(self.flush)
+
+    def record(self, alert: Any, decision: str, stage: str, reason: Optional[str] = None,
+               detail: Optional[str] = None, logic: Optional[str] = None,
+               alignment: Optional[Dict[str, Any]] = None, entry: Optional[float] = None,
+               sl: Optional[float] = None, tp: Optional[float] = None,
+               lot_size: Optional[float] = None, trade_id: Any = None,
+               latency_ms: Optional[float] = None):
+        """
+        Buffer one decision (cheap - no I/O)
+        alert is an Alert, or the raw payload for alerts rejected before one was built
+        """
+        if not self.enabled:
+            return
+        if isinstance(alert, dict):
+            fields = alert
+        else:
+            fields = {"type": getattr(alert, "type", None), "symbol": getattr(alert, "symbol", None),
+                      "tf": getattr(alert, "tf", None), "signal": getattr(alert, "signal", None),
+                      "price": getattr(alert, "price", None)}
+        if entry is None and isinstance(fields.get("price"), (int, float)):
+            entry = fields["price"]
+
+        self._buffer.append((
+            time.time(),
+            _text(fields.get("type")), _text(fields.get("symbol")),
+            _text(fields.get("tf")), _text(fields.get("signal")),
+            logic, decision, stage, reason, detail,
+            alignment.get("direction") if alignment else None,
+            json.dumps(alignment.get("details"), default=str) if alignment else None,
+            entry, sl, tp, lot_size,
+            str(trade_id) if trade_id is not None else None,
+            round(latency_ms, 3) if latency_ms is not None else None
+        ))
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if self._buffer:
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception as e:
+                    print(f"❌ Decision audit flush error: {str(e)}")
+
+    def flush(self):
+        """Bulk-insert buffered rows in one transaction"""
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        placeholders = ",".join("?" * len(self.COLUMNS))
+        with self._lock:
+            self.conn.executemany(
+                f"INSERT INTO decision_audit ({','.join(self.COLUMNS)}) VALUES ({placeholders})",
+                rows
+            )
+            self.conn.commit()
+        self.records_written += len(rows)
+
+    def report(self, since_hours: float = 24, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Aggregate decisions since N hours ago
+        - totals per decision
+        - reject reasons per symbol / logic / stage, most frequent first
+        """
+        self.flush()
+        where = "ts >= ?"
+        params: List[Any] = [time.time() - since_hours * 3600]
+        if symbol:
+            where += " AND symbol = ?"
+            params.append(symbol)
+
+        with self._lock:
+            totals = self.conn.execute(
+                f"SELECT decision, COUNT(*) FROM decision_audit WHERE {where} GROUP BY decision",
+                params
+            ).fetchall()
+            rejects = self.conn.execute(
+                f'''SELECT symbol, logic, stage, reason, COUNT(*) AS n, AVG(latency_ms)
+                    FROM decision_audit WHERE {where} AND decision = 'rejected'
+                    GROUP BY symbol, logic, stage, reason ORDER BY n DESC''',
+                params
+            ).fetchall()
+            by_reason = self.conn.execute(
+                f'''SELECT reason, COUNT(*) AS n FROM decision_audit
+                    WHERE {where} AND decision = 'rejected' GROUP BY reason ORDER BY n DESC''',
+                params
+            ).fetchall()
+
+        return {
+            "since_hours": since_hours,
+            "symbol": symbol,
+            "totals": {decision: count for decision, count in totals},
+            "reject_reasons": {reason: count for reason, count in by_reason},
+            "rejects": [
+                {"symbol": row[0], "logic": row[1], "stage": row[2], "reason": row[3],
+                 "count": row[4], "avg_latency_ms": round(row[5], 3) if row[5] is not None else None}
+                for row in rejects
+            ]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self._buffer),
+            "records_written": self.records_written
+        }
+
+    def close(self):
+        self.conn.close()
+
+
+def _text(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else (None if value is None else str(value))
@@ -0,0 +1,289 @@
+import asyncio
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from multiprocessing.connection import Listener, Client, Connection
+from queue import LifoQueue, Empty
+from typing import Dict, Any, Callable, Awaitable, Optional, List
+from config import Config
+
+# Authkey is generated by the engine and handed to the front-ends it spawns
+AUTHKEY_ENV = "ZEPIX_ENGINE_AUTHKEY"
+# Front-ends wait this much longer than the engine, so they get its 504 reply
+REPLY_MARGIN_SECONDS = 5
+
+def default_ipc_address() -> str:
+    """Named pipe on Windows, Unix domain socket elsewhere"""
+    if sys.platform == "win32":
+        return r"\\.\pipe\zepix_engine"
+    return "/tmp/zepix_engine.sock"
+
+def engine_alert_budget(config: Config) -> float:
+    """
+    Worst-case engine time for one alert processed inline: reversal closes
+    (concurrent, one order timeout), the entry order, a pre-flight call, plus slack
+    """
+    executor_config = config.get("mt5_executor", {})
+    order_timeout = executor_config.get("order_timeout_seconds", 30)
+    call_timeout = executor_config.get("call_timeout_seconds", 10)
+    return 2 * order_timeout + call_timeout + 5
+
+def ipc_settings(config: Config) -> Dict[str, Any]:
+    frontend_config = config.get("frontends", {})
+    return {
+        "address": frontend_config.get("ipc_address") or default_ipc_address(),
+        "state_file": frontend_config.get("state_file", "engine_state.json"),
+        "state_interval": frontend_config.get("state_interval_ms", 500) / 1000,
+        # Never give up before the engine does - it would still place the trade
+        "timeout": max(frontend_config.get("ipc_timeout_seconds", 10), engine_alert_budget(config)),
+        "max_timeout": frontend_config.get("ipc_max_timeout_seconds", 120)
+    }
+
+def request_timeout(settings: Dict[str, Any], kind: str, payload: Any) -> float:
+    """
+    Engine-side wait for one IPC request
+    Batch alerts for different symbols run concurrently, so a batch gets one
+    alert budget per alert of its busiest symbol, capped at max_timeout
+    """
+    timeout = settings["timeout"]
+    if kind == "batch" and payload:
+        per_symbol = max(Counter(getattr(alert, "symbol", None) for alert in payload).values())
+        timeout = max(timeout, min(timeout * per_symbol, settings["max_timeout"]))
+    return timeout
+
+
+class EngineBridgeServer:
+    """
+    Engine side of the front-end split
+    - Accepts IPC connections from front-end workers (multiprocessing.connection,
+      Unix socket / Windows named pipe, HMAC-authenticated)
+    - Each request is run on the engine's event loop; the reply is sent back
+    - Publishes a read-only state snapshot (JSON, atomic replace) that the
+      front-ends serve /stats, /trends and /queue from
+    Messages: ("alert", Alert, source) -> (status_code, body)
+              ("batch", [Alert], source) -> [result dict]
+              ("reject", [(raw, reason)], source) -> count journaled
+    """
+
+    def __init__(self, config: Config,
+                 alert_handler: Callable[[Any, str], Awaitable[Any]],
+                 batch_handler: Callable[[List[Any], str], Awaitable[Any]],
+                 reject_handler: Callable[[List[Any], str], Awaitable[Any]],
+                 state_provider: Callable[[], Dict[str, Any]]):
+        self.config = config
+        self.alert_handler = alert_handler
+        self.batch_handler = batch_handler
+        self.reject_handler = reject_handler
+        self.state_provider = state_provider
+
+        settings = ipc_settings(config)
+        self.enabled = config.get("frontends", {}).get("workers", 0) > 0
+        self.address = settings["address"]
+        self.state_file = settings["state_file"]
+        self.state_interval = settings["state_interval"]
+        self.settings = settings
+        self.authkey = os.environ.get(AUTHKEY_ENV, "").encode() or secrets.token_hex(16).encode()
+
+        self.listener: Optional[Listener] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._publish_task = None
+        self._running = False
+
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.snapshots_published = 0
+
+    async def start(self):
+        """Start listening and publishing state (no-op unless enabled)"""
+        if not self.enabled:
+            return
+        self.loop = asyncio.get_running_loop()
+        if not self.address.startswith("\\\\") and os.path.exists(self.address):
+            os.remove(self.address)  # stale socket from a previous run
+        self.listener = Listener(self.address, authkey=self.authkey)
+        self._running = True
+        threading.Thread(target=self._accept_loop, name="engine-bridge-accept", daemon=True).start()
+        self._publish_task = asyncio.create_task(self._publish_loop())
+        print(f"✅ Engine bridge listening on {self.address}")
+
+    async def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        if self._publish_task:
+            self._publish_task.cancel()
+            try:
+                await self._publish_task
+            except asyncio.CancelledError:
+                pass
+            self._publish_task = None
+        try:
+            self.listener.close()
+        except Exception:
+            pass
+        self.listener = None
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                if self._running:
+                    # Failed handshake (wrong authkey) - keep serving
+                    self.errors += 1
+                    print(f"⚠️ Engine bridge accept error: {str(e)}")
+                    continue
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve_connection, args=(conn,),
+                             name="engine-bridge-conn", daemon=True).start()
+
+    def _serve_connection(self, conn: Connection):
+        """One front-end connection - requests are answered in order"""
+        try:
+            while self._running:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                conn.send(self._dispatch(message))
+        except (BrokenPipeError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    def _dispatch(self, message) -> Any:
+        self.requests += 1
+        try:
+            kind, payload, source = message
+            if kind == "alert":
+                coro = self.alert_handler(payload, source)
+            elif kind == "batch":
+                coro = self.batch_handler(payload, source)
+            elif kind == "reject":
+                coro = self.reject_handler(payload, source)
+            else:
+                return 400, {"status": "error", "message": f"Unknown request: {kind}"}
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+            timeout = request_timeout(self.settings, kind, payload)
+            try:
+                return future.result(timeout)
+            except FutureTimeoutError:
+                # Keeps running on the engine loop - only this connection thread stops waiting
+                self.errors += 1
+                return 504, {"status": "error", "message": f"Engine still processing after {timeout:.0f}s"}
+        except Exception as e:
+            self.errors += 1
+            return 500, {"status": "error", "message": str(e)}
+
+    async def _publish_loop(self):
+        while True:
+            try:
+                await self.publish_state()
+            except Exception as e:
+                print(f"❌ Engine state publish error: {str(e)}")
+            await asyncio.sleep(self.state_interval)
+
+    async def publish_state(self):
+        """Snapshot on the event loop (consistent), write off it"""
+        snapshot = self.state_provider()
+        snapshot["published_at"] = time.time()
+        data = json.dumps(snapshot, default=str)
+        await asyncio.to_thread(self._write_state, data)
+        self.snapshots_published += 1
+
+    def _write_state(self, data: str):
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, self.state_file)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "address": self.address if self.enabled else None,
+            "listening": self._running,
+            "connections": self.connections,
+            "requests": self.requests,
+            "errors": self.errors,
+            "snapshots_published": self.snapshots_published
+        }
+
+
+class EngineClient:
+    """
+    Front-end side of the bridge
+    Keeps a small pool of connections so concurrent requests in one worker
+    don't serialize on a single pipe; blocking IPC runs in a thread
+    """
+
+    def __init__(self, config: Config):
+        settings = ipc_settings(config)
+        self.address = settings["address"]
+        self.settings = settings
+        self.authkey = os.environ.get(AUTHKEY_ENV, "").encode()
+        self._pool: "LifoQueue[Connection]" = LifoQueue()
+
+    async def request(self, kind: str, payload: Any, source: str) -> Any:
+        """Send one request to the engine; raises ConnectionError if it is unreachable"""
+        timeout = request_timeout(self.settings, kind, payload) + REPLY_MARGIN_SECONDS
+        return await asyncio.to_thread(self._roundtrip, (kind, payload, source), timeout)
+
+    def _roundtrip(self, message, timeout: float) -> Any:
+        conn = self._checkout()
+        try:
+            conn.send(message)
+            if not conn.poll(timeout):
+                raise TimeoutError("Engine did not reply in time")
+            reply = conn.recv()
+        except (EOFError, OSError, TimeoutError) as e:
+            # Drop the connection - the next request reconnects
+            conn.close()
+            raise ConnectionError(f"Engine unavailable: {str(e)}")
+        self._pool.put(conn)
+        return reply
+
+    def _checkout(self) -> Connection:
+        try:
+            return self._pool.get_nowait()
+        except Empty:
+            pass
+        try:
+            return Client(self.address, authkey=self.authkey)
+        except (OSError, EOFError) as e:
+            raise ConnectionError(f"Engine unavailable: {str(e)}")
+
+
+class EngineStateReader:
+    """Cached reader for the engine's published state file (reloads on change)"""
+
+    def __init__(self, config: Config):
+        self.state_file = ipc_settings(config)["state_file"]
+        self._mtime = None
+        self._state: Optional[Dict[str, Any]] = None
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        try:
+            mtime = os.stat(self.state_file).st_mtime_ns
+        except OSError:
+            return None
+        if mtime != self._mtime:
+            try:
+                with open(self.state_file, "r", encoding="utf-8") as f:
+                    self._state = json.load(f)
+                self._mtime = mtime
+            except (OSError, json.JSONDecodeError):
+                pass
+        return self._state
+
+    def age_seconds(self) -> Optional[float]:
+        state = self.get()
+        if not state:
+            return None
+        return round(time.time() - state.get("published_at", 0), 3)
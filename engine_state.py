@@ -0,0 +1,196 @@
+import asyncio
+import time
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, NamedTuple, Optional, Tuple
+from pydantic import BaseModel
+from config import Config
+
+class EngineSnapshot(NamedTuple):
+    """Immutable view of engine state - safe to read from any thread"""
+    version: int
+    built_at: float
+    open_trades: Tuple[Mapping[str, Any], ...]
+    chains: Mapping[str, Mapping[str, Any]]
+    pending_reentries: Mapping[str, Mapping[str, Any]]  # sl_hunt / tp_continuation / exit_continuation
+    trends: Mapping[str, Mapping[str, Any]]
+    current_signals: Mapping[str, Any]
+    trading_paused: bool
+    logic_status: Mapping[str, bool]
+    trade_count: int
+
+
+class EngineStateActor:
+    """
+    Single writer for engine state: trade book, re-entry chains, pending
+    re-entries, trends, pause / logic flags
+    - Writers submit commands (plain sync callables): await execute() on the
+      event loop, call() from other threads (Telegram polling)
+    - One actor task applies commands in arrival order, never interleaved
+    - After each batch an immutable EngineSnapshot is published; readers
+      (Telegram, HTTP, front-end state file) use snapshot() instead of the
+      live dicts
+    Before start() (tests, replays) commands are applied inline.
+    """
+
+    def __init__(self, config: Config, engine):
+        self.config = config
+        self.engine = engine
+
+        state_config = config.get("engine_state", {})
+        self.publish_interval = state_config.get("publish_interval_ms", 250) / 1000
+        self.call_timeout = state_config.get("call_timeout_seconds", 10)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task = None
+
+        self._version = 0
+        self._snapshot: Optional[EngineSnapshot] = None
+
+        self.commands_applied = 0
+        self.command_errors = 0
+        self.snapshots_published = 0
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Apply anything still queued, then publish the final state
+        while self._queue is not None and not self._queue.empty():
+            self._apply(self._queue.get_nowait())
+        self._queue = None
+        self._loop = None
+        self._publish()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def execute(self, fn, *args, **kwargs):
+        """Apply a state command and wait for its result (event loop callers)"""
+        if not self.running:
+            return self._apply_inline(fn, args, kwargs)
+        future = self._loop.create_future()
+        self._queue.put_nowait((fn, args, kwargs, future))
+        return await future
+
+    def call(self, fn, *args, **kwargs):
+        """Apply a state command from another thread and wait for its result"""
+        loop = self._loop
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        # Not started yet, or already on the loop thread (a blocking wait would deadlock)
+        if not self.running or loop is None or on_loop:
+            return self._apply_inline(fn, args, kwargs)
+        future = asyncio.run_coroutine_threadsafe(self.execute(fn, *args, **kwargs), loop)
+        return future.result(self.call_timeout)
+
+    def _apply_inline(self, fn, args, kwargs):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._version += 1
+            self.commands_applied += 1
+
+    def _apply(self, command):
+        fn, args, kwargs, future = command
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.command_errors += 1
+            if not future.cancelled():
+                future.set_exception(e)
+        else:
+            if not future.cancelled():
+                future.set_result(result)
+        self._version += 1
+        self.commands_applied += 1
+
+    async def _run(self):
+        while True:
+            try:
+                command = await asyncio.wait_for(self._queue.get(), self.publish_interval)
+            except asyncio.TimeoutError:
+                command = None
+            # Drain the whole batch before publishing once
+            while command is not None:
+                self._apply(command)
+                command = self._queue.get_nowait() if not self._queue.empty() else None
+            if self._snapshot is None or self._snapshot.version != self._version:
+                try:
+                    self._publish()
+                except Exception as e:
+                    print(f"❌ Engine snapshot error: {str(e)}")
+
+    def _publish(self):
+        engine = self.engine
+        monitor = engine.price_monitor
+        self._snapshot = EngineSnapshot(
+            version=self._version,
+            built_at=time.time(),
+            open_trades=tuple(_freeze(trade.to_dict()) for trade in engine.open_trades),
+            chains=_freeze(dict(engine.reentry_manager.active_chains)),
+            pending_reentries=_freeze({
+                "sl_hunt": dict(monitor.sl_hunt_pending),
+                "tp_continuation": dict(monitor.tp_continuation_pending),
+                "exit_continuation": dict(monitor.exit_continuation_pending)
+            }),
+            trends=_freeze(engine.trend_manager.trends.get("symbols", {})),
+            current_signals=_freeze(dict(engine.current_signals)),
+            trading_paused=engine.is_paused,
+            logic_status=_freeze(engine.get_logic_status()),
+            trade_count=engine.trade_count
+        )
+        self.snapshots_published += 1
+
+    def snapshot(self) -> EngineSnapshot:
+        """Latest published state (built on demand before the actor runs)"""
+        snapshot = self._snapshot
+        if snapshot is None or (not self.running and snapshot.version != self._version):
+            self._publish()
+            snapshot = self._snapshot
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "running": self.running,
+            "version": self._version,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "commands_applied": self.commands_applied,
+            "command_errors": self.command_errors,
+            "snapshots_published": self.snapshots_published,
+            "snapshot_age_ms": round((time.time() - snapshot.built_at) * 1000, 1) if snapshot else None
+        }
+
+
+def _freeze(value: Any) -> Any:
+    """Deep read-only copy: dicts -> MappingProxyType, lists -> tuples, models -> dicts"""
+    if isinstance(value, BaseModel):
+        value = value.dict()
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+def thaw(value: Any) -> Any:
+    """Plain dicts / lists again (JSON responses, state file)"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (tuple, frozenset)):
+        return [thaw(item) for item in value]
+    return value
@@ -4,8 +4,9 @@ from typing import Dict, Any
 from models import Trade
 
 class ExitStrategyManager:
-    def __init__(self, mt5_client, trading_engine):
-        self.mt5_client = mt5_client
+    def __init__(self, mt5, trading_engine):
+        # AsyncMT5Client - prices come from the tick cache or the MT5 executor thread
+        self.mt5 = mt5
         self.trading_engine = trading_engine
         self.active_strategies = {}
         self.running = False
@@ -24,7 +25,7 @@ class ExitStrategyManager:
         while self.running:
             try:
                 for trade_id, strategy in list(self.active_strategies.items()):
-                    current_price = self.mt5_client.get_current_price(strategy['symbol'])
+                    current_price = await self.mt5.get_current_price(strategy['symbol'])
                     
                     if strategy['type'] == 'trailing_stop':
                         if await self.check_trailing_stop(trade_id, current_price, strategy):
@@ -85,7 +86,7 @@ class ExitStrategyManager:
         try:
             if trade.trade_id in self.active_strategies:
                 strategy = self.active_strategies[trade.trade_id]
-                current_price = self.mt5_client.get_current_price(trade.symbol)
+                current_price = self._current_price(trade.symbol)
                 
                 if strategy['type'] == 'trailing_stop':
                     if trade.direction == "buy":
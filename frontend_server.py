@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+HTTP front-end worker for the split deployment (python main.py --frontends N)
+
+Runs under uvicorn with N worker processes. Each worker parses and validates
+alerts and forwards the built Alert to the single engine process over the
+engine bridge (IPC). It never imports TradingEngine, MT5 or the database.
+Read-only endpoints are served from the state snapshot the engine publishes.
+"""
+
+import json
+from datetime import datetime
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import JSONResponse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config import Config
+from alert_processor import AlertProcessor
+from engine_bridge import EngineClient, EngineStateReader
+
+config = Config()
+# Stateless rule checks only - duplicate/idempotency state lives in the engine
+alert_processor = AlertProcessor(config)
+engine_client = EngineClient(config)
+engine_state = EngineStateReader(config)
+
+frontend_stats = {"received": 0, "rejected_invalid": 0, "forwarded": 0, "engine_unavailable": 0}
+
+app = FastAPI(title="Zepix Trading Bot v2.0 - Front-end")
+
+def engine_unavailable(e: Exception):
+    frontend_stats["engine_unavailable"] += 1
+    raise HTTPException(status_code=503, detail=str(e))
+
+async def forward_rejects(rejects, source: str):
+    """Validation rejects go to the engine's journal + decision audit (best effort)"""
+    try:
+        await engine_client.request("reject", rejects, source)
+    except ConnectionError as e:
+        print(f"⚠️ Could not journal {len(rejects)} rejected alert(s): {str(e)}")
+
+def require_state():
+    state = engine_state.get()
+    if state is None:
+        raise HTTPException(status_code=503, detail="Engine state not published yet")
+    return state
+
+@app.post("/webhook")
+async def handle_webhook(request: Request):
+    """Validate an alert here, forward it to the engine process"""
+    try:
+        data = json.loads(await request.body())
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Webhook processing error: {str(e)}")
+
+    frontend_stats["received"] += 1
+    alert = alert_processor.build_alert(data)
+    if alert is None:
+        frontend_stats["rejected_invalid"] += 1
+        await forward_rejects([(data, alert_processor.last_reject_reason)], "frontend")
+        return JSONResponse(status_code=200, content={"status": "rejected", "message": "Alert validation failed"})
+
+    try:
+        status_code, content = await engine_client.request("alert", alert, "frontend")
+    except ConnectionError as e:
+        engine_unavailable(e)
+    frontend_stats["forwarded"] += 1
+    return JSONResponse(status_code=status_code, content=content)
+
+@app.post("/webhook/batch")
+async def handle_webhook_batch(request: Request):
+    """Validate each alert here, forward the valid ones to the engine as one batch"""
+    try:
+        payload = json.loads(await request.body())
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Batch webhook processing error: {str(e)}")
+    if isinstance(payload, dict):
+        payload = payload.get("alerts")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Batch payload must be a JSON array of alerts")
+
+    max_alerts = config.get("batch_webhook", {}).get("max_alerts", 100)
+    if len(payload) > max_alerts:
+        raise HTTPException(status_code=413, detail=f"Batch too large ({len(payload)} > {max_alerts})")
+
+    frontend_stats["received"] += len(payload)
+    results = [None] * len(payload)
+    valid_indexes = []
+    alerts = []
+    rejects = []
+    for index, data in enumerate(payload):
+        alert = alert_processor.build_alert(data)
+        if alert is None:
+            frontend_stats["rejected_invalid"] += 1
+            rejects.append((data, alert_processor.last_reject_reason))
+            results[index] = {"index": index, "status": "rejected", "message": "Alert validation failed"}
+        else:
+            valid_indexes.append(index)
+            alerts.append(alert)
+
+    if rejects:
+        await forward_rejects(rejects, "frontend_batch")
+    if alerts:
+        try:
+            engine_results = await engine_client.request("batch", alerts, "frontend_batch")
+        except ConnectionError as e:
+            engine_unavailable(e)
+        if isinstance(engine_results, tuple):
+            # Engine-side error reply: (status_code, body)
+            status_code, content = engine_results
+            return JSONResponse(status_code=status_code, content=content)
+        frontend_stats["forwarded"] += len(alerts)
+        # Engine results are indexed within the forwarded list
+        for index, result in zip(valid_indexes, engine_results):
+            results[index] = {**result, "index": index}
+
+    processed = sum(1 for result in results if result["status"] == "success")
+    return JSONResponse(content={
+        "status": "success",
+        "processed": processed,
+        "rejected": len(results) - processed,
+        "results": results
+    })
+
+@app.get("/health")
+async def health_check():
+    """Front-end health plus the age of the engine's last published state"""
+    state = engine_state.get()
+    return {
+        "status": "healthy" if state else "degraded",
+        "version": "2.0",
+        "role": "frontend",
+        "timestamp": datetime.utcnow().isoformat(),
+        "engine_state_age_s": engine_state.age_seconds(),
+        "mt5_connected": state.get("mt5_connected") if state else None,
+        "frontend": frontend_stats
+    }
+
+@app.get("/stats")
+async def get_stats():
+    """Get current statistics (engine snapshot)"""
+    return require_state()["stats"]
+
+@app.get("/trends")
+async def get_trends():
+    """Get all trends (engine snapshot)"""
+    return {"status": "success", "trends": require_state()["trends"]}
+
+@app.get("/queue")
+async def get_queue_status():
+    """Get alert ingest queue depth and counters (engine snapshot)"""
+    return {"status": "success", "queue": require_state()["queue"]}
@@ -0,0 +1,155 @@
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+from config import Config
+
+class IdempotencyStore:
+    """
+    Persistent idempotency keys for webhook deliveries
+    - Key = client-provided id, or content hash + bar time
+    - Indexed SQLite table with TTL expiry survives restarts
+    - In-memory LRU in front keeps repeat lookups off the disk
+    """
+
+    # Payload fields accepted as a client-provided delivery id
+    ID_FIELDS = ('idempotency_key', 'alert_id', 'id')
+    # Payload fields accepted as the bar time for content-hash keys
+    BAR_TIME_FIELDS = ('bar_time', 'time')
+    # Run TTL purge every N inserts
+    PURGE_EVERY = 500
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        idem_config = config.get("idempotency", {})
+        self.enabled = idem_config.get("enabled", True)
+        self.ttl_seconds = idem_config.get("ttl_seconds", 86400)
+        self.lru_size = idem_config.get("lru_size", 4096)
+        self.db_path = idem_config.get("db_path", "idempotency.db")
+
+        self._lru: "OrderedDict[str, float]" = OrderedDict()  # key -> expires_at (epoch)
+        self._inserts_since_purge = 0
+
+        self.hits_memory = 0
+        self.hits_db = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.create_tables()
+        self.purge_expired()
+
+    def create_tables(self):
+        cursor = self.conn.cursor()
+        # WAL keeps the single-row inserts cheap; file is separate from trading_bot.db
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS webhook_deliveries (
+                idem_key TEXT PRIMARY KEY,
+                symbol TEXT,
+                received_at REAL,
+                expires_at REAL
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_webhook_deliveries_expires
+            ON webhook_deliveries (expires_at)
+        ''')
+        self.conn.commit()
+
+    def make_key(self, alert_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Build the delivery key for a raw alert payload
+        Returns None if the payload has neither an id nor a bar time
+        """
+        for field in self.ID_FIELDS:
+            value = alert_data.get(field)
+            if value not in (None, ""):
+                return f"id:{value}"
+
+        bar_time = None
+        for field in self.BAR_TIME_FIELDS:
+            if alert_data.get(field) not in (None, ""):
+                bar_time = alert_data[field]
+                break
+        if bar_time is None:
+            return None
+
+        content = "|".join(str(alert_data.get(field, "")) for field in ("type", "symbol", "signal", "tf", "price"))
+        digest = hashlib.sha1(f"{content}|{bar_time}".encode("utf-8")).hexdigest()
+        return f"h:{digest}"
+
+    def is_duplicate(self, key: str) -> bool:
+        """Check whether a delivery with this key was already accepted (and not expired)"""
+        now = time.time()
+
+        expires_at = self._lru.get(key)
+        if expires_at is not None:
+            if expires_at > now:
+                self._lru.move_to_end(key)
+                self.hits_memory += 1
+                return True
+            del self._lru[key]
+
+        row = self.conn.execute(
+            "SELECT expires_at FROM webhook_deliveries WHERE idem_key = ?", (key,)
+        ).fetchone()
+        if row and row[0] > now:
+            self._remember_in_memory(key, row[0])
+            self.hits_db += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    def remember(self, key: str, symbol: str = ""):
+        """Persist an accepted delivery key"""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+
+        self.conn.execute(
+            "INSERT OR REPLACE INTO webhook_deliveries VALUES (?,?,?,?)",
+            (key, symbol, now, expires_at)
+        )
+        self.conn.commit()
+        self._remember_in_memory(key, expires_at)
+
+        self._inserts_since_purge += 1
+        if self._inserts_since_purge >= self.PURGE_EVERY:
+            self.purge_expired()
+
+    def forget(self, key: str):
+        """Drop a key whose delivery was refused after validation (the retry must be accepted)"""
+        self._lru.pop(key, None)
+        self.conn.execute("DELETE FROM webhook_deliveries WHERE idem_key = ?", (key,))
+        self.conn.commit()
+
+    def _remember_in_memory(self, key: str, expires_at: float):
+        self._lru[key] = expires_at
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def purge_expired(self):
+        """Delete expired keys (uses the expires_at index)"""
+        self._inserts_since_purge = 0
+        try:
+            self.conn.execute("DELETE FROM webhook_deliveries WHERE expires_at <= ?", (time.time(),))
+            self.conn.commit()
+        except Exception as e:
+            print(f"⚠️ Idempotency purge error: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "lru_entries": len(self._lru),
+            "hits_memory": self.hits_memory,
+            "hits_db": self.hits_db,
+            "misses": self.misses
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Awaitable, Tuple, Deque, Set
+from config import Config
+from metrics import percentiles
+
+class LocalAlertIngress:
+    """
+    Optional low-latency alert ingress for producers on the same host
+    - Unix domain socket (stream) or localhost UDP, on the bot's event loop
+    - Newline-delimited JSON: one alert per line (several lines per datagram allowed)
+    - Each alert goes through the same ingest path as the HTTP webhook
+      (journal, validation, dedup, queue), so behaviour is identical
+    - One JSON reply line per alert: {"status_code": 202, "status": "accepted", ...}
+    """
+
+    # Latency samples kept for percentiles
+    LATENCY_SAMPLES = 2048
+
+    def __init__(self, config: Config,
+                 handler: Callable[[Any, str], Awaitable[Tuple[int, Dict[str, Any]]]]):
+        self.config = config
+        self.handler = handler
+
+        ingress_config = config.get("local_ingress", {})
+        self.enabled = ingress_config.get("enabled", False)
+        self.mode = ingress_config.get("mode", "unix")
+        self.socket_path = ingress_config.get("socket_path", "/tmp/zepix_alerts.sock")
+        self.udp_host = ingress_config.get("udp_host", "127.0.0.1")
+        self.udp_port = ingress_config.get("udp_port", 5055)
+        self.send_replies = ingress_config.get("reply", True)
+
+        self.server = None
+        self.transport = None
+
+        self.alerts_received = 0
+        self.decode_errors = 0
+        self._latencies_us: Deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+
+    async def start(self):
+        """Start listening (no-op unless local_ingress.enabled)"""
+        if not self.enabled:
+            return
+
+        if self.mode == "unix":
+            if not hasattr(asyncio, "start_unix_server"):
+                print("⚠️ Unix sockets not supported on this platform - use local_ingress.mode = 'udp'")
+                return
+            # Remove a stale socket left by a previous run
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self.server = await asyncio.start_unix_server(self._handle_stream, path=self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+            print(f"✅ Local alert ingress listening on unix:{self.socket_path}")
+
+        elif self.mode == "udp":
+            loop = asyncio.get_running_loop()
+            self.transport, _ = await loop.create_datagram_endpoint(
+                lambda: _AlertDatagramProtocol(self),
+                local_addr=(self.udp_host, self.udp_port)
+            )
+            print(f"✅ Local alert ingress listening on udp://{self.udp_host}:{self.udp_port}")
+
+        else:
+            print(f"❌ Unknown local_ingress mode: {self.mode}")
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        if self.transport:
+            self.transport.close()
+            self.transport = None
+
+    async def _handle_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """One connection - alerts are handled strictly in the order they were written"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                reply = await self.handle_line(line)
+                if self.send_replies:
+                    writer.write(json.dumps(reply).encode() + b"\n")
+                    await writer.drain()
+        except (ConnectionResetError, BrokenPipeError, asyncio.CancelledError):
+            # Client went away, or the server is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def handle_line(self, line: bytes) -> Dict[str, Any]:
+        """Decode one alert line and pass it down the shared ingest path"""
+        received = time.perf_counter()
+        try:
+            data = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self.decode_errors += 1
+            return {"status_code": 400, "status": "rejected", "message": f"Invalid JSON: {str(e)}"}
+
+        self.alerts_received += 1
+        try:
+            status_code, content = await self.handler(data, f"local_{self.mode}")
+        except Exception as e:
+            status_code, content = 500, {"status": "error", "message": str(e)}
+
+        self._latencies_us.append((time.perf_counter() - received) * 1_000_000)
+        return {"status_code": status_code, **content}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ingress counters and receive-to-queued latency in microseconds"""
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "listening": self.server is not None or self.transport is not None,
+            "alerts_received": self.alerts_received,
+            "decode_errors": self.decode_errors,
+            "latency_us": dict(percentiles(self._latencies_us), samples=len(self._latencies_us))
+        }
+
+
+class _AlertDatagramProtocol(asyncio.DatagramProtocol):
+    """UDP side of LocalAlertIngress - each datagram may carry several alert lines"""
+
+    def __init__(self, ingress: LocalAlertIngress):
+        self.ingress = ingress
+        self.transport = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        # Keep a reference until done - the loop only holds tasks weakly
+        task = asyncio.create_task(self._handle_datagram(data, addr))
+        self._tasks.add(task)
+        task.add_done_callback(self._datagram_done)
+
+    def _datagram_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ Local ingress datagram error: {str(task.exception())}")
+
+    async def _handle_datagram(self, data: bytes, addr):
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            reply = await self.ingress.handle_line(line)
+            if self.ingress.send_replies and self.transport:
+                self.transport.sendto(json.dumps(reply).encode() + b"\n", addr)
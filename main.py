@@ -6,7 +6,7 @@ import uvicorn
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from datetime import datetime, date, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, List, Union, Optional
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
@@ -19,19 +19,45 @@ from risk_manager import RiskManager
 from mt5_client import MT5Client
 from telegram_bot import TelegramBot
 from alert_processor import AlertProcessor
+from idempotency_store import IdempotencyStore
+from alert_queue import AlertIngestQueue
+from alert_journal import AlertJournal
+from local_ingress import LocalAlertIngress
+from engine_bridge import EngineBridgeServer, AUTHKEY_ENV
 from analytics_engine import AnalyticsEngine 
 from models import Alert
+from engine_state import thaw
 
 # Initialize components
 config = Config()
 risk_manager = RiskManager(config)
 mt5_client = MT5Client(config)
 telegram_bot = TelegramBot(config)
-alert_processor = AlertProcessor(config)
+idempotency_store = IdempotencyStore(config)
+alert_processor = AlertProcessor(config, idempotency_store)
 
 # Initialize trading engine with all components
 trading_engine = TradingEngine(config, risk_manager, mt5_client, telegram_bot, alert_processor)
 
+# Append-only record of every received alert and its outcome
+alert_journal = AlertJournal(config)
+
+# Final decision per alert - validation rejects are recorded here, the rest by the engine
+decision_audit = trading_engine.decision_audit
+
+async def process_queued_alert(alert: Alert) -> bool:
+    """Queue worker handler - runs the engine and journals the outcome"""
+    try:
+        result = await trading_engine.process_alert(alert)
+    except Exception as e:
+        alert_journal.complete(alert, "error", str(e))
+        raise
+    alert_journal.complete(alert, "processed" if result else "failed")
+    return result
+
+# Webhook -> per-symbol workers -> trading engine
+alert_queue = AlertIngestQueue(config, process_queued_alert, trading_engine.order_netter.eligible)
+
 # Set dependencies
 telegram_bot.set_dependencies(risk_manager, trading_engine)
 
@@ -39,6 +65,8 @@ telegram_bot.set_dependencies(risk_manager, trading_engine)
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown"""
     # Startup
+    await alert_journal.start()
+    await decision_audit.start()
     success = await trading_engine.initialize()
     
     if success:
@@ -50,6 +78,9 @@ async def lifespan(app: FastAPI):
                                  f"🔄 Re-entry System Enabled")
         # Start background tasks
         asyncio.create_task(trading_engine.manage_open_trades())
+        alert_queue.start()
+        await local_ingress.start()
+        await engine_bridge.start()
         telegram_bot.start_polling()
     else:
         # MT5 connection failed AND simulation not enabled - enable it now
@@ -65,6 +96,9 @@ async def lifespan(app: FastAPI):
                                      f"📊 To enable live trading: run windows_setup_admin.bat\n"
                                      f"🔄 Re-entry System Active")
             asyncio.create_task(trading_engine.manage_open_trades())
+            alert_queue.start()
+            await local_ingress.start()
+            await engine_bridge.start()
             telegram_bot.start_polling()
         else:
             error_msg = "❌ CRITICAL: Bot initialization failed even in simulation mode"
@@ -76,31 +110,222 @@ async def lifespan(app: FastAPI):
     
     # Shutdown (cleanup if needed)
     print("🔄 Trading bot shutting down...")
+    await engine_bridge.stop()
+    await local_ingress.stop()
+    await alert_queue.stop()
+    await trading_engine.trend_coalescer.flush()
+    await decision_audit.stop()
+    await alert_journal.stop()
+    await asyncio.to_thread(telegram_bot.flush_outbox)
+    await trading_engine.account_state.stop()
+    await mt5_client.symbol_cache.stop()
+    await mt5_client.tick_cache.stop()
+    await mt5_client.watchdog.stop()
+    await trading_engine.state.stop()
+    await asyncio.to_thread(mt5_client.executor.stop)
 
 app = FastAPI(title="Zepix Automated Trading Bot v2.0", lifespan=lifespan)
 
+async def ingest_alert(data: Any, source: str = "webhook") -> Tuple[int, Dict[str, Any]]:
+    """
+    Shared ingest path for every ingress (HTTP webhook, local socket/UDP)
+    Journal -> validate + dedup -> queue (or inline). Returns (status_code, body)
+    """
+    seq = alert_journal.record_received(data, source)
+    
+    queue_enabled = config.get("alert_queue", {}).get("enabled", True)
+    
+    # Reject before validation so a retried alert isn't flagged as duplicate
+    if queue_enabled and alert_queue.is_saturated():
+        alert_queue.rejected += 1
+        alert_journal.record_outcome(seq, "rejected", "queue saturated")
+        decision_audit.record(data, "rejected", "ingest", "queue_saturated")
+        return 429, {"status": "rejected", "message": "Alert queue saturated",
+                     "queue_depth": alert_queue.pending}
+    
+    # Validate alert
+    alert = alert_processor.validate_alert(data)
+    if alert is None:
+        alert_journal.record_outcome(seq, "rejected", "validation failed")
+        decision_audit.record(data, "rejected", "validation", alert_processor.last_reject_reason)
+        return 200, {"status": "rejected", "message": "Alert validation failed"}
+    
+    return await dispatch_alert(alert, seq)
+
+async def ingest_validated_alert(alert: Alert, source: str = "frontend") -> Tuple[int, Dict[str, Any]]:
+    """
+    Ingest path for alerts already built by a front-end worker process
+    Same journal/queue handling; only the stateful dedup checks run here
+    """
+    seq = alert_journal.record_received(alert.raw_data, source)
+    
+    queue_enabled = config.get("alert_queue", {}).get("enabled", True)
+    
+    if queue_enabled and alert_queue.is_saturated():
+        alert_queue.rejected += 1
+        alert_journal.record_outcome(seq, "rejected", "queue saturated")
+        decision_audit.record(alert, "rejected", "ingest", "queue_saturated")
+        return 429, {"status": "rejected", "message": "Alert queue saturated",
+                     "queue_depth": alert_queue.pending}
+    
+    if alert_processor.accept_alert(alert) is None:
+        alert_journal.record_outcome(seq, "rejected", "duplicate")
+        decision_audit.record(alert, "rejected", "validation", alert_processor.last_reject_reason)
+        return 200, {"status": "rejected", "message": "Alert validation failed"}
+    
+    return await dispatch_alert(alert, seq)
+
+async def ingest_rejected(rejects: List[Tuple[Any, Optional[str]]], source: str = "frontend") -> int:
+    """
+    Journal + audit payloads a front-end worker rejected during validation
+    rejects: (raw payload, reject reason) pairs. Returns the number recorded
+    """
+    for data, reason in rejects:
+        seq = alert_journal.record_received(data, source)
+        alert_journal.record_outcome(seq, "rejected", "validation failed")
+        decision_audit.record(data, "rejected", "validation", reason)
+    return len(rejects)
+
+async def dispatch_alert(alert: Alert, seq: int) -> Tuple[int, Dict[str, Any]]:
+    """Queue a validated alert (or process it inline when the queue is disabled)"""
+    queue_enabled = config.get("alert_queue", {}).get("enabled", True)
+    alert_journal.track(alert, seq)
+    
+    # Queue alert - per-symbol workers run it through the engine
+    if queue_enabled:
+        if not alert_queue.submit(alert):
+            # Not processed - the 429 invites a retry, which must not be a duplicate
+            alert_processor.release_alert(alert)
+            alert_journal.complete(alert, "rejected", "queue saturated")
+            decision_audit.record(alert, "rejected", "ingest", "queue_saturated")
+            return 429, {"status": "rejected", "message": "Alert queue saturated",
+                         "queue_depth": alert_queue.pending}
+        return 202, {"status": "accepted", "message": "Alert queued",
+                     "queue_depth": alert_queue.pending}
+    
+    # Queue disabled - process inline
+    result = await process_queued_alert(alert)
+    
+    if result:
+        return 200, {"status": "success", "message": "Alert processed"}
+    else:
+        return 200, {"status": "rejected", "message": "Alert processing failed"}
+
+# Optional Unix socket / UDP ingress for co-located producers (same ingest path)
+local_ingress = LocalAlertIngress(config, ingest_alert)
+
 @app.post("/webhook")
 async def handle_webhook(request: Request):
     """Handle incoming webhook alerts from TradingView/Zepix"""
     try:
-        data = await request.json()
+        # Decode body once - the validated Alert is passed straight to the engine
+        data = json.loads(await request.body())
+        status_code, content = await ingest_alert(data, "webhook")
+        return JSONResponse(status_code=status_code, content=content)
+            
+    except Exception as e:
+        error_msg = f"Webhook processing error: {str(e)}"
+        telegram_bot.send_message(f"❌ {error_msg}")
+        raise HTTPException(status_code=400, detail=error_msg)
+
+async def ingest_batch(items: List[Union[Dict[str, Any], Alert]], source: str = "batch") -> List[Dict[str, Any]]:
+    """
+    Validate a whole batch first (duplicates inside the batch are caught too),
+    then run it through the ingest queue (or the engine in one pass when the
+    queue is disabled) and wait for the outcomes. Items are raw payloads, or
+    Alerts already built by a front-end worker. Returns one result per item
+    """
+    results = [None] * len(items)
+    valid = []
+    for index, data in enumerate(items):
+        if isinstance(data, Alert):
+            seq = alert_journal.record_received(data.raw_data, source)
+            alert = alert_processor.accept_alert(data)
+        else:
+            seq = alert_journal.record_received(data, source)
+            alert = alert_processor.validate_alert(data)
+        if alert is None:
+            alert_journal.record_outcome(seq, "rejected", "validation failed")
+            decision_audit.record(data, "rejected", "validation", alert_processor.last_reject_reason)
+            results[index] = {"index": index, "status": "rejected", "message": "Alert validation failed"}
+        else:
+            alert_journal.track(alert, seq)
+            valid.append((index, alert))
+    
+    if config.get("alert_queue", {}).get("enabled", True):
+        outcomes = await queue_batch([alert for _, alert in valid])
+    else:
+        # Queue disabled - trend updates before entries, one pass under the symbol locks
+        outcomes = await trading_engine.process_alert_batch([alert for _, alert in valid])
+        for (_, alert), success in zip(valid, outcomes):
+            alert_journal.complete(alert, "processed" if success else "failed")
+    
+    for (index, alert), success in zip(valid, outcomes):
+        if success is None:
+            results[index] = {"index": index, "status": "rejected", "message": "Alert queue saturated",
+                              "type": alert.type, "symbol": alert.symbol}
+            continue
+        results[index] = {
+            "index": index,
+            "status": "success" if success else "rejected",
+            "message": "Alert processed" if success else "Alert processing failed",
+            "type": alert.type,
+            "symbol": alert.symbol
+        }
+    return results
+
+async def queue_batch(alerts: List[Alert]) -> List[Optional[bool]]:
+    """
+    Run batch alerts through the per-symbol ingest queue and wait for them
+    Submitted trend/bias first, then exits, then entries, so they keep the
+    queue's per-symbol order and exit priority. None = rejected (saturated)
+    """
+    loop = asyncio.get_running_loop()
+    waiters: List[Optional[asyncio.Future]] = [None] * len(alerts)
+    order = sorted(range(len(alerts)),
+                   key=lambda i: trading_engine.BATCH_ORDER.get(alerts[i].type, 2))
+    for i in order:
+        waiter = loop.create_future()
+        if alert_queue.submit(alerts[i], waiter):
+            waiters[i] = waiter
+        else:
+            alert_processor.release_alert(alerts[i])
+            alert_journal.complete(alerts[i], "rejected", "queue saturated")
+            decision_audit.record(alerts[i], "rejected", "ingest", "queue_saturated")
+    return [await waiter if waiter is not None else None for waiter in waiters]
+
+@app.post("/webhook/batch")
+async def handle_webhook_batch(request: Request):
+    """
+    Handle an ordered array of alerts from one bar close
+    Accepts either a JSON array or {"alerts": [...]}; returns one result per alert
+    """
+    try:
+        payload = json.loads(await request.body())
+        if isinstance(payload, dict):
+            payload = payload.get("alerts")
         
-        print(f"📨 Webhook received: {json.dumps(data, indent=2)}")
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail="Batch payload must be a JSON array of alerts")
         
-        # Validate alert
-        if not alert_processor.validate_alert(data):
-            return JSONResponse(content={"status": "rejected", "message": "Alert validation failed"})
+        max_alerts = config.get("batch_webhook", {}).get("max_alerts", 100)
+        if len(payload) > max_alerts:
+            raise HTTPException(status_code=413, detail=f"Batch too large ({len(payload)} > {max_alerts})")
         
-        # Process alert
-        result = await trading_engine.process_alert(data)
+        results = await ingest_batch(payload, "batch")
         
-        if result:
-            return JSONResponse(content={"status": "success", "message": "Alert processed"})
-        else:
-            return JSONResponse(content={"status": "rejected", "message": "Alert processing failed"})
-            
+        processed = sum(1 for result in results if result["status"] == "success")
+        return JSONResponse(content={
+            "status": "success",
+            "processed": processed,
+            "rejected": len(results) - processed,
+            "results": results
+        })
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        error_msg = f"Webhook processing error: {str(e)}"
+        error_msg = f"Batch webhook processing error: {str(e)}"
         telegram_bot.send_message(f"❌ {error_msg}")
         raise HTTPException(status_code=400, detail=error_msg)
 
@@ -114,6 +339,22 @@ async def health_check():
         "daily_loss": risk_manager.daily_loss,
         "lifetime_loss": risk_manager.lifetime_loss,
         "mt5_connected": mt5_client.initialized,
+        "mt5_connection": mt5_client.watchdog.get_stats(),
+        "alert_queue": alert_queue.get_stats(),
+        "alert_journal": alert_journal.get_stats(),
+        "idempotency": idempotency_store.get_stats(),
+        "local_ingress": local_ingress.get_stats(),
+        "trend_coalescing": trading_engine.trend_coalescer.get_stats(),
+        "engine_bridge": engine_bridge.get_stats(),
+        "decision_audit": decision_audit.get_stats(),
+        "mt5_executor": mt5_client.executor.get_stats(),
+        "symbol_metadata": mt5_client.symbol_cache.get_stats(),
+        "tick_cache": mt5_client.tick_cache.get_stats(),
+        "account_state": trading_engine.account_state.get_stats(),
+        "engine_state": trading_engine.state.get_stats(),
+        "strategies": trading_engine.strategies.get_stats(),
+        "order_netting": trading_engine.order_netter.get_stats(),
+        "order_execution": mt5_client.execution.get_stats(),
         "features": {
             "fixed_lots": True,
             "reentry_system": True,
@@ -122,9 +363,7 @@ async def health_check():
         }
     }
 
-@app.get("/stats")
-async def get_stats():
-    """Get current statistics"""
+def build_stats() -> Dict[str, Any]:
     stats = risk_manager.get_stats()
     return {
         "daily_profit": stats["daily_profit"],
@@ -135,27 +374,58 @@ async def get_stats():
         "win_rate": stats["win_rate"],
         "current_risk_tier": stats["current_risk_tier"],
         "risk_parameters": stats["risk_parameters"],
-        "trading_paused": trading_engine.is_paused,
+        "trading_paused": trading_engine.state.snapshot().trading_paused,
         "simulation_mode": config["simulate_orders"],
         "lot_size": stats["current_lot_size"],
         "balance": stats["account_balance"]
     }
 
+@app.get("/stats")
+async def get_stats():
+    """Get current statistics"""
+    return build_stats()
+
+@app.get("/queue")
+async def get_queue_status():
+    """Get alert ingest queue depth and counters"""
+    return {"status": "success", "queue": alert_queue.get_stats()}
+
+@app.get("/audit/report")
+async def get_audit_report(hours: float = 24, symbol: str = None):
+    """Reject reasons per symbol / logic / stage from the decision audit"""
+    try:
+        report = await asyncio.to_thread(decision_audit.report, hours, symbol)
+        return {"status": "success", "report": report}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+@app.get("/execution/stats")
+async def get_execution_stats():
+    """Per-symbol fill latency, slippage (pips), retries and reject codes"""
+    return {"status": "success", "execution": mt5_client.execution.get_stats()}
+
+@app.post("/execution/deviation")
+async def set_execution_deviation(symbol: str, points: int):
+    """Set the max deviation (points) for market orders on a symbol"""
+    try:
+        mt5_client.execution.set_deviation(symbol, points)
+        return {"status": "success", "message": f"Deviation for {symbol}: {points} points"}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
 @app.post("/pause")
 async def pause_trading():
     """Pause trading"""
-    trading_engine.is_paused = True
+    await trading_engine.state.execute(trading_engine.set_paused, True)
     return {"status": "success", "message": "Trading paused"}
 
 @app.post("/resume")
 async def resume_trading():
     """Resume trading"""
-    trading_engine.is_paused = False
+    await trading_engine.state.execute(trading_engine.set_paused, False)
     return {"status": "success", "message": "Trading resumed"}
 
-@app.get("/trends")
-async def get_trends():
-    """Get all trends"""
+def build_trends() -> Dict[str, Any]:
     trends = {}
     
     # Get all symbols that have trends set (both from webhooks and manual)
@@ -169,14 +439,34 @@ async def get_trends():
     
     for symbol in symbols:
         trends[symbol] = trading_engine.trend_manager.get_all_trends(symbol)
-    
-    return {"status": "success", "trends": trends}
+    return trends
+
+@app.get("/trends")
+async def get_trends():
+    """Get all trends"""
+    return {"status": "success", "trends": build_trends()}
+
+def engine_state_snapshot() -> Dict[str, Any]:
+    """Read-only state published for front-end worker processes"""
+    return {
+        "stats": build_stats(),
+        "trends": build_trends(),
+        "queue": alert_queue.get_stats(),
+        "mt5_connected": mt5_client.initialized,
+        "trading_paused": trading_engine.state.snapshot().trading_paused
+    }
+
+# Front-end worker processes -> engine IPC (enabled with --frontends N)
+engine_bridge = EngineBridgeServer(config, ingest_validated_alert, ingest_batch, ingest_rejected,
+                                   engine_state_snapshot)
 
 @app.post("/set_trend")
 async def set_trend_api(symbol: str, timeframe: str, trend: str, mode: str = "MANUAL"):
     """Set trend via API"""
     try:
-        trading_engine.trend_manager.update_trend(symbol, timeframe, trend.lower(), mode)
+        await trading_engine.state.execute(
+            trading_engine.trend_manager.update_trend, symbol, timeframe, trend.lower(), mode
+        )
         return {"status": "success", "message": f"Trend set for {symbol} {timeframe}: {trend}"}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -185,18 +475,19 @@ async def set_trend_api(symbol: str, timeframe: str, trend: str, mode: str = "MA
 async def get_reentry_chains():
     """Get active re-entry chains"""
     chains = []
-    for chain_id, chain in trading_engine.reentry_manager.active_chains.items():
-        chains.append(chain.dict())
+    for chain_id, chain in trading_engine.state.snapshot().chains.items():
+        chains.append(thaw(chain))
     return {"status": "success", "chains": chains}
 
 @app.get("/lot_config")
 async def get_lot_config():
     """Get lot size configuration"""
+    balance = await trading_engine.account_state.get_balance()
     return {
         "fixed_lots": config["fixed_lot_sizes"],
         "manual_overrides": config.get("manual_lot_overrides", {}),
-        "current_balance": mt5_client.get_account_balance(),
-        "current_lot": risk_manager.get_fixed_lot_size(mt5_client.get_account_balance())
+        "current_balance": balance,
+        "current_lot": risk_manager.get_fixed_lot_size(balance) if balance is not None else None
     }
 
 @app.post("/set_lot_size")
@@ -227,6 +518,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Zepix Trading Bot v2.0")
     parser.add_argument("--host", default="0.0.0.0", help="Host address")
     parser.add_argument("--port", default=80, type=int, help="Port number (default: 80 for Windows VM)")
+    parser.add_argument("--frontends", default=config.get("frontends", {}).get("workers", 0), type=int,
+                        help="Run N HTTP front-end worker processes in front of this engine process")
     args = parser.parse_args()
     
     rr_ratio = config.get("rr_ratio", 1.0)
@@ -242,4 +535,23 @@ if __name__ == "__main__":
     print("✓ Progressive SL reduction")
     print("=" * 50)
     
-    uvicorn.run(app, host=args.host, port=args.port)
\ No newline at end of file
+    if args.frontends > 0:
+        import subprocess
+        import sys
+        # Front-ends own the public port; the engine keeps its API on localhost
+        engine_port = config.get("frontends", {}).get("engine_port", 8081)
+        engine_bridge.enabled = True
+        os.environ[AUTHKEY_ENV] = engine_bridge.authkey.decode()
+        frontends = subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "frontend_server:app",
+            "--host", args.host, "--port", str(args.port), "--workers", str(args.frontends)
+        ])
+        print(f"Front-ends: {args.frontends} workers on {args.host}:{args.port}, "
+              f"engine API on 127.0.0.1:{engine_port}")
+        try:
+            uvicorn.run(app, host="127.0.0.1", port=engine_port)
+        finally:
+            frontends.terminate()
+            frontends.wait()
+    else:
+        uvicorn.run(app, host=args.host, port=args.port)
\ No newline at end of file
@@ -0,0 +1,12 @@
+from typing import Dict, Iterable, Optional
+
+def percentiles(samples: Iterable[float]) -> Dict[str, Optional[float]]:
+    """p50 / p95 / max of latency samples (None when there are no samples)"""
+    values = sorted(samples)
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    return {
+        "p50": round(values[len(values) // 2], 3),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 3),
+        "max": round(values[-1], 3)
+    }
@@ -11,6 +11,7 @@ class Alert(BaseModel):
     price: Optional[float] = None
     strategy: Optional[str] = None
     raw_data: Optional[Dict[str, Any]] = None
+    idempotency_key: Optional[str] = None  # Delivery key (client id or content hash + bar time)
     
     @validator('type')
     def validate_type(cls, v):
@@ -2,20 +2,65 @@ try:
     import MetaTrader5 as mt5
     MT5_AVAILABLE = True
 except ImportError:
+    mt5 = None
     MT5_AVAILABLE = False
     print("⚠️  MetaTrader5 not available (Windows only). Running in simulation mode.")
 
+import functools
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from broker_backend import create_broker_backend
 from config import Config
 from models import Trade
+from mt5_executor import MT5Executor
+from mt5_watchdog import MT5Watchdog
+from order_execution import OrderExecution
+from symbol_metadata import SymbolMetadata, SymbolMetadataCache
+from tick_cache import TickCache
+
+# symbol_info().filling_mode flags
+SYMBOL_FILLING_FOK = 1
+SYMBOL_FILLING_IOC = 2
+
+# Simulation mode quotes
+SIMULATED_PRICES = {
+    "XAUUSD": 2650.0, "GOLD": 2650.0,
+    "EURUSD": 1.0850, "GBPUSD": 1.2650,
+    "USDJPY": 149.50, "USDCAD": 1.3550
+}
+
+def on_mt5_thread(kind: str = "call"):
+    """
+    Run an MT5Client method on the MT5 executor thread
+    (inline when already on it); kind picks the timeout: call / order / connect
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self.executor.run_sync(method, self, *args,
+                                          timeout=self.executor.timeout_for(kind), **kwargs)
+        return wrapper
+    return decorator
 
 class MT5Client:
     def __init__(self, config: Config):
         self.config = config
         self.initialized = False
+        # MetaTrader5 module, simulator or custom backend (None -> dummy simulation mode)
+        self.mt5 = create_broker_backend(config, mt5 if MT5_AVAILABLE else None)
         # Load symbol mapping from config for broker compatibility
         self.symbol_mapping = config.get("symbol_mapping", {})
+        # Every terminal call runs on this one thread (MetaTrader5 is not thread-safe)
+        self.executor = MT5Executor(config)
+        # Digits / volume limits / filling modes per broker symbol (no symbol_info on the order path)
+        self.symbol_cache = SymbolMetadataCache(config)
+        # Latest tick per active symbol, polled in the background - price reads use it first
+        self.tick_cache = TickCache(config)
+        # Deviation per symbol, requote retries and fill / reject statistics
+        self.execution = OrderExecution(config)
+        self._reverse_mapping = {mapped: symbol for symbol, mapped in self.symbol_mapping.items()}
+        # Heartbeat + backoff reconnect in the background (started by the engine)
+        self.watchdog = MT5Watchdog(config)
 
     def _map_symbol(self, symbol: str) -> str:
         """
@@ -27,39 +72,19 @@ class MT5Client:
             print(f"🔄 Symbol mapping: {symbol} → {mapped}")
         return mapped
 
+    @on_mt5_thread("connect")
     def initialize(self) -> bool:
         """Initialize MT5 connection with retry logic"""
-        if not MT5_AVAILABLE:
+        if self.mt5 is None:
             print("⚠️  Running in simulation mode (MT5 not available on this platform)")
             self.initialized = True
             return True
             
         for i in range(self.config["mt5_retries"]):
-            try:
-                if not mt5.initialize():
-                    print(f"MT5 initialization failed, retry {i+1}/{self.config['mt5_retries']}")
-                    time.sleep(self.config["mt5_wait"])
-                    continue
-                
-                authorized = mt5.login(
-                    self.config["mt5_login"],
-                    self.config["mt5_password"],
-                    self.config["mt5_server"]
-                )
-                
-                if authorized:
-                    self.initialized = True
-                    print("✅ MT5 connection established")
-                    account_info = mt5.account_info()
-                    print(f"Account Balance: ${account_info.balance:.2f}")
-                    return True
-                else:
-                    print(f"MT5 login failed, retry {i+1}/{self.config['mt5_retries']}")
-                    time.sleep(self.config["mt5_wait"])
-                    
-            except Exception as e:
-                print(f"MT5 connection error: {str(e)}")
-                time.sleep(self.config["mt5_wait"])
+            if self.connect_once():
+                return True
+            print(f"MT5 connection attempt failed, retry {i+1}/{self.config['mt5_retries']}")
+            time.sleep(self.config["mt5_wait"])
         
         print("❌ Failed to connect to MT5 after retries")
         
@@ -71,6 +96,177 @@ class MT5Client:
         
         return False
 
+    @on_mt5_thread("connect")
+    def connect_once(self) -> bool:
+        """One initialize + login attempt, no sleeping (the watchdog owns the backoff)"""
+        try:
+            if not self.mt5.initialize():
+                print(f"MT5 initialization failed: {self.mt5.last_error()}")
+                return False
+            
+            authorized = self.mt5.login(
+                self.config["mt5_login"],
+                self.config["mt5_password"],
+                self.config["mt5_server"]
+            )
+            if not authorized:
+                print(f"MT5 login failed: {self.mt5.last_error()}")
+                return False
+            
+            self.initialized = True
+            print("✅ MT5 connection established")
+            account_info = self.mt5.account_info()
+            print(f"Account Balance: ${account_info.balance:.2f}")
+            self.refresh_symbol_metadata()
+            return True
+        except Exception as e:
+            print(f"MT5 connection error: {str(e)}")
+            return False
+
+    @on_mt5_thread()
+    def heartbeat(self) -> bool:
+        """Cheap liveness probe (terminal_info) - a lost terminal marks the client disconnected"""
+        if self.mt5 is None:
+            return self.initialized
+        info = self.mt5.terminal_info()
+        if info is None or not info.connected:
+            self.initialized = False
+            return False
+        return self.initialized
+
+    def _ensure_connected(self) -> bool:
+        """
+        Lazy connect for terminal calls: while the watchdog is running it owns
+        reconnecting, so a disconnected client fails fast instead of blocking
+        the MT5 thread for mt5_retries x mt5_wait
+        """
+        if self.initialized:
+            return True
+        if self.watchdog.running:
+            return False
+        return self.initialize()
+
+    def _load_symbol_metadata(self, mt5_symbol: str) -> Optional[SymbolMetadata]:
+        """symbol_info (+ symbol_select if hidden) -> cached metadata; None if the broker lacks the symbol"""
+        symbol_info = self.mt5.symbol_info(mt5_symbol)
+        if symbol_info is None:
+            print(f"❌ Symbol {mt5_symbol} not found in MT5")
+            return None
+        
+        if not symbol_info.visible:
+            print(f"Symbol {mt5_symbol} is not visible, attempting to enable")
+            if not self.mt5.symbol_select(mt5_symbol, True):
+                print(f"❌ Failed to enable symbol {mt5_symbol}")
+                return None
+        
+        # Preferred order: IOC, FOK (as the symbol allows), then RETURN
+        filling_modes = []
+        if symbol_info.filling_mode & SYMBOL_FILLING_IOC:
+            filling_modes.append(self.mt5.ORDER_FILLING_IOC)
+        if symbol_info.filling_mode & SYMBOL_FILLING_FOK:
+            filling_modes.append(self.mt5.ORDER_FILLING_FOK)
+        filling_modes.append(self.mt5.ORDER_FILLING_RETURN)
+        
+        metadata = SymbolMetadata(
+            broker_symbol=mt5_symbol,
+            digits=symbol_info.digits,
+            point=symbol_info.point,
+            volume_min=symbol_info.volume_min,
+            volume_max=symbol_info.volume_max,
+            volume_step=symbol_info.volume_step,
+            stops_level=symbol_info.trade_stops_level,
+            tick_value=symbol_info.trade_tick_value,
+            tick_size=symbol_info.trade_tick_size,
+            filling_modes=tuple(filling_modes),
+            fetched_at=time.time()
+        )
+        self.symbol_cache.put(metadata)
+        return metadata
+
+    def _symbol_metadata(self, mt5_symbol: str) -> Optional[SymbolMetadata]:
+        """Cached metadata - loaded on a miss (symbol not in config / first use)"""
+        return self.symbol_cache.get(mt5_symbol) or self._load_symbol_metadata(mt5_symbol)
+
+    @on_mt5_thread()
+    def refresh_symbol_metadata(self) -> int:
+        """Reload metadata for every configured symbol - returns how many loaded"""
+        if self.mt5 is None or not self.initialized:
+            return 0
+        loaded = 0
+        for symbol in self.config.get("symbol_config", {}):
+            try:
+                if self._load_symbol_metadata(self.symbol_mapping.get(symbol, symbol)):
+                    loaded += 1
+            except Exception as e:
+                print(f"⚠️ Symbol metadata error for {symbol}: {str(e)}")
+        self.symbol_cache.refreshes += 1
+        return loaded
+
+    def _order_send(self, request: Dict[str, Any], metadata: SymbolMetadata):
+        """
+        order_send with the symbol's preferred filling mode
+        An invalid-fill reject retries with the next supported mode, which is then remembered
+        """
+        result = None
+        for filling_mode in metadata.filling_modes:
+            request["type_filling"] = filling_mode
+            result = self.mt5.order_send(request)
+            if result is None or result.retcode != self.mt5.TRADE_RETCODE_INVALID_FILL:
+                break
+            print(f"⚠️ Filling mode {filling_mode} rejected for {metadata.broker_symbol} - trying next")
+        if result is not None and result.retcode == self.mt5.TRADE_RETCODE_DONE:
+            self.symbol_cache.prefer_filling(metadata.broker_symbol, request["type_filling"])
+        return result
+
+    def _execute(self, request: Dict[str, Any], metadata: SymbolMetadata, symbol: str, is_buy: bool):
+        """
+        Market order pipeline: fresh tick -> optional order_check -> order_send
+        Requote / price-changed rejects are resent at a fresh price within the
+        retry budget; fills and rejects are recorded per symbol
+        """
+        execution = self.execution
+        request["deviation"] = execution.deviation_for(symbol)
+        started = time.perf_counter()
+        quoted = None
+        attempts = 0
+        while True:
+            attempts += 1
+            tick = self.mt5.symbol_info_tick(metadata.broker_symbol)
+            if tick is None:
+                print(f"❌ No tick for {metadata.broker_symbol}: {self.mt5.last_error()}")
+                execution.record_failure(symbol, attempts - 1)
+                return None
+            request["price"] = metadata.round_price(tick.ask if is_buy else tick.bid)
+            if quoted is None:
+                quoted = request["price"]
+            
+            if execution.order_check and attempts == 1:
+                request["type_filling"] = metadata.filling_modes[0]
+                check = self.mt5.order_check(request)
+                if check is None or check.retcode != 0:
+                    print(f"❌ Order check failed for {metadata.broker_symbol}: "
+                          f"{check.comment if check else self.mt5.last_error()}")
+                    execution.record_reject(symbol, check.retcode if check else None)
+                    execution.record_failure(symbol, attempts)
+                    return check
+            
+            result = self._order_send(request, metadata)
+            if result is not None and result.retcode == self.mt5.TRADE_RETCODE_DONE:
+                fill_price = getattr(result, "price", 0) or request["price"]
+                slippage = (fill_price - quoted) if is_buy else (quoted - fill_price)
+                execution.record_fill(symbol, (time.perf_counter() - started) * 1000,
+                                      round(slippage / execution.pip_size(symbol, metadata.point), 2), attempts)
+                return result
+            
+            execution.record_reject(symbol, result.retcode if result is not None else None)
+            if result is None or not execution.should_retry(result.retcode, attempts, started):
+                execution.record_failure(symbol, attempts)
+                return result
+            print(f"🔁 {metadata.broker_symbol} {result.comment} (code {result.retcode}) - "
+                  f"resending at a fresh price ({attempts}/{execution.max_retries})")
+            time.sleep(execution.retry_delay)
+
+    @on_mt5_thread("order")
     def place_order(self, symbol: str, order_type: str, lot_size: float, 
                    price: float, sl: float, tp: float = None, 
                    comment: str = "") -> Optional[int]:
@@ -78,12 +274,11 @@ class MT5Client:
         Place a new order with TP support and automatic symbol mapping
         This function translates TradingView symbols to broker-specific symbols
         """
-        if not self.initialized:
-            if not self.initialize():
-                return None
+        if not self._ensure_connected():
+            return None
         
         # Simulation mode
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if self.mt5 is None or self.config.get("simulate_orders", True):
             import random
             simulated_ticket = random.randint(100000, 999999)
             print(f"🎭 SIMULATED ORDER: {order_type.upper()} {lot_size} lots {symbol} @ {price}, SL={sl}, TP={tp} (Ticket #{simulated_ticket})")
@@ -93,58 +288,53 @@ class MT5Client:
         mt5_symbol = self._map_symbol(symbol)
         
         try:
-            # Get symbol info using the mapped broker symbol
-            symbol_info = mt5.symbol_info(mt5_symbol)
-            if symbol_info is None:
-                print(f"❌ Symbol {mt5_symbol} not found in MT5")
+            # Cached broker metadata for the mapped symbol (filled at connect)
+            metadata = self._symbol_metadata(mt5_symbol)
+            if metadata is None:
                 return None
-                
-            if not symbol_info.visible:
-                print(f"Symbol {mt5_symbol} is not visible, attempting to enable")
-                if not mt5.symbol_select(mt5_symbol, True):
-                    print(f"❌ Failed to enable symbol {mt5_symbol}")
-                    return None
             
-            # Determine order type and get current price
+            # Determine order type (the price comes from a fresh tick in _execute)
             if order_type == "buy":
-                order_type_mt5 = mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(mt5_symbol).ask
+                order_type_mt5 = self.mt5.ORDER_TYPE_BUY
             else:
-                order_type_mt5 = mt5.ORDER_TYPE_SELL
-                price = mt5.symbol_info_tick(mt5_symbol).bid
+                order_type_mt5 = self.mt5.ORDER_TYPE_SELL
             
-            # Round prices to symbol's digit precision
-            digits = symbol_info.digits
-            price = round(price, digits)
-            sl = round(sl, digits)
+            # Round prices to symbol's digit precision, volume to its step
+            sl = metadata.round_price(sl)
             if tp:
-                tp = round(tp, digits)
+                tp = metadata.round_price(tp)
+            volume = metadata.normalize_volume(lot_size)
+            if volume is None:
+                print(f"❌ Order refused: {lot_size} lots is below {mt5_symbol}'s minimum volume {metadata.volume_min}")
+                return None
+            if volume != lot_size:
+                print(f"⚠️ Volume {lot_size} adjusted to {volume} for {mt5_symbol} (step {metadata.volume_step})")
             
             # Prepare order request with mapped symbol
             request = {
-                "action": mt5.TRADE_ACTION_DEAL,
+                "action": self.mt5.TRADE_ACTION_DEAL,
                 "symbol": mt5_symbol,  # Use broker's symbol name
-                "volume": lot_size,
+                "volume": volume,
                 "type": order_type_mt5,
-                "price": price,
                 "sl": sl,
-                "deviation": 20,
                 "magic": 234000,
                 "comment": comment,
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
+                "type_time": self.mt5.ORDER_TIME_GTC,
             }
             
             # Add TP if provided
             if tp:
                 request["tp"] = tp
             
-            # Send order to MT5
-            result = mt5.order_send(request)
+            # Send order to MT5 (filling mode from the symbol cache, requotes retried)
+            result = self._execute(request, metadata, symbol, order_type == "buy")
             
-            if result.retcode != mt5.TRADE_RETCODE_DONE:
+            if result is None:
+                print(f"❌ Order failed: {self.mt5.last_error()}")
+                return None
+            if result.retcode != self.mt5.TRADE_RETCODE_DONE:
                 print(f"❌ Order failed: {result.comment} (Error code: {result.retcode})")
-                print(f"Request details: Symbol={mt5_symbol}, Lot={lot_size}, Price={price}, SL={sl}, TP={tp}")
+                print(f"Request details: Symbol={mt5_symbol}, Lot={volume}, Price={request['price']}, SL={sl}, TP={tp}")
                 return None
             
             print(f"✅ Order placed successfully: Ticket #{result.order}")
@@ -156,24 +346,24 @@ class MT5Client:
             traceback.print_exc()
             return None
 
-    def close_position(self, position_id: int, percentage: float = 100):
-        """Close a position completely"""
-        if not self.initialized:
-            if not self.initialize():
-                return False
+    @on_mt5_thread("order")
+    def close_position(self, position_id: int, percentage: float = 100, volume: Optional[float] = None):
+        """Close a position completely, or just `volume` lots of it (netted orders)"""
+        if not self._ensure_connected():
+            return False
         
         # Simulation mode - always return success
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
-            print(f"🎭 SIMULATED CLOSE: Position #{position_id}")
+        if self.mt5 is None or self.config.get("simulate_orders", True):
+            print(f"🎭 SIMULATED CLOSE: Position #{position_id}" + (f" ({volume} lots)" if volume else ""))
             return True
         
         try:
             # Get position by ticket
-            positions = mt5.positions_get(ticket=position_id)
+            positions = self.mt5.positions_get(ticket=position_id)
             
             # Check if it's an API error vs position not found
             if positions is None:
-                error = mt5.last_error()
+                error = self.mt5.last_error()
                 print(f"❌ MT5 API error when getting position {position_id}: {error}")
                 return False  # API error - don't mark as closed
             
@@ -184,32 +374,41 @@ class MT5Client:
             position = positions[0]
             
             # Prepare close request
-            symbol_info = mt5.symbol_info(position.symbol)
+            metadata = self._symbol_metadata(position.symbol)
+            if metadata is None:
+                return False
             
-            if position.type == mt5.ORDER_TYPE_BUY:
-                order_type = mt5.ORDER_TYPE_SELL
-                price = mt5.symbol_info_tick(position.symbol).bid
+            if position.type == self.mt5.ORDER_TYPE_BUY:
+                order_type = self.mt5.ORDER_TYPE_SELL
             else:
-                order_type = mt5.ORDER_TYPE_BUY
-                price = mt5.symbol_info_tick(position.symbol).ask
+                order_type = self.mt5.ORDER_TYPE_BUY
+            
+            close_volume = position.volume
+            if volume:
+                normalized = metadata.normalize_volume(volume)
+                if normalized is None:
+                    print(f"❌ Close refused: {volume} lots is below {position.symbol}'s minimum volume {metadata.volume_min}")
+                    return False
+                close_volume = min(normalized, position.volume)
             
             request = {
-                "action": mt5.TRADE_ACTION_DEAL,
+                "action": self.mt5.TRADE_ACTION_DEAL,
                 "position": position_id,
                 "symbol": position.symbol,
-                "volume": position.volume,
+                "volume": close_volume,
                 "type": order_type,
-                "price": price,
-                "deviation": 20,
                 "magic": 234000,
-                "comment": f"Close_{percentage}%",
-                "type_time": mt5.ORDER_TIME_GTC,
-                "type_filling": mt5.ORDER_FILLING_IOC,
+                "comment": f"Close_{volume}" if volume else f"Close_{percentage}%",
+                "type_time": self.mt5.ORDER_TIME_GTC,
             }
             
-            result = mt5.order_send(request)
+            symbol = self._reverse_mapping.get(position.symbol, position.symbol)
+            result = self._execute(request, metadata, symbol, order_type == self.mt5.ORDER_TYPE_BUY)
             
-            if result.retcode == mt5.TRADE_RETCODE_DONE:
+            if result is None:
+                print(f"Failed to close position: {self.mt5.last_error()}")
+                return False
+            if result.retcode == self.mt5.TRADE_RETCODE_DONE:
                 print(f"✅ Position {position_id} closed successfully")
                 return True
             else:
@@ -220,56 +419,123 @@ class MT5Client:
             print(f"Position close error: {str(e)}")
             return False
 
+    @on_mt5_thread()
     def get_current_price(self, symbol: str) -> float:
         """
         Get current price for a symbol with automatic mapping support
         Handles both TradingView symbols and broker symbols
         """
-        if not self.initialized:
-            if not self.initialize():
-                return 0.0
+        if not self._ensure_connected():
+            return 0.0
         
         # Simulation mode - return dummy prices
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
-            dummy_prices = {
-                "XAUUSD": 2650.0, "GOLD": 2650.0,
-                "EURUSD": 1.0850, "GBPUSD": 1.2650,
-                "USDJPY": 149.50, "USDCAD": 1.3550
-            }
-            return dummy_prices.get(symbol, 1.0)
+        if self.mt5 is None or self.config.get("simulate_orders", True):
+            return SIMULATED_PRICES.get(symbol, 1.0)
         
         # Map symbol to broker's format
         mt5_symbol = self._map_symbol(symbol)
         
         try:
-            tick = mt5.symbol_info_tick(mt5_symbol)
+            tick = self.mt5.symbol_info_tick(mt5_symbol)
             if tick:
                 return (tick.ask + tick.bid) / 2
             return 0.0
         except:
             return 0.0
 
+    @on_mt5_thread()
+    def get_tick_price(self, symbol: str, direction: str) -> Optional[float]:
+        """Ask for buys, bid for sells (symbol mapped to the broker's name) - None if no tick"""
+        if not self._ensure_connected():
+            return None
+        
+        if self.mt5 is None or self.config.get("simulate_orders", True):
+            return SIMULATED_PRICES.get(symbol, 1.0)
+        
+        try:
+            tick = self.mt5.symbol_info_tick(self.symbol_mapping.get(symbol, symbol))
+            if tick:
+                return tick.ask if direction == 'buy' else tick.bid
+            return None
+        except:
+            return None
+
+    @on_mt5_thread()
+    def poll_ticks(self, symbols: List[str]) -> int:
+        """Refresh the tick cache for these symbols in one executor call - returns ticks stored"""
+        if not self.initialized:
+            return 0
+        
+        stored = 0
+        if self.mt5 is None or self.config.get("simulate_orders", True):
+            now_msc = int(time.time() * 1000)
+            for symbol in symbols:
+                price = SIMULATED_PRICES.get(symbol, 1.0)
+                self.tick_cache.update(symbol, price, price, now_msc)
+                stored += 1
+            return stored
+        
+        for symbol in symbols:
+            tick = self.mt5.symbol_info_tick(self.symbol_mapping.get(symbol, symbol))
+            if tick:
+                self.tick_cache.update(symbol, tick.bid, tick.ask, tick.time_msc)
+                stored += 1
+        return stored
+
+    @on_mt5_thread()
     def get_account_balance(self) -> float:
         """Get current account balance"""
-        if not self.initialized:
-            if not self.initialize():
-                return 0.0
+        if not self._ensure_connected():
+            return 0.0
         
         # Simulation mode - return dummy balance
-        if not MT5_AVAILABLE or self.config.get("simulate_orders", True):
+        if self.mt5 is None or self.config.get("simulate_orders", True):
             return 10000.0
         
         try:
-            account_info = mt5.account_info()
+            account_info = self.mt5.account_info()
             if account_info:
                 return account_info.balance
             return 0.0
         except:
             return 0.0
 
+    @on_mt5_thread()
+    def get_account_info(self) -> Optional[Dict[str, float]]:
+        """Balance, equity, margin and free margin in one terminal call (None on error)"""
+        if not self._ensure_connected():
+            return None
+        
+        # Simulation mode - dummy account
+        if self.mt5 is None or self.config.get("simulate_orders", True):
+            return {"balance": 10000.0, "equity": 10000.0, "margin": 0.0, "free_margin": 10000.0}
+        
+        try:
+            account_info = self.mt5.account_info()
+            if account_info is None:
+                return None
+            return {
+                "balance": account_info.balance,
+                "equity": account_info.equity,
+                "margin": account_info.margin,
+                "free_margin": account_info.margin_free
+            }
+        except:
+            return None
+
+    @on_mt5_thread()
+    def get_positions(self):
+        """All open positions - None when the terminal is unavailable or on API error"""
+        if self.mt5 is None:
+            return None
+        if not self._ensure_connected():
+            return None
+        return self.mt5.positions_get()
+
+    @on_mt5_thread()
     def shutdown(self):
         """Shutdown MT5 connection gracefully"""
-        if self.initialized:
-            mt5.shutdown()
+        if self.initialized and self.mt5 is not None:
+            self.mt5.shutdown()
             self.initialized = False
             print("MT5 connection closed")
\ No newline at end of file
@@ -0,0 +1,282 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional
+from config import Config
+from metrics import percentiles
+
+# Sentinel: use the executor's configured call timeout
+DEFAULT_TIMEOUT = object()
+
+class MT5CallTimeout(TimeoutError):
+    """An MT5 call did not finish within its timeout"""
+
+
+class _MT5Request:
+    __slots__ = ("fn", "args", "kwargs", "name", "future", "enqueued_at")
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.name = getattr(fn, "__name__", repr(fn))
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MT5Executor:
+    """
+    One dedicated thread for every MetaTrader5 terminal call
+    - The MetaTrader5 module is not thread-safe: all calls are queued and
+      run strictly one at a time, in submission order
+    - Async callers await run(), sync callers (Telegram thread) use run_sync();
+      calls made from the executor thread itself run inline
+    - Per-call timeouts; a call that has not started when its caller gives up
+      is dropped from the queue, one already running is reported when it ends
+    - Metrics: queue depth, queue wait, call latency, timeouts, errors
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        executor_config = config.get("mt5_executor", {})
+        self.call_timeout = executor_config.get("call_timeout_seconds", 10)
+        self.order_timeout = executor_config.get("order_timeout_seconds", 30)
+        self.latency_samples = executor_config.get("latency_samples", 1000)
+
+        self._queue: "queue.Queue[Optional[_MT5Request]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._current: Optional[_MT5Request] = None
+        self._current_started = 0.0
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.late_completions = 0
+        self._queue_wait_ms = deque(maxlen=self.latency_samples)
+        self._call_ms = deque(maxlen=self.latency_samples)
+        self._by_call: Dict[str, Dict[str, float]] = {}
+
+    def timeout_for(self, kind: str) -> Optional[float]:
+        """Default timeout per call kind: 'call', 'order' or 'connect' (no limit)"""
+        if kind == "order":
+            return self.order_timeout
+        if kind == "connect":
+            return None
+        return self.call_timeout
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._worker, name="mt5-executor", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Finish queued calls, then stop the thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        self._thread = None
+
+    def in_worker_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Queue a call and return its concurrent.futures.Future"""
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        request = _MT5Request(fn, args, kwargs)
+        self.submitted += 1
+        self._queue.put(request)
+        return request.future
+
+    async def run(self, fn, *args, timeout: Any = DEFAULT_TIMEOUT, **kwargs):
+        """Await fn(*args, **kwargs) on the MT5 thread"""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.call_timeout
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(fn, future)
+            raise MT5CallTimeout(f"MT5 call {_name(fn)} timed out after {timeout}s") from None
+        except asyncio.CancelledError:
+            self._abandon(fn, future, timed_out=False)
+            raise
+
+    def run_sync(self, fn, *args, timeout: Any = DEFAULT_TIMEOUT, **kwargs):
+        """Blocking fn(*args, **kwargs) on the MT5 thread (inline if already on it)"""
+        if self.in_worker_thread():
+            return fn(*args, **kwargs)
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.call_timeout
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self._abandon(fn, future)
+            raise MT5CallTimeout(f"MT5 call {_name(fn)} timed out after {timeout}s") from None
+
+    def _abandon(self, fn, future: Future, timed_out: bool = True):
+        """Caller gave up: drop the call if still queued, else report its late result"""
+        if timed_out:
+            self.timeouts += 1
+        # wrap_future / wait_for may already have cancelled a queued call
+        if future.cancelled() or future.cancel():
+            return
+        name = _name(fn)
+        given_up_at = time.perf_counter()
+
+        def report(done: Future):
+            self.late_completions += 1
+            late_ms = (time.perf_counter() - given_up_at) * 1000
+            outcome = f"error={done.exception()!r}" if done.exception() else f"result={done.result()!r}"
+            print(f"⚠️ MT5 call {name} finished {late_ms:.0f}ms after its caller gave up: {outcome}")
+
+        future.add_done_callback(report)
+
+    def _worker(self):
+        while True:
+            request = self._queue.get()
+            if request is None:
+                break
+            if not request.future.set_running_or_notify_cancel():
+                self.cancelled += 1
+                continue
+
+            started = time.perf_counter()
+            self._queue_wait_ms.append((started - request.enqueued_at) * 1000)
+            self._current, self._current_started = request, started
+            try:
+                result = request.fn(*request.args, **request.kwargs)
+            except BaseException as e:
+                self.errors += 1
+                request.future.set_exception(e)
+            else:
+                request.future.set_result(result)
+            finally:
+                self._current = None
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._call_ms.append(elapsed_ms)
+            self.completed += 1
+            call_stats = self._by_call.get(request.name)
+            if call_stats is None:
+                call_stats = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+                self._by_call[request.name] = call_stats
+            call_stats["count"] += 1
+            call_stats["total_ms"] += elapsed_ms
+            call_stats["max_ms"] = max(call_stats["max_ms"], elapsed_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        current = self._current
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "queue_depth": self._queue.qsize(),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "late_completions": self.late_completions,
+            "current_call": current.name if current else None,
+            "current_call_ms": round((time.perf_counter() - self._current_started) * 1000, 1) if current else None,
+            "queue_wait_ms": percentiles(self._queue_wait_ms),
+            "call_ms": percentiles(self._call_ms),
+            "by_call": {
+                name: {"count": int(s["count"]), "avg_ms": round(s["total_ms"] / s["count"], 3),
+                       "max_ms": round(s["max_ms"], 3)}
+                for name, s in list(self._by_call.items())
+            }
+        }
+
+
+class AsyncMT5Client:
+    """
+    Awaitable facade over MT5Client - every call runs on the MT5 executor thread
+    Used by the engine, price monitor and reversal handler so no terminal
+    round-trip ever runs on the event loop.
+    """
+
+    def __init__(self, client, executor: MT5Executor):
+        self.client = client
+        self.executor = executor
+        self._trade_listeners = []
+
+    def add_trade_listener(self, callback):
+        """callback(event, ticket) after a successful order fill ('fill') or close ('close')"""
+        self._trade_listeners.append(callback)
+
+    def _notify(self, event: str, ticket):
+        for callback in self._trade_listeners:
+            try:
+                callback(event, ticket)
+            except Exception as e:
+                print(f"⚠️ Trade listener error: {str(e)}")
+
+    async def run(self, fn, *args, timeout: Any = DEFAULT_TIMEOUT, **kwargs):
+        """Any blocking callable on the MT5 thread (e.g. a batch of price reads)"""
+        return await self.executor.run(fn, *args, timeout=timeout, **kwargs)
+
+    async def initialize(self) -> bool:
+        return await self.run(self.client.initialize, timeout=self.executor.timeout_for("connect"))
+
+    async def place_order(self, **kwargs) -> Optional[int]:
+        if not await self.client.watchdog.allow_order(f"Order {kwargs.get('symbol', '')}"):
+            return None
+        ticket = await self.run(self.client.place_order, timeout=self.executor.timeout_for("order"), **kwargs)
+        if ticket:
+            self._notify("fill", ticket)
+        return ticket
+
+    async def close_position(self, position_id: int, percentage: float = 100,
+                             volume: Optional[float] = None) -> bool:
+        if not await self.client.watchdog.allow_order(f"Close #{position_id}"):
+            return False
+        closed = await self.run(self.client.close_position, position_id, percentage, volume,
+                                timeout=self.executor.timeout_for("order"))
+        if closed:
+            self._notify("close", position_id)
+        return closed
+
+    async def refresh_symbol_metadata(self) -> int:
+        return await self.run(self.client.refresh_symbol_metadata)
+
+    async def get_current_price(self, symbol: str) -> float:
+        """Mid price - from the tick cache when fresh, otherwise one MT5 call"""
+        price = self.client.tick_cache.price(symbol)
+        if price is not None:
+            return price
+        return await self.run(self.client.get_current_price, symbol)
+
+    async def get_tick_price(self, symbol: str, direction: str) -> Optional[float]:
+        """Ask for buys, bid for sells - tick cache first"""
+        price = self.client.tick_cache.price(symbol, direction)
+        if price is not None:
+            return price
+        return await self.run(self.client.get_tick_price, symbol, direction)
+
+    async def poll_ticks(self, symbols: List[str]) -> int:
+        return await self.run(self.client.poll_ticks, symbols)
+
+    async def get_account_balance(self) -> float:
+        return await self.run(self.client.get_account_balance)
+
+    async def get_account_info(self) -> Optional[Dict[str, float]]:
+        return await self.run(self.client.get_account_info)
+
+    async def get_positions(self):
+        return await self.run(self.client.get_positions)
+
+
+def _name(fn) -> str:
+    return getattr(fn, "__name__", repr(fn))
@@ -0,0 +1,660 @@
+import csv
+import math
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+from config import Config
+
+# Start quotes for the synthetic feed (broker symbol names)
+START_PRICES = {
+    "EURUSD": 1.0850, "GBPUSD": 1.2650, "USDJPY": 149.50, "AUDUSD": 0.6550,
+    "USDCAD": 1.3550, "NZDUSD": 0.6000, "EURJPY": 162.20, "GBPJPY": 189.10,
+    "AUDJPY": 97.90, "XAUUSD": 2650.0, "GOLD": 2650.0
+}
+GOLD_SYMBOLS = ("XAUUSD", "GOLD")
+
+
+class Tick(NamedTuple):
+    time: int
+    bid: float
+    ask: float
+    last: float
+    volume: int
+    time_msc: int
+    flags: int
+    volume_real: float
+
+
+class SymbolInfo(NamedTuple):
+    name: str
+    visible: bool
+    digits: int
+    point: float
+    spread: int
+    trade_stops_level: int
+    trade_contract_size: float
+    trade_tick_value: float
+    trade_tick_size: float
+    volume_min: float
+    volume_max: float
+    volume_step: float
+    filling_mode: int
+    bid: float
+    ask: float
+
+
+class AccountInfo(NamedTuple):
+    login: int
+    leverage: int
+    balance: float
+    credit: float
+    profit: float
+    equity: float
+    margin: float
+    margin_free: float
+    margin_level: float
+    currency: str
+    server: str
+    company: str
+
+
+class TerminalInfo(NamedTuple):
+    connected: bool
+    trade_allowed: bool
+    ping_last: int          # microseconds
+    name: str
+    company: str
+
+
+class TradePosition(NamedTuple):
+    ticket: int
+    time: int
+    time_msc: int
+    type: int
+    magic: int
+    identifier: int
+    volume: float
+    price_open: float
+    sl: float
+    tp: float
+    price_current: float
+    swap: float
+    profit: float
+    symbol: str
+    comment: str
+
+
+class TradeDeal(NamedTuple):
+    ticket: int
+    order: int
+    time: int
+    time_msc: int
+    type: int
+    entry: int
+    magic: int
+    position_id: int
+    reason: int
+    volume: float
+    price: float
+    commission: float
+    swap: float
+    profit: float
+    symbol: str
+    comment: str
+
+
+class OrderCheckResult(NamedTuple):
+    retcode: int            # 0 = the request would be accepted
+    balance: float
+    equity: float
+    profit: float
+    margin: float
+    margin_free: float
+    margin_level: float
+    comment: str
+    request: Dict[str, Any]
+
+
+class OrderSendResult(NamedTuple):
+    retcode: int
+    deal: int
+    order: int
+    volume: float
+    price: float
+    bid: float
+    ask: float
+    comment: str
+    request_id: int
+    retcode_external: int
+    request: Dict[str, Any]
+
+
+class SimulatedMT5:
+    """
+    In-process stand-in for the MetaTrader5 module (the calls MT5Client makes)
+    - Quotes: synthetic random walk, a replayed tick file (symbol,time_msc,bid,ask)
+      or manual feed_tick() calls; spread per symbol in points
+    - order_send: latency, requotes beyond deviation, adverse slippage, volume /
+      stops / filling / margin checks with the real TRADE_RETCODE_* values;
+      order_check runs the same checks without trading
+    - Server-side SL/TP: every new quote closes positions whose SL/TP it crosses,
+      at the quote price (gaps fill worse, as on a live account)
+    - Account: balance, floating profit, margin at the configured leverage,
+      commission per lot; every fill is a deal in history_deals_get()
+    Thread-safe, but meant to be called from the MT5 executor thread like the real module.
+    """
+
+    # MetaTrader5 constants (same values as the real package)
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL = 0, 1
+    POSITION_TYPE_BUY, POSITION_TYPE_SELL = 0, 1
+    TRADE_ACTION_DEAL, TRADE_ACTION_SLTP = 1, 6
+    ORDER_FILLING_FOK, ORDER_FILLING_IOC, ORDER_FILLING_RETURN = 0, 1, 2
+    ORDER_TIME_GTC = 0
+    DEAL_TYPE_BUY, DEAL_TYPE_SELL = 0, 1
+    DEAL_ENTRY_IN, DEAL_ENTRY_OUT = 0, 1
+    DEAL_REASON_CLIENT, DEAL_REASON_EXPERT, DEAL_REASON_SL, DEAL_REASON_TP = 0, 3, 4, 5
+    TRADE_RETCODE_REQUOTE = 10004
+    TRADE_RETCODE_DONE = 10009
+    TRADE_RETCODE_INVALID = 10013
+    TRADE_RETCODE_INVALID_VOLUME = 10014
+    TRADE_RETCODE_INVALID_STOPS = 10016
+    TRADE_RETCODE_NO_MONEY = 10019
+    TRADE_RETCODE_PRICE_OFF = 10021
+    TRADE_RETCODE_INVALID_FILL = 10030
+    TRADE_RETCODE_CONNECTION = 10031
+    TRADE_RETCODE_POSITION_CLOSED = 10036
+    RES_S_OK = 1
+    RES_E_INTERNAL_FAIL_INIT = -10005
+    RES_E_NO_IPC = -10004
+
+    def __init__(self, config: Config, clock=time.time):
+        self.config = config
+        self.clock = clock
+
+        sim_config = config.get("broker_backend", {}).get("simulator", {})
+        self.tick_source = sim_config.get("tick_source", "synthetic")   # synthetic / replay / manual
+        self.tick_interval = sim_config.get("tick_interval_ms", 250) / 1000
+        self.replay_speed = sim_config.get("replay_speed", 1.0)
+        self.latency = sim_config.get("latency_ms", 50) / 1000
+        self.latency_jitter = sim_config.get("latency_jitter_ms", 20) / 1000
+        self.slippage_points = sim_config.get("slippage_points", 3)
+        self.requote_probability = sim_config.get("requote_probability", 0.0)
+        self.commission_per_lot = sim_config.get("commission_per_lot", 0.0)
+        self.leverage = sim_config.get("leverage", 100)
+        self.currency = sim_config.get("currency", "USD")
+        self.login_id = sim_config.get("login", 1000001)
+
+        self._random = random.Random(sim_config.get("seed"))
+        self._lock = threading.RLock()
+        self._specs = self._build_specs(sim_config)
+        self._quotes: Dict[str, List[float]] = {}        # symbol -> [bid, ask, time (s)]
+        self._replay: Dict[str, List[Tuple[int, float, float]]] = {}
+        self._replay_cursor: Dict[str, int] = {}
+        self._replay_started = (0.0, 0)                  # (wall time, first tick time_msc)
+        self._positions: Dict[int, Dict[str, Any]] = {}
+        self._deals: List[TradeDeal] = []
+        self._next_order = 500000
+        self._next_deal = 900000
+        self._last_error = (self.RES_S_OK, "Success")
+
+        self.balance = float(sim_config.get("balance", 10000.0))
+        self.connected = True
+        self.initialized = False
+        self.orders_sent = 0
+        self.requotes = 0
+        self.stopouts = {"sl": 0, "tp": 0}
+
+        now = self.clock()
+        for symbol, spec in self._specs.items():
+            self._set_quote(symbol, spec["price"], now, check_stops=False)
+        if self.tick_source == "replay":
+            self.load_ticks(sim_config.get("tick_file", ""))
+
+    # ------------------------------------------------------------------ setup
+
+    def _build_specs(self, sim_config: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Broker symbol -> contract spec, from symbol_config (+ symbol_mapping) and simulator overrides"""
+        symbol_mapping = self.config.get("symbol_mapping", {})
+        overrides = sim_config.get("symbols", {})
+        default_spread = sim_config.get("spread_points", 15)
+        default_volatility = sim_config.get("volatility_points", 2.0)
+
+        specs = {}
+        for symbol, symbol_config in self.config.get("symbol_config", {}).items():
+            broker_symbol = symbol_mapping.get(symbol, symbol)
+            is_gold = symbol_config.get("is_gold", False) or broker_symbol in GOLD_SYMBOLS
+            pip_size = symbol_config.get("pip_size") or (0.01 if is_gold or "JPY" in broker_symbol else 0.0001)
+            point = pip_size if is_gold else pip_size / 10
+            spec = {
+                "point": point,
+                "digits": max(0, round(-math.log10(point))),
+                "contract_size": 100.0 if is_gold else 100000.0,
+                "base": "XAU" if is_gold else broker_symbol[:3],
+                "quote": "USD" if is_gold else broker_symbol[3:6],
+                "price": START_PRICES.get(broker_symbol, START_PRICES.get(symbol, 1.0)),
+                "spread_points": default_spread * (3 if is_gold else 1),
+                "volatility_points": default_volatility * (10 if is_gold else 1),
+                "stops_level": 0,
+                "volume_min": 0.01,
+                "volume_max": 100.0,
+                "volume_step": 0.01,
+                "filling_mode": 3        # SYMBOL_FILLING_FOK | SYMBOL_FILLING_IOC
+            }
+            spec.update(overrides.get(broker_symbol, overrides.get(symbol, {})))
+            specs[broker_symbol] = spec
+        return specs
+
+    def load_ticks(self, path: str) -> int:
+        """Replay ticks from a CSV with symbol,time_msc,bid,ask columns - returns ticks loaded"""
+        if not path:
+            return 0
+        ticks: Dict[str, List[Tuple[int, float, float]]] = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                ticks.setdefault(row["symbol"], []).append(
+                    (int(row["time_msc"]), float(row["bid"]), float(row["ask"])))
+        with self._lock:
+            for rows in ticks.values():
+                rows.sort()
+            self._replay = ticks
+            self._replay_cursor = {symbol: -1 for symbol in ticks}
+            first = min((rows[0][0] for rows in ticks.values() if rows), default=0)
+            self._replay_started = (self.clock(), first)
+        return sum(len(rows) for rows in ticks.values())
+
+    # ----------------------------------------------------------------- quotes
+
+    def feed_tick(self, symbol: str, bid: float, ask: float, time_msc: Optional[int] = None):
+        """Push one quote (replay drivers / tests); triggers server-side SL/TP"""
+        with self._lock:
+            self._set_quote(symbol, None, (time_msc / 1000) if time_msc else self.clock(), bid, ask)
+
+    def _set_quote(self, symbol: str, mid: Optional[float], at: float,
+                   bid: Optional[float] = None, ask: Optional[float] = None, check_stops: bool = True):
+        spec = self._specs.get(symbol)
+        if spec is None:
+            return
+        if bid is None:
+            half_spread = spec["spread_points"] * spec["point"] / 2
+            bid, ask = mid - half_spread, mid + half_spread
+        self._quotes[symbol] = [round(bid, spec["digits"]), round(ask, spec["digits"]), at]
+        if check_stops:
+            self._check_stops(symbol)
+
+    def _advance(self, symbol: str):
+        """Bring the symbol's quote up to the clock (synthetic walk or replay cursor)"""
+        quote = self._quotes.get(symbol)
+        if quote is None or self.tick_source == "manual":
+            return
+        now = self.clock()
+        if symbol in self._replay:
+            started_wall, first_msc = self._replay_started
+            target_msc = first_msc + (now - started_wall) * 1000 * self.replay_speed
+            rows, cursor = self._replay[symbol], self._replay_cursor[symbol]
+            moved = cursor
+            while moved + 1 < len(rows) and rows[moved + 1][0] <= target_msc:
+                moved += 1
+            if moved != cursor:
+                self._replay_cursor[symbol] = moved
+                time_msc, bid, ask = rows[moved]
+                self._set_quote(symbol, None, time_msc / 1000, bid, ask)
+            return
+        steps = int((now - quote[2]) / self.tick_interval) if self.tick_interval > 0 else 0
+        if steps <= 0:
+            return
+        spec = self._specs[symbol]
+        mid = (quote[0] + quote[1]) / 2
+        sigma = spec["volatility_points"] * spec["point"] * math.sqrt(min(steps, 10000))
+        mid = max(mid + self._random.gauss(0, sigma), spec["point"] * 10)
+        self._set_quote(symbol, mid, quote[2] + steps * self.tick_interval)
+
+    def _advance_open(self):
+        for symbol in {position["symbol"] for position in self._positions.values()}:
+            self._advance(symbol)
+
+    # -------------------------------------------------------------- accounting
+
+    def _conversion(self, spec: Dict[str, Any]) -> float:
+        """Account currency per unit of the symbol's quote currency"""
+        if spec["quote"] == self.currency:
+            return 1.0
+        direct = self._quotes.get(self.currency + spec["quote"])
+        if direct:
+            return 2 / (direct[0] + direct[1])
+        inverse = self._quotes.get(spec["quote"] + self.currency)
+        if inverse:
+            return (inverse[0] + inverse[1]) / 2
+        return 1.0
+
+    def _profit(self, position: Dict[str, Any], price: float, volume: Optional[float] = None) -> float:
+        spec = self._specs[position["symbol"]]
+        sign = 1 if position["type"] == self.POSITION_TYPE_BUY else -1
+        volume = position["volume"] if volume is None else volume
+        return round(sign * (price - position["price_open"]) * volume * spec["contract_size"]
+                     * self._conversion(spec), 2)
+
+    def _margin(self, symbol: str, volume: float, price: float) -> float:
+        spec = self._specs[symbol]
+        return volume * spec["contract_size"] * price * self._conversion(spec) / self.leverage
+
+    def _close_price(self, position: Dict[str, Any]) -> float:
+        bid, ask, _ = self._quotes[position["symbol"]]
+        return bid if position["type"] == self.POSITION_TYPE_BUY else ask
+
+    def _totals(self) -> Tuple[float, float]:
+        profit = sum(self._profit(p, self._close_price(p)) for p in self._positions.values())
+        margin = sum(self._margin(p["symbol"], p["volume"], p["price_open"]) for p in self._positions.values())
+        return profit, margin
+
+    def _record_deal(self, order: int, position: Dict[str, Any], deal_type: int, entry: int,
+                     reason: int, volume: float, price: float, profit: float, comment: str) -> int:
+        now = self.clock()
+        commission = -round(self.commission_per_lot * volume, 2)
+        self.balance += profit + commission
+        self._next_deal += 1
+        self._deals.append(TradeDeal(self._next_deal, order, int(now), int(now * 1000), deal_type, entry,
+                                     position["magic"], position["ticket"], reason, volume, price,
+                                     commission, 0.0, profit, position["symbol"], comment))
+        return self._next_deal
+
+    def _close(self, position: Dict[str, Any], volume: float, price: float, reason: int,
+               comment: str, order: int = 0) -> int:
+        """Close volume lots of a position at price - returns the deal ticket"""
+        deal_type = self.DEAL_TYPE_SELL if position["type"] == self.POSITION_TYPE_BUY else self.DEAL_TYPE_BUY
+        profit = self._profit(position, price, volume)
+        deal = self._record_deal(order or position["ticket"], position, deal_type, self.DEAL_ENTRY_OUT,
+                                 reason, volume, price, profit, comment)
+        remaining = round(position["volume"] - volume, 8)
+        if remaining <= 0:
+            del self._positions[position["ticket"]]
+        else:
+            position["volume"] = remaining
+        return deal
+
+    def _check_stops(self, symbol: str):
+        """Server-side SL/TP on the current quote"""
+        bid, ask, _ = self._quotes[symbol]
+        for position in [p for p in self._positions.values() if p["symbol"] == symbol]:
+            sl, tp = position["sl"], position["tp"]
+            if position["type"] == self.POSITION_TYPE_BUY:
+                hit_sl, hit_tp, price = sl and bid <= sl, tp and bid >= tp, bid
+            else:
+                hit_sl, hit_tp, price = sl and ask >= sl, tp and ask <= tp, ask
+            if hit_sl or hit_tp:
+                kind = "sl" if hit_sl else "tp"
+                self.stopouts[kind] += 1
+                self._close(position, position["volume"], price,
+                            self.DEAL_REASON_SL if hit_sl else self.DEAL_REASON_TP,
+                            f"[{kind} {sl if hit_sl else tp}]")
+
+    # ------------------------------------------------------------- terminal API
+
+    def _available(self) -> bool:
+        if not self.connected:
+            self._last_error = (self.RES_E_NO_IPC, "No IPC connection")
+            return False
+        if not self.initialized:
+            self._last_error = (self.RES_E_INTERNAL_FAIL_INIT, "Terminal not initialized")
+            return False
+        self._last_error = (self.RES_S_OK, "Success")
+        return True
+
+    def initialize(self, *args, **kwargs) -> bool:
+        with self._lock:
+            self.initialized = self.connected
+            self._available()
+            return self.initialized
+
+    def login(self, login=None, password=None, server=None, **kwargs) -> bool:
+        with self._lock:
+            return self._available()
+
+    def shutdown(self):
+        with self._lock:
+            self.initialized = False
+
+    def last_error(self) -> Tuple[int, str]:
+        return self._last_error
+
+    def set_connected(self, connected: bool):
+        """Simulate losing / regaining the terminal connection"""
+        with self._lock:
+            self.connected = connected
+            if not connected:
+                self.initialized = False
+
+    def terminal_info(self) -> Optional[TerminalInfo]:
+        with self._lock:
+            if not self._available():
+                return None
+            return TerminalInfo(True, True, int(self.latency * 1e6), "SimulatedMT5", "Simulator")
+
+    def account_info(self) -> Optional[AccountInfo]:
+        with self._lock:
+            if not self._available():
+                return None
+            self._advance_open()
+            profit, margin = self._totals()
+            equity = self.balance + profit
+            return AccountInfo(self.login_id, self.leverage, round(self.balance, 2), 0.0, round(profit, 2),
+                               round(equity, 2), round(margin, 2), round(equity - margin, 2),
+                               round(equity / margin * 100, 2) if margin else 0.0,
+                               self.currency, "Simulator-Demo", "Simulator")
+
+    def symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
+        with self._lock:
+            if not self._available() or symbol not in self._specs:
+                return None
+            self._advance(symbol)
+            spec = self._specs[symbol]
+            bid, ask, _ = self._quotes[symbol]
+            tick_value = spec["contract_size"] * spec["point"] * self._conversion(spec)
+            return SymbolInfo(symbol, True, spec["digits"], spec["point"], int(spec["spread_points"]),
+                              spec["stops_level"], spec["contract_size"], tick_value, spec["point"],
+                              spec["volume_min"], spec["volume_max"], spec["volume_step"],
+                              spec["filling_mode"], bid, ask)
+
+    def symbol_select(self, symbol: str, enable: bool = True) -> bool:
+        with self._lock:
+            return self._available() and symbol in self._specs
+
+    def symbol_info_tick(self, symbol: str) -> Optional[Tick]:
+        with self._lock:
+            if not self._available() or symbol not in self._specs:
+                return None
+            self._advance(symbol)
+            bid, ask, at = self._quotes[symbol]
+            return Tick(int(at), bid, ask, 0.0, 0, int(at * 1000), 6, 0.0)
+
+    def positions_get(self, symbol: Optional[str] = None, group: Optional[str] = None,
+                      ticket: Optional[int] = None) -> Optional[Tuple[TradePosition, ...]]:
+        with self._lock:
+            if not self._available():
+                return None
+            self._advance_open()
+            positions = []
+            for position in self._positions.values():
+                if (symbol and position["symbol"] != symbol) or (ticket and position["ticket"] != ticket):
+                    continue
+                price = self._close_price(position)
+                positions.append(TradePosition(
+                    position["ticket"], int(position["time"]), int(position["time"] * 1000), position["type"],
+                    position["magic"], position["ticket"], position["volume"], position["price_open"],
+                    position["sl"], position["tp"], price, 0.0, self._profit(position, price),
+                    position["symbol"], position["comment"]))
+            return tuple(positions)
+
+    def history_deals_get(self, date_from=None, date_to=None, group: Optional[str] = None,
+                          ticket: Optional[int] = None, position: Optional[int] = None) -> Optional[Tuple[TradeDeal, ...]]:
+        with self._lock:
+            if not self._available():
+                return None
+            start = date_from.timestamp() if isinstance(date_from, datetime) else (date_from or 0)
+            end = date_to.timestamp() if isinstance(date_to, datetime) else (date_to or float("inf"))
+            return tuple(deal for deal in self._deals
+                         if start <= deal.time <= end
+                         and (ticket is None or deal.order == ticket)
+                         and (position is None or deal.position_id == position))
+
+    def order_send(self, request: Dict[str, Any]) -> Optional[OrderSendResult]:
+        if not self.connected:
+            self._last_error = (self.RES_E_NO_IPC, "No IPC connection")
+            return None
+        # Round trip to the trade server - the market keeps moving meanwhile
+        delay = self.latency + self._random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            if not self._available():
+                return None
+            self.orders_sent += 1
+            if request.get("action") == self.TRADE_ACTION_SLTP:
+                return self._modify(request)
+            if request.get("action") != self.TRADE_ACTION_DEAL:
+                return self._result(request, self.TRADE_RETCODE_INVALID, "Unsupported action")
+            symbol = request.get("symbol")
+            if symbol not in self._specs:
+                return self._result(request, self.TRADE_RETCODE_INVALID, "Unknown symbol")
+            self._advance(symbol)
+            if "position" in request:
+                return self._close_request(request)
+            return self._open_request(request)
+
+    def order_check(self, request: Dict[str, Any]) -> Optional[OrderCheckResult]:
+        """Validate a deal request against the current quote and account - nothing is traded"""
+        with self._lock:
+            if not self._available():
+                return None
+            symbol = request.get("symbol")
+            if request.get("action") != self.TRADE_ACTION_DEAL or symbol not in self._specs:
+                result = self._result(request, self.TRADE_RETCODE_INVALID, "Invalid request")
+            else:
+                self._advance(symbol)
+                if "position" in request:
+                    result = self._close_request(request, check_only=True)
+                else:
+                    result = self._open_request(request, check_only=True)
+            profit, margin = self._totals()
+            equity = self.balance + profit
+            retcode = 0 if result.retcode == self.TRADE_RETCODE_DONE else result.retcode
+            return OrderCheckResult(retcode, round(self.balance, 2), round(equity, 2), round(profit, 2),
+                                    round(margin, 2), round(equity - margin, 2),
+                                    round(equity / margin * 100, 2) if margin else 0.0,
+                                    result.comment, dict(request))
+
+    def _result(self, request: Dict[str, Any], retcode: int, comment: str, deal: int = 0, order: int = 0,
+                volume: float = 0.0, price: float = 0.0) -> OrderSendResult:
+        bid, ask, _ = self._quotes.get(request.get("symbol"), (0.0, 0.0, 0))
+        return OrderSendResult(retcode, deal, order, volume, price, bid, ask, comment,
+                               self.orders_sent, 0, dict(request))
+
+    def _fill_price(self, request: Dict[str, Any], is_buy: bool,
+                    check_only: bool = False) -> Tuple[Optional[float], Optional[OrderSendResult]]:
+        """Market price with adverse slippage - or a requote / fill-mode / volume reject"""
+        spec = self._specs[request["symbol"]]
+        bid, ask, _ = self._quotes[request["symbol"]]
+        market = ask if is_buy else bid
+
+        filling = request.get("type_filling", self.ORDER_FILLING_FOK)
+        if filling == self.ORDER_FILLING_RETURN or not spec["filling_mode"] & (1 << filling):
+            return None, self._result(request, self.TRADE_RETCODE_INVALID_FILL, "Unsupported filling mode")
+
+        volume = request.get("volume", 0)
+        steps = volume / spec["volume_step"]
+        if volume < spec["volume_min"] or volume > spec["volume_max"] or abs(steps - round(steps)) > 1e-6:
+            return None, self._result(request, self.TRADE_RETCODE_INVALID_VOLUME, "Invalid volume")
+
+        if check_only:
+            return market, None
+
+        requested = request.get("price") or market
+        deviation = request.get("deviation", 0) * spec["point"]
+        if abs(requested - market) > deviation + spec["point"] / 2 or self._random.random() < self.requote_probability:
+            self.requotes += 1
+            return None, self._result(request, self.TRADE_RETCODE_REQUOTE, "Requote")
+
+        slippage = self._random.uniform(0, self.slippage_points) * spec["point"]
+        return round(market + slippage if is_buy else market - slippage, spec["digits"]), None
+
+    def _open_request(self, request: Dict[str, Any], check_only: bool = False) -> OrderSendResult:
+        symbol = request["symbol"]
+        spec = self._specs[symbol]
+        is_buy = request.get("type") == self.ORDER_TYPE_BUY
+        bid, ask, _ = self._quotes[symbol]
+
+        # Stops are checked against the side they will trigger on
+        sl, tp = request.get("sl") or 0.0, request.get("tp") or 0.0
+        level = spec["stops_level"] * spec["point"]
+        if is_buy:
+            bad_stops = (sl and sl > bid - level) or (tp and tp < bid + level)
+        else:
+            bad_stops = (sl and sl < ask + level) or (tp and tp > ask - level)
+        if bad_stops:
+            return self._result(request, self.TRADE_RETCODE_INVALID_STOPS, "Invalid stops")
+
+        price, reject = self._fill_price(request, is_buy, check_only)
+        if reject:
+            return reject
+        volume = request["volume"]
+        profit, margin = self._totals()
+        if self.balance + profit - margin < self._margin(symbol, volume, price):
+            return self._result(request, self.TRADE_RETCODE_NO_MONEY, "No money")
+        if check_only:
+            return self._result(request, self.TRADE_RETCODE_DONE, "Done")
+
+        self._next_order += 1
+        ticket = self._next_order
+        position = {"ticket": ticket, "symbol": symbol, "type": self.POSITION_TYPE_BUY if is_buy else self.POSITION_TYPE_SELL,
+                    "volume": volume, "price_open": price, "sl": sl, "tp": tp, "time": self.clock(),
+                    "magic": request.get("magic", 0), "comment": request.get("comment", "")}
+        self._positions[ticket] = position
+        deal = self._record_deal(ticket, position, self.DEAL_TYPE_BUY if is_buy else self.DEAL_TYPE_SELL,
+                                 self.DEAL_ENTRY_IN, self.DEAL_REASON_EXPERT, volume, price, 0.0,
+                                 request.get("comment", ""))
+        return self._result(request, self.TRADE_RETCODE_DONE, "Request executed", deal, ticket, volume, price)
+
+    def _close_request(self, request: Dict[str, Any], check_only: bool = False) -> OrderSendResult:
+        position = self._positions.get(request["position"])
+        if position is None:
+            return self._result(request, self.TRADE_RETCODE_POSITION_CLOSED, "Position doesn't exist")
+        closing_buy = position["type"] == self.POSITION_TYPE_BUY
+        if request.get("type") != (self.ORDER_TYPE_SELL if closing_buy else self.ORDER_TYPE_BUY) \
+                or request.get("volume", 0) > position["volume"] + 1e-9:
+            return self._result(request, self.TRADE_RETCODE_INVALID, "Invalid close request")
+
+        price, reject = self._fill_price(request, not closing_buy, check_only)
+        if reject or check_only:
+            return reject or self._result(request, self.TRADE_RETCODE_DONE, "Done")
+        self._next_order += 1
+        volume = request["volume"]
+        deal = self._close(position, volume, price, self.DEAL_REASON_EXPERT,
+                           request.get("comment", ""), self._next_order)
+        return self._result(request, self.TRADE_RETCODE_DONE, "Request executed", deal,
+                            self._next_order, volume, price)
+
+    def _modify(self, request: Dict[str, Any]) -> OrderSendResult:
+        position = self._positions.get(request.get("position"))
+        if position is None:
+            return self._result(request, self.TRADE_RETCODE_POSITION_CLOSED, "Position doesn't exist")
+        position["sl"] = request.get("sl", position["sl"]) or 0.0
+        position["tp"] = request.get("tp", position["tp"]) or 0.0
+        self._check_stops(position["symbol"])
+        return self._result(request, self.TRADE_RETCODE_DONE, "Request executed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            profit, margin = self._totals()
+            return {
+                "tick_source": self.tick_source,
+                "connected": self.connected,
+                "balance": round(self.balance, 2),
+                "equity": round(self.balance + profit, 2),
+                "margin": round(margin, 2),
+                "open_positions": len(self._positions),
+                "deals": len(self._deals),
+                "orders_sent": self.orders_sent,
+                "requotes": self.requotes,
+                "stopouts": dict(self.stopouts)
+            }
@@ -0,0 +1,183 @@
+import asyncio
+import time
+from typing import Dict, Any, Callable, List, Optional
+from config import Config
+from mt5_executor import MT5CallTimeout
+
+
+class MT5Watchdog:
+    """
+    Terminal connection watchdog (background task on the event loop)
+    - Heartbeat: MT5Client.heartbeat (terminal_info) on the MT5 thread every
+      heartbeat_interval_seconds; missed_heartbeats failures in a row -> disconnected
+    - Hung terminal: a heartbeat that times out on the MT5 thread may only be
+      queued behind a long call, so it takes missed_heartbeat_timeouts in a row
+    - Reconnect: one connect_once() per attempt, so the MT5 thread never sleeps;
+      exponential backoff from reconnect_initial_seconds up to reconnect_max_seconds
+    - While disconnected, order calls through AsyncMT5Client either fail fast or
+      wait for the reconnect (on_disconnect: fail_fast / queue, queue_timeout_seconds)
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        watchdog_config = config.get("mt5_watchdog", {})
+        self.enabled = watchdog_config.get("enabled", True)
+        self.heartbeat_interval = watchdog_config.get("heartbeat_interval_seconds", 2)
+        self.missed_heartbeats = watchdog_config.get("missed_heartbeats", 2)
+        self.missed_heartbeat_timeouts = watchdog_config.get("missed_heartbeat_timeouts", 3)
+        self.reconnect_initial = watchdog_config.get("reconnect_initial_seconds", 1)
+        self.reconnect_max = watchdog_config.get("reconnect_max_seconds", 60)
+        self.on_disconnect = watchdog_config.get("on_disconnect", "fail_fast")
+        self.queue_timeout = watchdog_config.get("queue_timeout_seconds", 30)
+
+        self.state = "connected"             # connected / disconnected
+        self.state_since = time.time()
+        self._connected = asyncio.Event()
+        self._connected.set()
+        self._task = None
+        self._listeners: List[Callable[[str], None]] = []
+
+        self.heartbeats = 0
+        self.heartbeat_failures = 0
+        self.heartbeat_timeouts = 0
+        self.last_heartbeat_ms: Optional[float] = None
+        self.disconnects = 0
+        self.reconnect_attempts = 0
+        self.next_retry_seconds: Optional[float] = None
+        self.orders_rejected = 0
+        self.orders_queued = 0
+        self.queue_timeouts = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def connected(self) -> bool:
+        return self.state == "connected"
+
+    def add_listener(self, callback: Callable[[str], None]):
+        """callback(state) on every connected <-> disconnected change"""
+        self._listeners.append(callback)
+
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        self.state = state
+        self.state_since = time.time()
+        if state == "connected":
+            self._connected.set()
+            print("✅ MT5 watchdog: connection restored")
+        else:
+            self._connected.clear()
+            self.disconnects += 1
+            print("⚠️ MT5 watchdog: terminal disconnected - reconnecting in the background")
+        for callback in self._listeners:
+            try:
+                callback(state)
+            except Exception as e:
+                print(f"⚠️ Watchdog listener error: {str(e)}")
+
+    async def start(self, mt5):
+        """Watch the terminal behind the AsyncMT5Client facade (no-op without a terminal)"""
+        if self.enabled and self._task is None and mt5.client.mt5 is not None:
+            self._set_state("connected" if mt5.client.initialized else "disconnected")
+            self._task = asyncio.create_task(self._watch_loop(mt5))
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _watch_loop(self, mt5):
+        missed = 0
+        timeouts = 0
+        backoff = self.reconnect_initial
+        while self._task is not None:  # also ends the loop if a cancel lands as a call completes
+            if self.connected:
+                await asyncio.sleep(self.heartbeat_interval)
+                started = time.perf_counter()
+                try:
+                    alive = await mt5.run(mt5.client.heartbeat)
+                except MT5CallTimeout:
+                    self.heartbeat_timeouts += 1
+                    timeouts += 1
+                    if timeouts >= self.missed_heartbeat_timeouts:
+                        print(f"⚠️ MT5 heartbeat timed out {timeouts} times in a row - terminal hung")
+                        missed = timeouts = 0
+                        backoff = self.reconnect_initial
+                        mt5.client.initialized = False
+                        self._set_state("disconnected")
+                    continue
+                except Exception as e:
+                    print(f"⚠️ MT5 heartbeat error: {str(e)}")
+                    alive = False
+                timeouts = 0
+                self.heartbeats += 1
+                self.last_heartbeat_ms = round((time.perf_counter() - started) * 1000, 2)
+                if alive:
+                    missed = 0
+                    continue
+                self.heartbeat_failures += 1
+                missed += 1
+                if missed >= self.missed_heartbeats:
+                    missed = 0
+                    backoff = self.reconnect_initial
+                    self._set_state("disconnected")
+            else:
+                self.reconnect_attempts += 1
+                try:
+                    reconnected = await mt5.run(mt5.client.connect_once,
+                                                timeout=mt5.executor.timeout_for("call"))
+                except Exception as e:
+                    print(f"⚠️ MT5 reconnect error: {str(e)}")
+                    reconnected = False
+                if reconnected:
+                    self.next_retry_seconds = None
+                    self._set_state("connected")
+                    continue
+                self.next_retry_seconds = backoff
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.reconnect_max)
+
+    async def allow_order(self, name: str) -> bool:
+        """Gate for order calls: True to send now, False to fail (on_disconnect policy)"""
+        if not self.running or self.connected:
+            return True
+        if self.on_disconnect == "queue":
+            self.orders_queued += 1
+            print(f"⏳ {name} waiting for MT5 reconnect (up to {self.queue_timeout}s)")
+            try:
+                await asyncio.wait_for(self._connected.wait(), self.queue_timeout)
+                return True
+            except asyncio.TimeoutError:
+                self.queue_timeouts += 1
+                print(f"❌ {name} dropped - MT5 still disconnected after {self.queue_timeout}s")
+                return False
+        self.orders_rejected += 1
+        print(f"❌ {name} rejected - MT5 disconnected")
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "state": self.state,
+            "state_seconds": round(time.time() - self.state_since, 1),
+            "on_disconnect": self.on_disconnect,
+            "heartbeats": self.heartbeats,
+            "heartbeat_failures": self.heartbeat_failures,
+            "heartbeat_timeouts": self.heartbeat_timeouts,
+            "last_heartbeat_ms": self.last_heartbeat_ms,
+            "disconnects": self.disconnects,
+            "reconnect_attempts": self.reconnect_attempts,
+            "next_retry_seconds": self.next_retry_seconds,
+            "orders_rejected": self.orders_rejected,
+            "orders_queued": self.orders_queued,
+            "queue_timeouts": self.queue_timeouts
+        }
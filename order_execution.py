@@ -0,0 +1,116 @@
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+from config import Config
+from metrics import percentiles
+
+# TRADE_RETCODE_* names for the reject histograms
+RETCODE_NAMES = {
+    10004: "REQUOTE", 10006: "REJECT", 10007: "CANCEL", 10010: "DONE_PARTIAL",
+    10011: "ERROR", 10012: "TIMEOUT", 10013: "INVALID", 10014: "INVALID_VOLUME",
+    10015: "INVALID_PRICE", 10016: "INVALID_STOPS", 10017: "TRADE_DISABLED",
+    10018: "MARKET_CLOSED", 10019: "NO_MONEY", 10020: "PRICE_CHANGED", 10021: "PRICE_OFF",
+    10024: "TOO_MANY_REQUESTS", 10027: "CLIENT_DISABLES_AT", 10030: "INVALID_FILL",
+    10031: "CONNECTION", 10036: "POSITION_CLOSED"
+}
+
+# Price moved between the tick and the server - safe to resend at a fresh price
+RETRYABLE_RETCODES = frozenset({10004, 10020, 10021})
+
+
+class OrderExecution:
+    """
+    Market order policy and fill statistics (used by MT5Client on the MT5 thread)
+    - Deviation per symbol: symbol_deviation_points override, else deviation_points
+    - Retry: requote / price-changed / price-off rejects are resent with a fresh
+      tick, up to max_retries and while within retry_budget_ms of the first send
+    - Optional order_check before the first send (margin / stops validated by
+      the terminal without placing anything)
+    - Per symbol: request-to-fill latency, slippage in pips against the first
+      quote (positive = adverse), retries and a reject-code histogram
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        execution_config = config.get("order_execution", {})
+        self.order_check = execution_config.get("order_check", False)
+        self.max_retries = execution_config.get("max_retries", 3)
+        self.retry_budget = execution_config.get("retry_budget_ms", 1000) / 1000
+        self.retry_delay = execution_config.get("retry_delay_ms", 25) / 1000
+        self.latency_samples = execution_config.get("latency_samples", 500)
+
+        self._symbols: Dict[str, Dict[str, Any]] = {}
+
+    def deviation_for(self, symbol: str) -> int:
+        execution_config = self.config.get("order_execution", {})
+        overrides = execution_config.get("symbol_deviation_points", {})
+        return int(overrides.get(symbol, execution_config.get("deviation_points", 20)))
+
+    def set_deviation(self, symbol: str, points: int):
+        """Per-symbol deviation override, saved to config.json"""
+        if points < 0:
+            raise ValueError("Deviation must be >= 0 points")
+        execution_config = self.config.config.setdefault("order_execution", {})
+        execution_config.setdefault("symbol_deviation_points", {})[symbol] = int(points)
+        self.config.save_config()
+
+    def should_retry(self, retcode: int, attempts: int, started: float) -> bool:
+        """attempts so far (1 = first send); started is time.perf_counter() of the first send"""
+        return (retcode in RETRYABLE_RETCODES
+                and attempts <= self.max_retries
+                and time.perf_counter() - started + self.retry_delay < self.retry_budget)
+
+    def pip_size(self, symbol: str, point: float) -> float:
+        return self.config.get("symbol_config", {}).get(symbol, {}).get("pip_size") or point * 10
+
+    def _symbol(self, symbol: str) -> Dict[str, Any]:
+        stats = self._symbols.get(symbol)
+        if stats is None:
+            stats = {"fills": 0, "failed": 0, "retries": 0, "rejects": {},
+                     "latency_ms": deque(maxlen=self.latency_samples),
+                     "slippage_pips": deque(maxlen=self.latency_samples)}
+            self._symbols[symbol] = stats
+        return stats
+
+    def record_reject(self, symbol: str, retcode: Optional[int]):
+        """Every non-DONE answer, including the ones that get retried"""
+        rejects = self._symbol(symbol)["rejects"]
+        name = RETCODE_NAMES.get(retcode, str(retcode)) if retcode is not None else "NO_RESULT"
+        rejects[name] = rejects.get(name, 0) + 1
+
+    def record_fill(self, symbol: str, latency_ms: float, slippage_pips: float, attempts: int):
+        stats = self._symbol(symbol)
+        stats["fills"] += 1
+        stats["retries"] += attempts - 1
+        stats["latency_ms"].append(latency_ms)
+        stats["slippage_pips"].append(slippage_pips)
+
+    def record_failure(self, symbol: str, attempts: int):
+        stats = self._symbol(symbol)
+        stats["failed"] += 1
+        stats["retries"] += max(attempts - 1, 0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        symbols = {}
+        for symbol, stats in list(self._symbols.items()):
+            slippage = list(stats["slippage_pips"])
+            orders = stats["fills"] + stats["failed"]
+            symbols[symbol] = {
+                "orders": orders,
+                "fills": stats["fills"],
+                "failed": stats["failed"],
+                "fill_rate": round(stats["fills"] / orders, 3) if orders else None,
+                "retries": stats["retries"],
+                "latency_ms": percentiles(stats["latency_ms"]),
+                "slippage_pips": dict(percentiles(slippage),
+                                      avg=round(sum(slippage) / len(slippage), 3) if slippage else None),
+                "rejects": dict(stats["rejects"]),
+                "deviation_points": self.deviation_for(symbol)
+            }
+        return {
+            "order_check": self.order_check,
+            "max_retries": self.max_retries,
+            "retry_budget_ms": int(self.retry_budget * 1000),
+            "symbols": symbols
+        }
@@ -0,0 +1,158 @@
+import asyncio
+from typing import Dict, Any, List, Optional, Set, Tuple
+from models import Alert, Trade
+from config import Config
+
+class NettingLeg:
+    """One strategy's share of a netted order"""
+
+    def __init__(self, alert: Alert, trade: Trade, strategy: str, decision: Dict[str, Any]):
+        self.alert = alert
+        self.trade = trade
+        self.strategy = strategy
+        self.decision = decision  # audit decision, completed once the order is placed
+
+
+class NettingGroup:
+    """Entry alerts held for one (symbol, signal) window, with their result futures"""
+
+    def __init__(self):
+        self.entries: List[Tuple[Alert, asyncio.Future]] = []
+        self.close_now = asyncio.Event()  # set to process the group before the window ends
+        self.task: Optional[asyncio.Task] = None
+
+
+class OrderNetter:
+    """
+    Net same-direction entries for one symbol into one market order
+    1. Entry alerts for the same (symbol, signal) arriving within window_ms
+       are held and processed together in one symbol-lock hold
+    2. Any other alert for the symbol (exit, reversal, trend, opposite-signal
+       entry) closes the held group first, so per-symbol order is kept
+    3. Every alert still runs the full gate (logic flags, risk, alignment,
+       re-entry check); fresh orders become legs instead of broker calls
+    4. One MT5 order for the summed volume; each leg is booked as its own
+       Trade (own SL/TP, chain, SL hunt monitoring) under the shared ticket
+    The broker-side SL/TP of the netted position is the widest of the legs;
+    each leg's own levels are enforced by the engine and closed by volume.
+    Disabled by default.
+    """
+
+    def __init__(self, config: Config, trading_engine):
+        self.config = config
+        self.trading_engine = trading_engine
+
+        netting_config = config.get("order_netting", {})
+        self.enabled = netting_config.get("enabled", False)
+        self.window_seconds = netting_config.get("window_ms", 50) / 1000
+
+        # (symbol, signal) -> alerts waiting for the window to close
+        self.pending: Dict[Tuple[str, str], NettingGroup] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+        self.alerts_received = 0
+        self.groups = 0
+        self.orders_sent = 0
+        self.legs_netted = 0
+        self.orders_saved = 0
+        self.early_flushes = 0
+
+    def eligible(self, alert: Alert) -> bool:
+        return self.enabled and alert.type == 'entry'
+
+    async def submit(self, alert: Alert) -> bool:
+        """
+        Hold an entry alert until its (symbol, signal) window closes; returns its process result
+        The alert joins its group before the first suspension point, so a caller
+        that yields once after starting submit() has it registered in order
+        """
+        key = (alert.symbol, alert.signal)
+        future = asyncio.get_running_loop().create_future()
+        group = self.pending.get(key)
+        if group is None:
+            # An opposite-signal group for the symbol arrived first - it goes first
+            self._close_symbol(alert.symbol)
+            group = self.pending[key] = NettingGroup()
+            group.task = asyncio.create_task(self._flush_after_window(key, group))
+            self._flush_tasks.add(group.task)
+            group.task.add_done_callback(self._flush_tasks.discard)
+        group.entries.append((alert, future))
+        self.alerts_received += 1
+        return await future
+
+    async def flush(self, symbol: str):
+        """Process the symbol's held groups now; returns once they are done (before the caller takes the symbol lock)"""
+        tasks = self._close_symbol(symbol)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _close_symbol(self, symbol: str) -> List[asyncio.Task]:
+        tasks = []
+        for (group_symbol, _), group in self.pending.items():
+            if group_symbol == symbol:
+                if not group.close_now.is_set():
+                    self.early_flushes += 1
+                    group.close_now.set()
+                tasks.append(group.task)
+        return tasks
+
+    async def _flush_after_window(self, key: Tuple[str, str], group: NettingGroup):
+        try:
+            await asyncio.wait_for(group.close_now.wait(), self.window_seconds)
+        except asyncio.TimeoutError:
+            pass
+        # Closed: later entries for the key start a new group
+        del self.pending[key]
+        self.groups += 1
+        try:
+            results = await self.trading_engine.process_netted([alert for alert, _ in group.entries])
+        except Exception as e:
+            print(f"❌ Order netting error: {str(e)}")
+            results = [False] * len(group.entries)
+        for (_, future), result in zip(group.entries, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def place(self, legs: List[NettingLeg]) -> Optional[int]:
+        """Send one market order for all legs - returns the MT5 ticket (None on failure)"""
+        first = legs[0]
+        if len(legs) == 1:
+            sl, tp = first.trade.sl, first.trade.tp
+            comment = f"{first.strategy}_FRESH"
+        else:
+            # Widest levels, so the broker never closes the position before a leg's own SL/TP
+            sl_levels = [leg.trade.sl for leg in legs]
+            tp_levels = [leg.trade.tp for leg in legs]
+            if first.trade.direction == "buy":
+                sl, tp = min(sl_levels), max(tp_levels)
+            else:
+                sl, tp = max(sl_levels), min(tp_levels)
+            comment = "NET_" + "+".join(leg.strategy for leg in legs)
+
+        ticket = await self.trading_engine.mt5.place_order(
+            symbol=first.alert.symbol,
+            order_type=first.alert.signal,
+            lot_size=round(sum(leg.trade.lot_size for leg in legs), 2),
+            price=first.alert.price,
+            sl=sl,
+            tp=tp,
+            comment=comment[:31]  # MT5 comment limit
+        )
+        self.orders_sent += 1
+        if ticket and len(legs) > 1:
+            self.legs_netted += len(legs)
+            self.orders_saved += len(legs) - 1
+        return ticket
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "window_ms": int(self.window_seconds * 1000),
+            "pending": sum(len(group.entries) for group in self.pending.values()),
+            "alerts_received": self.alerts_received,
+            "groups": self.groups,
+            "orders_sent": self.orders_sent,
+            "legs_netted": self.legs_netted,
+            "orders_saved": self.orders_saved,
+            "early_flushes": self.early_flushes
+        }
@@ -1,5 +1,6 @@
 from typing import Dict, Tuple
 from config import Config
+from trading_context import TradingContext, TierLevels, sl_tier
 
 class PipCalculator:
     """
@@ -10,6 +11,8 @@ class PipCalculator:
     
     def __init__(self, config: Config):
         self.config = config
+        # SL / TP / risk tables, recompiled only when the config changes
+        self.context = TradingContext(config)
         
     def calculate_sl_price(self, symbol: str, entry_price: float, 
                           direction: str, lot_size: float, 
@@ -22,9 +25,8 @@ class PipCalculator:
         sl_adjustment: Multiplier for SL (used in re-entry system, default 1.0)
         """
         
-        # Get symbol configuration
-        symbol_config = self.config["symbol_config"][symbol]
-        pip_size = symbol_config["pip_size"]
+        # Compiled per-symbol / tier table (no nested config walk)
+        pip_size = self.context.symbol(symbol).pip_size
         
         # Get SL in pips from dual SL system
         sl_pips = self._get_sl_from_dual_system(symbol, account_balance)
@@ -46,61 +48,38 @@ class PipCalculator:
     def _get_sl_from_dual_system(self, symbol: str, account_balance: float) -> float:
         """
         Get SL in pips from active dual SL system (sl-1 or sl-2)
-        Applies symbol-specific reductions if configured
+        Symbol-specific reductions are already applied in the compiled table;
+        falls back to the risk-cap calculation when the system is disabled
         """
+        return self._levels(symbol, account_balance).sl_pips
+    
+    def _levels(self, symbol: str, account_balance: float) -> TierLevels:
+        levels = self.context.levels(symbol, account_balance)
         
-        # Check if SL system is enabled
-        if not self.config.get("sl_system_enabled", True):
-            # Fallback to old risk-cap based calculation
-            return self._fallback_sl_calculation(symbol, account_balance)
-        
-        # Get active system (sl-1 or sl-2)
-        active_system = self.config.get("active_sl_system", "sl-1")
-        
-        # Get account tier
-        account_tier = self._get_account_tier(account_balance)
-        
-        # Get SL pips from active system table
-        try:
-            sl_data = self.config["sl_systems"][active_system]["symbols"][symbol][account_tier]
-            sl_pips = sl_data["sl_pips"]
-        except KeyError:
-            # Fallback if symbol/tier not found
-            print(f"⚠️ SL not found for {symbol} @ {account_tier} in {active_system}, using fallback")
-            return self._fallback_sl_calculation(symbol, account_balance)
-        
-        # Apply symbol-specific reduction if configured
-        symbol_reductions = self.config.get("symbol_sl_reductions", {})
-        if symbol in symbol_reductions:
-            reduction_percent = symbol_reductions[symbol]
-            sl_pips = sl_pips * (1 - reduction_percent / 100)
-            print(f"📉 {symbol} SL reduced by {reduction_percent}%: {sl_pips:.1f} pips")
+        if levels.source == "missing":
+            active_system = self.config.get("active_sl_system", "sl-1")
+            print(f"⚠️ SL not found for {symbol} @ {self._get_account_tier(account_balance)} in {active_system}, using fallback")
+        elif levels.sl_pips != levels.sl_pips_original:
+            reduction_percent = self.context.symbol(symbol).reduction_percent
+            print(f"📉 {symbol} SL reduced by {reduction_percent}%: {levels.sl_pips:.1f} pips")
         
-        return sl_pips
+        return levels
     
-    def _fallback_sl_calculation(self, symbol: str, account_balance: float) -> float:
+    def entry_levels(self, symbol: str, entry_price: float, direction: str,
+                     account_balance: float) -> Tuple[float, float, float, float]:
         """
-        Fallback SL calculation when dual system is disabled
-        Uses old risk-cap based logic
+        Fresh-entry SL and TP straight from the compiled table (rr_ratio applied)
+        Returns: (sl_price, sl_distance, tp_price, sl_pips)
         """
-        symbol_config = self.config["symbol_config"][symbol]
-        volatility = symbol_config["volatility"]
-        account_tier = self._get_account_tier(account_balance)
-        
-        # Get risk cap
-        risk_cap = self.config["risk_by_account_tier"][account_tier][volatility]["risk_dollars"]
-        
-        # Get lot size from fixed_lot_sizes
-        lot_size = self.config["fixed_lot_sizes"].get(account_tier, 0.05)
-        
-        # Calculate pip value
-        pip_value_std = symbol_config["pip_value_per_std_lot"]
-        pip_value = pip_value_std * lot_size
-        
-        # Calculate SL in pips
-        sl_pips = risk_cap / pip_value
-        
-        return sl_pips
+        levels = self._levels(symbol, account_balance)
+        if direction == "buy":
+            sl_price = entry_price - levels.sl_distance
+            tp_price = entry_price + levels.tp_distance
+        else:
+            sl_price = entry_price + levels.sl_distance
+            tp_price = entry_price - levels.tp_distance
+        return sl_price, levels.sl_distance, tp_price, levels.sl_pips
+    
     def _get_pip_value(self, symbol: str, lot_size: float) -> float:
         """
         Get pip value for a specific lot size
@@ -156,16 +135,7 @@ class PipCalculator:
         Determine account tier based on balance
         Returns tier key as string for config lookup
         """
-        if balance < 7500:
-            return "5000"
-        elif balance < 17500:
-            return "10000"
-        elif balance < 37500:
-            return "25000"
-        elif balance < 75000:
-            return "50000"
-        else:
-            return "100000"
+        return sl_tier(balance)
     
     def validate_trade_risk(self, symbol: str, lot_size: float, sl_pips: float, 
                            account_balance: float) -> Dict:
@@ -174,24 +144,13 @@ class PipCalculator:
         Returns: {"valid": bool, "expected_loss": float, "risk_cap": float, "message": str}
         """
         # Get pip value
-        symbol_config = self.config["symbol_config"][symbol]
-        pip_value_std = symbol_config["pip_value_per_std_lot"]
-        pip_value = pip_value_std * lot_size
+        pip_value = self.context.symbol(symbol).pip_value_per_std_lot * lot_size
         
         # Calculate expected loss
         expected_loss = sl_pips * pip_value
         
-        # Get risk cap from active SL system
-        account_tier = self._get_account_tier(account_balance)
-        active_system = self.config.get("active_sl_system", "sl-1")
-        
-        try:
-            sl_data = self.config["sl_systems"][active_system]["symbols"][symbol][account_tier]
-            risk_cap = sl_data["risk_dollars"]
-        except KeyError:
-            # Fallback to old risk tier system
-            volatility = symbol_config["volatility"]
-            risk_cap = self.config["risk_by_account_tier"][account_tier][volatility]["risk_dollars"]
+        # Risk cap from the active SL system (or the old risk tier table)
+        risk_cap = self.context.levels(symbol, account_balance).risk_cap
         
         # Validate with 10% tolerance
         tolerance = 0.1
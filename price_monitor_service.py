@@ -98,7 +98,7 @@ class PriceMonitorService:
             pending = self.sl_hunt_pending[symbol]
             
             # Get current price from MT5
-            current_price = self._get_current_price(symbol, pending['direction'])
+            current_price = await self._get_current_price(symbol, pending['direction'])
             if current_price is None:
                 continue
             
@@ -120,30 +120,31 @@ class PriceMonitorService:
                 
                 if not alignment['aligned']:
                     self.logger.info(f"❌ SL hunt re-entry blocked - trend not aligned for {symbol}")
-                    del self.sl_hunt_pending[symbol]
+                    await self.discard_pending(self.sl_hunt_pending, symbol)
                     continue
                 
                 # Check signal direction matches alignment
                 signal_direction = "BULLISH" if direction == "buy" else "BEARISH"
                 if alignment['direction'] != signal_direction:
                     self.logger.info(f"❌ SL hunt re-entry blocked - direction mismatch for {symbol}")
-                    del self.sl_hunt_pending[symbol]
+                    await self.discard_pending(self.sl_hunt_pending, symbol)
                     continue
                 
                 # Execute SL hunt re-entry
                 self.logger.info(f"🎯 SL Hunt Re-Entry Triggered: {symbol} @ {current_price}")
                 
-                # Create re-entry order with reduced SL
-                await self._execute_sl_hunt_reentry(
-                    symbol=symbol,
-                    direction=direction,
-                    price=current_price,
-                    chain_id=chain_id,
-                    logic=logic
-                )
+                # Create re-entry order with reduced SL (ordered with this symbol's alerts)
+                async with self.trading_engine.symbol_lock(symbol):
+                    await self._execute_sl_hunt_reentry(
+                        symbol=symbol,
+                        direction=direction,
+                        price=current_price,
+                        chain_id=chain_id,
+                        logic=logic
+                    )
                 
                 # Remove from pending
-                del self.sl_hunt_pending[symbol]
+                await self.discard_pending(self.sl_hunt_pending, symbol)
     
     async def _check_tp_continuation_reentries(self):
         """
@@ -157,7 +158,7 @@ class PriceMonitorService:
             pending = self.tp_continuation_pending[symbol]
             
             # Get current price from MT5
-            current_price = self._get_current_price(symbol, pending['direction'])
+            current_price = await self._get_current_price(symbol, pending['direction'])
             if current_price is None:
                 continue
             
@@ -185,28 +186,29 @@ class PriceMonitorService:
                 
                 if not alignment['aligned']:
                     self.logger.info(f"❌ TP re-entry blocked - trend not aligned for {symbol}")
-                    del self.tp_continuation_pending[symbol]
+                    await self.discard_pending(self.tp_continuation_pending, symbol)
                     continue
                 
                 signal_direction = "BULLISH" if direction == "buy" else "BEARISH"
                 if alignment['direction'] != signal_direction:
                     self.logger.info(f"❌ TP re-entry blocked - direction mismatch for {symbol}")
-                    del self.tp_continuation_pending[symbol]
+                    await self.discard_pending(self.tp_continuation_pending, symbol)
                     continue
                 
                 # Execute TP continuation re-entry
                 self.logger.info(f"🎯 TP Continuation Re-Entry Triggered: {symbol} @ {current_price}")
                 
-                await self._execute_tp_continuation_reentry(
-                    symbol=symbol,
-                    direction=direction,
-                    price=current_price,
-                    chain_id=chain_id,
-                    logic=logic
-                )
+                async with self.trading_engine.symbol_lock(symbol):
+                    await self._execute_tp_continuation_reentry(
+                        symbol=symbol,
+                        direction=direction,
+                        price=current_price,
+                        chain_id=chain_id,
+                        logic=logic
+                    )
                 
                 # Remove from pending
-                del self.tp_continuation_pending[symbol]
+                await self.discard_pending(self.tp_continuation_pending, symbol)
     
     async def _check_exit_continuation_reentries(self):
         """
@@ -221,7 +223,7 @@ class PriceMonitorService:
             pending = self.exit_continuation_pending[symbol]
             
             # Get current price from MT5
-            current_price = self._get_current_price(symbol, pending['direction'])
+            current_price = await self._get_current_price(symbol, pending['direction'])
             if current_price is None:
                 continue
             
@@ -249,13 +251,13 @@ class PriceMonitorService:
                 
                 if not alignment['aligned']:
                     self.logger.info(f"❌ Exit continuation blocked - trend not aligned for {symbol} after {exit_reason}")
-                    del self.exit_continuation_pending[symbol]
+                    await self.discard_pending(self.exit_continuation_pending, symbol)
                     continue
                 
                 signal_direction = "BULLISH" if direction == "buy" else "BEARISH"
                 if alignment['direction'] != signal_direction:
                     self.logger.info(f"❌ Exit continuation blocked - direction mismatch for {symbol}")
-                    del self.exit_continuation_pending[symbol]
+                    await self.discard_pending(self.exit_continuation_pending, symbol)
                     continue
                 
                 # Execute Exit continuation re-entry
@@ -275,7 +277,7 @@ class PriceMonitorService:
                 await self.trading_engine.process_alert(entry_signal)
                 
                 # Remove from pending
-                del self.exit_continuation_pending[symbol]
+                await self.discard_pending(self.exit_continuation_pending, symbol)
                 
                 self.logger.info(f"✅ Exit continuation re-entry executed for {symbol}")
     
@@ -292,7 +294,10 @@ class PriceMonitorService:
         reduction_per_level = self.config["re_entry_config"]["sl_reduction_per_level"]
         sl_adjustment = (1 - reduction_per_level) ** chain.current_level
         
-        account_balance = self.mt5_client.get_account_balance()
+        account_balance = await self.trading_engine.account_state.get_balance()
+        if account_balance is None:
+            self.logger.warning(f"Re-entry skipped for {symbol}: account balance unknown")
+            return
         lot_size = self.trading_engine.risk_manager.get_fixed_lot_size(account_balance)
         
         # Calculate SL and TP
@@ -321,7 +326,7 @@ class PriceMonitorService:
         
         # Place order
         if not self.config["simulate_orders"]:
-            trade_id = self.mt5_client.place_order(
+            trade_id = await self.trading_engine.mt5.place_order(
                 symbol=symbol,
                 order_type=direction,
                 lot_size=lot_size,
@@ -333,12 +338,10 @@ class PriceMonitorService:
             if trade_id:
                 trade.trade_id = trade_id
         
-        # Update chain
-        self.reentry_manager.update_chain_level(chain_id, trade.trade_id)
-        
-        # Add to open trades
-        self.trading_engine.open_trades.append(trade)
-        self.trading_engine.risk_manager.add_open_trade(trade)
+        # Update chain and add to open trades (one state command)
+        await self.trading_engine.state.execute(
+            self.trading_engine.book_chain_trade, trade, chain_id, count=False
+        )
         
         # Send Telegram notification
         sl_reduction_percent = (1 - sl_adjustment) * 100
@@ -368,7 +371,10 @@ class PriceMonitorService:
         reduction_per_level = self.config["re_entry_config"]["sl_reduction_per_level"]
         sl_adjustment = (1 - reduction_per_level) ** chain.current_level
         
-        account_balance = self.mt5_client.get_account_balance()
+        account_balance = await self.trading_engine.account_state.get_balance()
+        if account_balance is None:
+            self.logger.warning(f"Re-entry skipped for {symbol}: account balance unknown")
+            return
         lot_size = self.trading_engine.risk_manager.get_fixed_lot_size(account_balance)
         
         # Calculate SL and TP
@@ -397,7 +403,7 @@ class PriceMonitorService:
         
         # Place order
         if not self.config["simulate_orders"]:
-            trade_id = self.mt5_client.place_order(
+            trade_id = await self.trading_engine.mt5.place_order(
                 symbol=symbol,
                 order_type=direction,
                 lot_size=lot_size,
@@ -409,12 +415,10 @@ class PriceMonitorService:
             if trade_id:
                 trade.trade_id = trade_id
         
-        # Update chain
-        self.reentry_manager.update_chain_level(chain_id, trade.trade_id)
-        
-        # Add to open trades
-        self.trading_engine.open_trades.append(trade)
-        self.trading_engine.risk_manager.add_open_trade(trade)
+        # Update chain and add to open trades (one state command)
+        await self.trading_engine.state.execute(
+            self.trading_engine.book_chain_trade, trade, chain_id, count=False
+        )
         
         # Save to database
         tp_level = chain.current_level + 1
@@ -422,7 +426,7 @@ class PriceMonitorService:
             INSERT INTO tp_reentry_events VALUES (?,?,?,?,?,?,?,?,?)
         ''', (None, chain_id, symbol, tp_level, chain.total_profit, price, 
               (1-sl_adjustment)*100, 0, datetime.now().isoformat()))
-        self.trading_engine.db.conn.commit()
+        self.trading_engine.db.commit()
         
         # Send Telegram notification
         sl_reduction_percent = (1 - sl_adjustment) * 100
@@ -439,21 +443,22 @@ class PriceMonitorService:
             f"Level: {tp_level}/{chain.max_level}"
         )
     
-    def _get_current_price(self, symbol: str, direction: str) -> Optional[float]:
+    async def _get_current_price(self, symbol: str, direction: str) -> Optional[float]:
         """Get current price from MT5 (or simulation)"""
         try:
             if self.config.get("simulate_orders", True):
                 # Simulation mode - return None or mock price
                 return None
             
-            import MetaTrader5 as mt5
-            tick = mt5.symbol_info_tick(symbol)
-            if tick:
-                return tick.ask if direction == 'buy' else tick.bid
-            return None
+            # Tick cache first; a cache miss reads the (mapped) broker symbol once
+            return await self.trading_engine.mt5.get_tick_price(symbol, direction)
         except:
             return None
     
+    async def discard_pending(self, pending: Dict[str, Any], symbol: str):
+        """Drop a symbol's pending re-entry (state actor command)"""
+        await self.trading_engine.state.execute(pending.pop, symbol, None)
+    
     def register_sl_hunt(self, trade: Trade, logic: str):
         """Register a trade for SL hunt monitoring"""
         
@@ -1,6 +1,7 @@
 from typing import Dict, Optional, List, Any
 from datetime import datetime, timedelta
 from models import Trade, ReEntryChain
+from trading_context import TradingContext
 import uuid
 
 class ReEntryManager:
@@ -8,6 +9,7 @@ class ReEntryManager:
     
     def __init__(self, config):
         self.config = config
+        self.context = TradingContext(config)
         self.active_chains = {}  # chain_id -> ReEntryChain
         self.recent_sl_hits = {}  # symbol -> list of recent SL hits
         self.completed_tps = {}  # symbol -> recent TP completions
@@ -30,28 +32,14 @@ class ReEntryManager:
         
         # Get active SL system and reduction info
         active_system = self.config.get("active_sl_system", "sl-1")
-        symbol_reductions = self.config.get("symbol_sl_reductions", {})
-        symbol_reduction = symbol_reductions.get(trade.symbol, 0)
+        symbol_reduction = self.config.get("symbol_sl_reductions", {}).get(trade.symbol, 0)
         
-        # Get ORIGINAL unreduced SL pips from dual system config
-        # Determine account tier based on balance
+        # ORIGINAL unreduced and applied SL pips (what was actually used on the
+        # trade) from the compiled table, at the configured account balance tier
         balance = self.config.get("account_balance", 10000)
-        if balance < 7500:
-            tier = "5000"
-        elif balance < 17500:
-            tier = "10000"
-        elif balance < 37500:
-            tier = "25000"
-        elif balance < 75000:
-            tier = "50000"
-        else:
-            tier = "100000"
-        
-        # Fetch original SL pips from the active system config
-        original_sl_pips = self.config["sl_systems"][active_system]["symbols"][trade.symbol][tier]["sl_pips"]
-        
-        # Calculate applied SL pips (what was actually used on the trade)
-        applied_sl_pips = original_sl_pips * (1 - symbol_reduction / 100) if symbol_reduction > 0 else original_sl_pips
+        levels = self.context.levels(trade.symbol, balance)
+        original_sl_pips = levels.sl_pips_original
+        applied_sl_pips = levels.sl_pips
         
         chain = ReEntryChain(
             chain_id=chain_id,
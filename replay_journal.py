@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Replay an alert journal through AlertProcessor and TradingEngine in simulation mode
+Reproduces load spikes offline at real or accelerated speed
+
+Usage:
+    python replay_journal.py journal/                   # real-time
+    python replay_journal.py journal/ --speed 20        # 20x faster
+    python replay_journal.py alerts-....jsonl.gz --speed 0 --profile replay.pstats
+    python replay_journal.py journal/ --simulator       # orders hit the simulated MT5 backend
+
+Engine state files (stats.json, trading_bot.db, timeframe_trends.json) are
+written to a scratch directory, never to the live bot's files.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from typing import List
+from config import Config
+from alert_journal import read_journal
+from metrics import percentiles
+
+class ReplayTelegram:
+    """Stands in for TelegramBot so a replay never posts to the live chat"""
+
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        self.messages_sent = 0
+
+    def send_message(self, message: str):
+        self.messages_sent += 1
+        if self.verbose:
+            print(f"📨 [replay telegram] {message}")
+        return True
+
+    def set_trend_manager(self, trend_manager):
+        pass
+
+async def replay(journal_path: str, speed: float, workdir: str, use_queue: bool,
+                 verbose: bool, seed_trends: bool, simulator: bool = False):
+    # Config is read from the bot directory, everything else lives in workdir
+    config = Config()
+    config.config["simulate_orders"] = not simulator  # in memory only - never saved
+    if simulator:
+        # Orders go through the full MT5 path against the in-process simulator
+        config.config["broker_backend"] = dict(config.get("broker_backend", {}), type="simulator")
+
+    if seed_trends and os.path.exists("timeframe_trends.json"):
+        shutil.copy("timeframe_trends.json", os.path.join(workdir, "timeframe_trends.json"))
+    os.chdir(workdir)
+
+    from risk_manager import RiskManager
+    from mt5_client import MT5Client
+    from alert_processor import AlertProcessor
+    from alert_queue import AlertIngestQueue
+    from trading_engine import TradingEngine
+
+    telegram = ReplayTelegram(verbose)
+    risk_manager = RiskManager(config)
+    mt5_client = MT5Client(config)
+    if simulator:
+        mt5_client.initialize()
+    else:
+        mt5_client.initialized = True  # simulation - never connect to a terminal
+    # Duplicate window runs on the journaled receive times, not the replay's wall clock
+    journal_now = [0.0]
+    alert_processor = AlertProcessor(config, clock=lambda: journal_now[0])
+    trading_engine = TradingEngine(config, risk_manager, mt5_client, telegram, alert_processor)
+
+    latencies_ms: List[float] = []
+    received_at = {}
+
+    async def handle(alert) -> bool:
+        result = await trading_engine.process_alert(alert)
+        latencies_ms.append((time.perf_counter() - received_at.pop(id(alert))) * 1000)
+        return result
+
+    queue = AlertIngestQueue(config, handle, trading_engine.order_netter.eligible)
+    queue.start()
+
+    replayed = accepted = rejected = 0
+    first_ts = None
+    wall_start = time.perf_counter()
+
+    for record in read_journal(journal_path):
+        if record.get("kind") != "recv":
+            continue
+
+        # Pace the replay against the original receive times
+        if first_ts is None:
+            first_ts = record["ts"]
+        if speed > 0:
+            due = (record["ts"] - first_ts) / speed
+            delay = due - (time.perf_counter() - wall_start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        replayed += 1
+        journal_now[0] = record["ts"]
+        alert = alert_processor.validate_alert(record["payload"])
+        if alert is None:
+            rejected += 1
+            continue
+
+        received_at[id(alert)] = time.perf_counter()
+        if use_queue:
+            if queue.submit(alert):
+                accepted += 1
+            else:
+                received_at.pop(id(alert), None)
+                rejected += 1
+        else:
+            accepted += 1
+            await handle(alert)
+
+    # Let queued alerts drain
+    while queue.pending > 0:
+        await asyncio.sleep(0.01)
+    await queue.stop()
+    await trading_engine.trend_coalescer.flush()
+    trading_engine.decision_audit.flush()
+    reject_reasons = trading_engine.decision_audit.report(since_hours=24 * 365)["reject_reasons"]
+
+    elapsed = time.perf_counter() - wall_start
+    print(f"\n{'='*60}")
+    print("JOURNAL REPLAY SUMMARY")
+    print(f"{'='*60}")
+    print(f"  Alerts replayed:   {replayed}")
+    print(f"  Accepted:          {accepted}")
+    print(f"  Rejected:          {rejected}")
+    print(f"  Trades opened:     {trading_engine.trade_count}")
+    print(f"  Telegram messages: {telegram.messages_sent}")
+    print(f"  Wall time:         {elapsed:.3f}s")
+    if latencies_ms:
+        latency = percentiles(latencies_ms)
+        print(f"  Latency p50/p95/max: {latency['p50']:.2f} / {latency['p95']:.2f} / {latency['max']:.2f} ms")
+    if reject_reasons:
+        print("  Engine reject reasons: " + ", ".join(f"{reason}={count}" for reason, count in reject_reasons.items()))
+    if simulator:
+        print(f"  Simulated broker:  {mt5_client.mt5.get_stats()}")
+    print(f"  Scratch directory: {workdir}")
+    return {"replayed": replayed, "accepted": accepted, "rejected": rejected}
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay an alert journal in simulation mode")
+    parser.add_argument("journal", help="Journal segment (.jsonl / .jsonl.gz) or journal directory")
+    parser.add_argument("--speed", default=1.0, type=float,
+                        help="Replay speed multiplier (1 = real time, 0 = as fast as possible)")
+    parser.add_argument("--workdir", default=None, help="Scratch directory for engine state files")
+    parser.add_argument("--inline", action="store_true", help="Process alerts inline instead of via the ingest queue")
+    parser.add_argument("--seed-trends", action="store_true", help="Start from the live timeframe_trends.json")
+    parser.add_argument("--profile", default=None, help="Write cProfile stats to this file")
+    parser.add_argument("--verbose", action="store_true", help="Print simulated Telegram messages")
+    parser.add_argument("--simulator", action="store_true",
+                        help="Send orders to the simulated MT5 backend instead of dummy tickets")
+    args = parser.parse_args()
+
+    journal_path = os.path.abspath(args.journal)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="zepix-replay-"))
+    os.makedirs(workdir, exist_ok=True)
+    profile_path = os.path.abspath(args.profile) if args.profile else None
+
+    coro = replay(journal_path, args.speed, workdir, not args.inline, args.verbose, args.seed_trends,
+                  args.simulator)
+
+    if profile_path:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        asyncio.run(coro)
+        profiler.disable()
+        profiler.dump_stats(profile_path)
+        print(f"  Profile written:   {profile_path}")
+    else:
+        asyncio.run(coro)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+import asyncio
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from models import Trade, Alert
+from trade_book import TradeBook
 from config import Config
 import logging
 
@@ -14,15 +16,17 @@ class ReversalExitHandler:
     4. Exit Appeared alerts (type: 'exit', early warning)
     """
     
-    def __init__(self, config: Config, mt5_client, telegram_bot, db, price_monitor=None):
+    def __init__(self, config: Config, mt5_client, telegram_bot, db, price_monitor=None, *, mt5):
         self.config = config
         self.mt5_client = mt5_client
         self.telegram_bot = telegram_bot
         self.db = db
         self.price_monitor = price_monitor
+        # AsyncMT5Client - closes run on the MT5 executor thread, never on the event loop
+        self.mt5 = mt5
         self.logger = logging.getLogger(__name__)
     
-    async def check_reversal_exit(self, alert: Alert, open_trades: list) -> list:
+    async def check_reversal_exit(self, alert: Alert, open_trades: TradeBook) -> list:
         """
         Check if alert triggers reversal exit for any open trade
         Returns list of trades to close
@@ -32,10 +36,8 @@ class ReversalExitHandler:
         
         trades_to_close = []
         
-        for trade in open_trades:
-            if trade.symbol != alert.symbol:
-                continue
-            
+        # Only this symbol's trades (TradeBook index)
+        for trade in open_trades.by_symbol(alert.symbol):
             should_exit = False
             exit_reason = ""
             
@@ -86,16 +88,82 @@ class ReversalExitHandler:
         
         return trades_to_close
     
-    async def execute_reversal_exit(self, trade: Trade, exit_price: float, exit_reason: str):
+    async def execute_reversal_exit(self, trade: Trade, exit_price: float, exit_reason: str,
+                                    open_trades: Optional[TradeBook] = None):
         """Execute immediate profit booking on reversal signal"""
+        closed = await self.execute_reversal_exits([
+            {'trade': trade, 'exit_price': exit_price, 'exit_reason': exit_reason}
+        ], open_trades)
+        return bool(closed)
+    
+    async def execute_reversal_exits(self, trades_to_close: List[Dict[str, Any]],
+                                     open_trades: Optional[TradeBook] = None) -> List[Trade]:
+        """
+        Close every matched trade as one batch
+        - One MT5 close per ticket, all queued back-to-back on the MT5 thread
+        - A netted ticket shared with open trades that are not being closed
+          only has the matched legs' volume closed (open_trades is checked)
+        - Fills recorded in one DB transaction, one summary notification
+        Returns the trades that were actually closed
+        """
+        if not trades_to_close:
+            return []
         
-        # Close position in MT5
+        # Close positions in MT5
+        failed = []
         if not self.config.get("simulate_orders", True):
-            success = self.mt5_client.close_position(trade.trade_id)
-            if not success:
-                self.logger.error(f"Failed to close position {trade.trade_id}")
-                return False
+            by_ticket: Dict[Any, List[Trade]] = {}
+            for info in trades_to_close:
+                by_ticket.setdefault(info['trade'].trade_id, []).append(info['trade'])
+            
+            closes = []
+            for ticket, trades in by_ticket.items():
+                closing = {id(trade) for trade in trades}
+                shared = open_trades is not None and any(
+                    id(other) not in closing for other in open_trades.by_trade_id(ticket)
+                )
+                volume = round(sum(trade.lot_size for trade in trades), 2) if shared else None
+                closes.append(self.mt5.close_position(ticket, volume=volume))
+            results = await asyncio.gather(*closes, return_exceptions=True)
+            
+            closed_tickets = set()
+            for ticket, result in zip(by_ticket, results):
+                if result is True:
+                    closed_tickets.add(ticket)
+                else:
+                    detail = f": {result}" if isinstance(result, Exception) else ""
+                    self.logger.error(f"Failed to close position {ticket}{detail}")
+                    failed.extend(by_ticket[ticket])
+            trades_to_close = [info for info in trades_to_close
+                               if info['trade'].trade_id in closed_tickets]
+        
+        close_time = datetime.now().isoformat()
+        for info in trades_to_close:
+            trade = info['trade']
+            trade.close_time = close_time
+            trade.pnl = self._reversal_pnl(trade, info['exit_price'])
+            trade.status = "closed"
+        
+        # Save all fills and reversal exit events in one commit
+        if trades_to_close:
+            with self.db.transaction():
+                cursor = self.db.conn.cursor()
+                for info in trades_to_close:
+                    trade = info['trade']
+                    self.db.save_trade(trade)
+                    cursor.execute('''
+                        INSERT INTO reversal_exit_events VALUES (?,?,?,?,?,?,?)
+                    ''', (None, trade.trade_id, trade.symbol, info['exit_price'],
+                          info['exit_reason'], trade.pnl, close_time))
+        
+        self._notify_reversal_exits(trades_to_close, failed)
         
+        for info in trades_to_close:
+            self.logger.info(f"✅ Reversal exit executed: {info['trade'].symbol} PnL ${info['trade'].pnl:.2f}")
+        
+        return [info['trade'] for info in trades_to_close]
+    
+    def _reversal_pnl(self, trade: Trade, exit_price: float) -> float:
         # Calculate PnL
         if trade.direction == 'buy':
             pnl = (exit_price - trade.entry) * trade.lot_size * 10000
@@ -106,51 +174,48 @@ class ReversalExitHandler:
         symbol_config = self.config["symbol_config"][trade.symbol]
         if symbol_config.get("is_gold", False):
             pnl = pnl * 100  # Gold multiplier
+        return pnl
+    
+    def _notify_reversal_exits(self, closed_infos: List[Dict[str, Any]], failed: List[Trade]):
+        """One Telegram message for the whole batch"""
+        if len(closed_infos) == 1:
+            info = closed_infos[0]
+            trade = info['trade']
+            profit_emoji = "✅" if trade.pnl >= 0 else "❌"
+            message = (
+                f"{profit_emoji} REVERSAL EXIT\n"
+                f"Reason: {info['exit_reason']}\n"
+                f"Symbol: {trade.symbol}\n"
+                f"Entry: {trade.entry:.5f}\n"
+                f"Exit: {info['exit_price']:.5f}\n"
+                f"Direction: {trade.direction.upper()}\n"
+                f"PnL: ${trade.pnl:.2f}\n"
+                f"Strategy: {trade.strategy}"
+            )
+        elif closed_infos:
+            total_pnl = sum(info['trade'].pnl for info in closed_infos)
+            profit_emoji = "✅" if total_pnl >= 0 else "❌"
+            lines = [
+                f"{profit_emoji} REVERSAL EXIT x{len(closed_infos)}",
+                f"Symbol: {closed_infos[0]['trade'].symbol}",
+                f"Exit: {closed_infos[0]['exit_price']:.5f}",
+                f"Total PnL: ${total_pnl:.2f}",
+                ""
+            ]
+            for info in closed_infos:
+                trade = info['trade']
+                lines.append(f"• {trade.strategy} {trade.direction.upper()} @ {trade.entry:.5f} "
+                             f"→ ${trade.pnl:.2f} ({info['exit_reason']})")
+            message = "\n".join(lines)
+        else:
+            message = None
         
-        # Update trade
-        trade.close_time = datetime.now().isoformat()
-        trade.pnl = pnl
-        trade.status = "closed"
-        
-        # Save to database
-        self.db.save_trade(trade)
-        
-        # Save reversal exit event
-        cursor = self.db.conn.cursor()
-        cursor.execute('''
-            INSERT INTO reversal_exit_events VALUES (?,?,?,?,?,?,?)
-        ''', (None, trade.trade_id, trade.symbol, exit_price, 
-              exit_reason, pnl, datetime.now().isoformat()))
-        self.db.conn.commit()
-        
-        # Send Telegram notification
-        profit_emoji = "✅" if pnl >= 0 else "❌"
-        self.telegram_bot.send_message(
-            f"{profit_emoji} REVERSAL EXIT\n"
-            f"Reason: {exit_reason}\n"
-            f"Symbol: {trade.symbol}\n"
-            f"Entry: {trade.entry:.5f}\n"
-            f"Exit: {exit_price:.5f}\n"
-            f"Direction: {trade.direction.upper()}\n"
-            f"PnL: ${pnl:.2f}\n"
-            f"Strategy: {trade.strategy}"
-        )
-        
-        # Register continuation monitoring (NEW FEATURE)
-        # After Exit Appeared/Reversal exit, continue monitoring for re-entry with price gap
-        if self.price_monitor and self.config["re_entry_config"].get("exit_continuation_enabled", True):
-            # Only register for specific exit reasons
-            if any(reason in exit_reason for reason in ['EXIT_APPEARED', 'TREND_REVERSAL', 'REVERSAL_', 'OPPOSITE_SIGNAL']):
-                self.price_monitor.register_exit_continuation(
-                    trade=trade,
-                    exit_price=exit_price,
-                    exit_reason=exit_reason,
-                    logic=trade.strategy,
-                    timeframe='15M'  # Default timeframe
-                )
+        if failed:
+            failed_line = "⚠️ Close failed: " + ", ".join(f"#{trade.trade_id}" for trade in failed)
+            message = f"{message}\n\n{failed_line}" if message else failed_line
         
-        self.logger.info(f"✅ Reversal exit executed: {trade.symbol} PnL ${pnl:.2f}")
-        return True
+        if message:
+            self.telegram_bot.send_message(message)
     
     def get_reversal_exit_stats(self) -> Dict[str, Any]:
         """Get statistics for reversal exits"""
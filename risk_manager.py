@@ -1,8 +1,10 @@
 import json
 import os
 from datetime import datetime, date
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from config import Config
+from trade_book import TradeBook
+from trading_context import TradingContext, risk_tier
 
 class RiskManager:
     def __init__(self, config: Config):
@@ -13,8 +15,10 @@ class RiskManager:
         self.daily_profit = 0.0
         self.total_trades = 0
         self.winning_trades = 0
-        self.open_trades = []
+        self.open_trades = TradeBook()
         self.mt5_client = None
+        self.account_state = None
+        self.context = TradingContext(config)
         self.load_stats()
         
     def load_stats(self):
@@ -75,19 +79,8 @@ class RiskManager:
     def get_fixed_lot_size(self, balance: float) -> float:
         """Get fixed lot size based on account balance"""
         
-        # Manual overrides first
-        manual_overrides = self.config.get("manual_lot_overrides", {})
-        if str(int(balance)) in manual_overrides:
-            return manual_overrides[str(int(balance))]
-        
-        # Then tier-based sizing
-        fixed_lots = self.config["fixed_lot_sizes"]
-        
-        for tier_balance in sorted(fixed_lots.keys(), key=int, reverse=True):
-            if balance >= int(tier_balance):
-                return fixed_lots[tier_balance]
-        
-        return 0.05  # Default minimum
+        # Manual overrides first, then tier-based sizing (compiled table)
+        return self.context.lot_size(balance)
     
     def set_manual_lot_size(self, balance_tier: int, lot_size: float):
         """Manually override lot size for a balance tier"""
@@ -100,17 +93,13 @@ class RiskManager:
     
     def get_risk_tier(self, balance: float) -> str:
         """Get risk tier based on account balance"""
-        for tier in ["100000", "50000", "25000", "10000", "5000"]:
-            if balance >= int(tier):
-                return tier
-        return "5000"
+        return risk_tier(balance)
     
-    def can_trade(self) -> bool:
-        """Check if trading is allowed based on risk limits"""
+    def can_trade(self, account_balance: float) -> bool:
+        """Check if trading is allowed based on risk limits (balance awaited by the caller)"""
         if not self.mt5_client:
             return False
             
-        account_balance = self.mt5_client.get_account_balance()
         risk_tier = self.get_risk_tier(account_balance)
         
         if risk_tier not in self.config["risk_tiers"]:
@@ -142,27 +131,45 @@ class RiskManager:
         
         self.save_stats()
     
+    def set_trade_book(self, trade_book: TradeBook):
+        """Share the engine's open-trade book"""
+        self.open_trades = trade_book
+    
     def add_open_trade(self, trade):
-        """Add trade to open trades list"""
-        self.open_trades.append(trade)
+        """Add trade to open trades"""
+        self.open_trades.add(trade)
     
     def remove_open_trade(self, trade):
-        """Remove trade from open trades list"""
-        self.open_trades = [t for t in self.open_trades 
-                          if getattr(t, 'trade_id', None) != getattr(trade, 'trade_id', None)]
+        """Remove trade from open trades"""
+        self.open_trades.remove(trade)
     
     def set_mt5_client(self, mt5_client):
         """Set MT5 client for balance checking"""
         self.mt5_client = mt5_client
     
+    def set_account_state(self, account_state):
+        """Read balance from the engine's account cache instead of the terminal"""
+        self.account_state = account_state
+    
+    def get_account_balance(self) -> Optional[float]:
+        """Cached balance when the engine's account cache is set (None until loaded)"""
+        if self.account_state:
+            return self.account_state.get_balance_sync()
+        return self.mt5_client.get_account_balance()
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get current statistics"""
         if not self.mt5_client:
             return {}
             
-        account_balance = self.mt5_client.get_account_balance()
-        risk_tier = self.get_risk_tier(account_balance)
-        lot_size = self.get_fixed_lot_size(account_balance)
+        account_balance = self.get_account_balance()
+        if account_balance is None:
+            # Balance not loaded yet - report the default tier, no lot size
+            risk_tier = self.config.get("default_risk_tier", "5000")
+            lot_size = None
+        else:
+            risk_tier = self.get_risk_tier(account_balance)
+            lot_size = self.get_fixed_lot_size(account_balance)
         
         if risk_tier not in self.config["risk_tiers"]:
             return {}
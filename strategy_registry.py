@@ -0,0 +1,121 @@
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+from config import Config
+
+class StrategySpec(NamedTuple):
+    name: str                       # "LOGIC1"
+    entry_tf: str                   # entry alerts on this timeframe are routed here
+    alignment_tfs: Tuple[str, ...]  # bias first, then trend - all must agree
+    label: str                      # "1H+15M→5M"
+
+
+class StrategyRegistry:
+    """
+    Trading strategies declared in config["strategy_registry"] (Config.default_config
+    when config.json has no such section)
+    - Each entry: entry_tf, alignment_tfs (bias first, then trend), enabled, label
+    - Compiled into dispatch tables (name -> spec, entry tf -> specs, entry tf ->
+      enabled specs), so routing and alignment checks are dict lookups
+    - Enabled flags are runtime state (/logic1_on ...), seeded from config
+    Recompiled lazily when Config.version changes; runtime flags are kept.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._version = None
+        self._specs: Dict[str, StrategySpec] = {}
+        self._by_timeframe: Dict[str, Tuple[StrategySpec, ...]] = {}
+        self._enabled_by_timeframe: Dict[str, Tuple[StrategySpec, ...]] = {}
+        self._enabled: Dict[str, bool] = {}
+        self.compilations = 0
+
+    def _ensure(self):
+        if self._version != self.config.version:
+            self._compile()
+
+    def _compile(self):
+        version = self.config.version
+        specs = {}
+        by_timeframe: Dict[str, List[StrategySpec]] = {}
+        definitions = self.config.get("strategy_registry", self.config.default_config["strategy_registry"])
+        for name, definition in definitions.items():
+            alignment_tfs = tuple(definition.get("alignment_tfs", ()))
+            if not alignment_tfs:
+                print(f"⚠️ Strategy {name} has no alignment timeframes - skipped")
+                continue
+            spec = StrategySpec(name, definition["entry_tf"], alignment_tfs, definition.get("label", name))
+            specs[name] = spec
+            by_timeframe.setdefault(spec.entry_tf, []).append(spec)
+            # Runtime toggles survive recompilation
+            self._enabled.setdefault(name, definition.get("enabled", True))
+
+        self._specs = specs
+        self._by_timeframe = {tf: tuple(group) for tf, group in by_timeframe.items()}
+        self._rebuild_enabled()
+        self._version = version
+        self.compilations += 1
+
+    def _rebuild_enabled(self):
+        self._enabled_by_timeframe = {
+            tf: tuple(spec for spec in group if self._enabled.get(spec.name, True))
+            for tf, group in self._by_timeframe.items()
+        }
+
+    def get(self, name: str) -> Optional[StrategySpec]:
+        self._ensure()
+        return self._specs.get(name)
+
+    def names(self) -> List[str]:
+        self._ensure()
+        return list(self._specs)
+
+    def for_timeframe(self, timeframe: str) -> Tuple[StrategySpec, ...]:
+        """All strategies taking entries on this timeframe"""
+        self._ensure()
+        return self._by_timeframe.get(timeframe, ())
+
+    def enabled_for_timeframe(self, timeframe: str) -> Tuple[StrategySpec, ...]:
+        self._ensure()
+        return self._enabled_by_timeframe.get(timeframe, ())
+
+    def is_enabled(self, name: str) -> bool:
+        self._ensure()
+        return name in self._specs and self._enabled.get(name, True)
+
+    def set_enabled(self, name: str, enabled: bool) -> bool:
+        """Toggle a strategy at runtime - False if it is not registered"""
+        self._ensure()
+        if name not in self._specs:
+            return False
+        self._enabled[name] = enabled
+        self._rebuild_enabled()
+        return True
+
+    def status(self) -> Dict[str, bool]:
+        """{"logic1": True, ...} - lower-case names, registry order"""
+        self._ensure()
+        return {name.lower(): self._enabled.get(name, True) for name in self._specs}
+
+    def check_alignment(self, symbol_trends: Dict[str, Any], name: str) -> Dict[str, Any]:
+        """Aligned when the first (bias) trend is not NEUTRAL and every listed timeframe agrees"""
+        result = {"aligned": False, "direction": "NEUTRAL", "details": {}}
+        spec = self.get(name)
+        if spec is None:
+            return result
+
+        trends = [symbol_trends.get(tf, {}).get("trend", "NEUTRAL") for tf in spec.alignment_tfs]
+        result["details"] = dict(zip(spec.alignment_tfs, trends))
+        bias = trends[0]
+        if bias != "NEUTRAL" and all(trend == bias for trend in trends):
+            result["aligned"] = True
+            result["direction"] = bias
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._ensure()
+        return {
+            "config_version": self._version,
+            "compilations": self.compilations,
+            "strategies": {name: {"entry_tf": spec.entry_tf, "alignment_tfs": list(spec.alignment_tfs),
+                                  "enabled": self._enabled.get(name, True)}
+                           for name, spec in self._specs.items()}
+        }
@@ -0,0 +1,119 @@
+import asyncio
+import math
+import time
+from typing import Dict, Any, NamedTuple, Optional, Tuple
+from config import Config
+
+class SymbolMetadata(NamedTuple):
+    """Broker symbol properties needed to build orders"""
+    broker_symbol: str
+    digits: int
+    point: float
+    volume_min: float
+    volume_max: float
+    volume_step: float
+    stops_level: int                 # minimum SL/TP distance, in points
+    tick_value: float
+    tick_size: float
+    filling_modes: Tuple[int, ...]   # ORDER_FILLING_* supported, preferred first
+    fetched_at: float
+
+    def normalize_volume(self, volume: float) -> Optional[float]:
+        """
+        Round to the broker's volume step and cap at volume_max
+        Returns None below volume_min - the size is never raised above the risk-sized lot
+        """
+        step = self.volume_step or 0.01
+        decimals = max(0, -int(math.floor(math.log10(step)))) if step < 1 else 0
+        steps = round(volume / step)
+        normalized = round(steps * step, decimals)
+        if normalized < self.volume_min:
+            return None
+        return min(normalized, self.volume_max)
+
+    def round_price(self, price: float) -> float:
+        return round(price, self.digits)
+
+
+class SymbolMetadataCache:
+    """
+    Broker symbol metadata, filled at connect for all configured symbols
+    - Order building reads it instead of calling symbol_info / symbol_select
+    - Filling mode: the order path tries the preferred mode first and, on an
+      invalid-fill reject, the next supported one; a mode that works becomes
+      the symbol's preferred mode
+    - Refreshed every refresh_interval_seconds (MT5 calls run on the MT5 thread)
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        metadata_config = config.get("symbol_metadata", {})
+        self.refresh_interval = metadata_config.get("refresh_interval_seconds", 300)
+
+        self._symbols: Dict[str, SymbolMetadata] = {}  # broker symbol -> metadata
+        self._task = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.filling_fallbacks = 0
+
+    def get(self, broker_symbol: str) -> Optional[SymbolMetadata]:
+        metadata = self._symbols.get(broker_symbol)
+        if metadata is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return metadata
+
+    def put(self, metadata: SymbolMetadata):
+        """Store fresh metadata, keeping a filling mode already learned for the symbol"""
+        previous = self._symbols.get(metadata.broker_symbol)
+        if previous is not None and previous.filling_modes[0] in metadata.filling_modes:
+            preferred = previous.filling_modes[0]
+            others = tuple(mode for mode in metadata.filling_modes if mode != preferred)
+            metadata = metadata._replace(filling_modes=(preferred,) + others)
+        self._symbols[metadata.broker_symbol] = metadata
+
+    def prefer_filling(self, broker_symbol: str, filling_mode: int):
+        """Remember the filling mode the broker accepted for this symbol"""
+        metadata = self._symbols.get(broker_symbol)
+        if metadata is None or metadata.filling_modes[:1] == (filling_mode,):
+            return
+        others = tuple(mode for mode in metadata.filling_modes if mode != filling_mode)
+        self._symbols[broker_symbol] = metadata._replace(filling_modes=(filling_mode,) + others)
+        self.filling_fallbacks += 1
+
+    async def start(self, mt5):
+        """Periodic refresh through the AsyncMT5Client facade"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop(mt5))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self, mt5):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await mt5.refresh_symbol_metadata()
+            except Exception as e:
+                print(f"⚠️ Symbol metadata refresh error: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "symbols": len(self._symbols),
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "filling_fallbacks": self.filling_fallbacks,
+            "oldest_age_seconds": round(now - min((m.fetched_at for m in self._symbols.values()), default=now), 1)
+        }
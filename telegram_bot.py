@@ -1,5 +1,6 @@
 import requests
 import json
+import queue
 import threading
 import time
 from typing import Dict, Any, TYPE_CHECKING
@@ -18,6 +19,13 @@ class TelegramBot:
         self.chat_id = config["telegram_chat_id"]
         self.base_url = f"https://api.telegram.org/bot{self.token}"
         
+        # Outgoing messages are posted by a background thread so the trading
+        # loop never waits on the Telegram API (order is preserved)
+        self.async_send = config.get("telegram_async_send", True)
+        self._outbox: "queue.Queue[str]" = queue.Queue()
+        self._sender_thread = None
+        self._sender_lock = threading.Lock()
+        
         self.trend_manager = None
         
         self.command_handlers = {
@@ -84,14 +92,54 @@ class TelegramBot:
         """Set dependent modules"""
         self.risk_manager = risk_manager
         self.trading_engine = trading_engine
+        
+        # /<strategy>_on, /<strategy>_off for registry strategies without a dedicated handler
+        for name in trading_engine.strategies.names():
+            command = f"/{name.lower()}"
+            self.command_handlers.setdefault(f"{command}_on", lambda message, name=name: self.handle_strategy_toggle(name, True))
+            self.command_handlers.setdefault(f"{command}_off", lambda message, name=name: self.handle_strategy_toggle(name, False))
 
     def set_trend_manager(self, trend_manager: TimeframeTrendManager):
         """Set trend manager"""
         self.trend_manager = trend_manager
         print("✅ Trend manager set in Telegram bot")
 
+    def _engine_command(self, fn, *args):
+        """Engine state writes go through the engine's state actor (we run on the polling thread)"""
+        if self.trading_engine:
+            return self.trading_engine.state.call(fn, *args)
+        return fn(*args)
+
     def send_message(self, message: str):
-        """Send message to Telegram"""
+        """Send message to Telegram (queued for the sender thread unless telegram_async_send is off)"""
+        if not self.async_send:
+            return self._post_message(message)
+        
+        if self._sender_thread is None:
+            with self._sender_lock:
+                if self._sender_thread is None:
+                    self._sender_thread = threading.Thread(
+                        target=self._sender_loop, name="telegram-sender", daemon=True
+                    )
+                    self._sender_thread.start()
+        self._outbox.put(message)
+        return True
+
+    def _sender_loop(self):
+        while True:
+            message = self._outbox.get()
+            try:
+                self._post_message(message)
+            finally:
+                self._outbox.task_done()
+
+    def flush_outbox(self, timeout: float = 5.0):
+        """Wait (bounded) for queued messages to be posted - used on shutdown"""
+        deadline = time.time() + timeout
+        while self._outbox.unfinished_tasks and time.time() < deadline:
+            time.sleep(0.05)
+
+    def _post_message(self, message: str):
         try:
             url = f"{self.base_url}/sendMessage"
             payload = {
@@ -191,21 +239,20 @@ class TelegramBot:
         # Check logic alignments
         logic_alignments = {}
         if self.trend_manager:
-            for logic in ["LOGIC1", "LOGIC2", "LOGIC3"]:
+            for logic in self.trading_engine.strategies.names():
                 alignment = self.trend_manager.check_logic_alignment("XAUUSD", logic)
                 logic_alignments[logic] = alignment["direction"]
+        modes = "".join(f"{logic}: {direction}\n" for logic, direction in logic_alignments.items())
         
         status_msg = (
             "📊 <b>Bot Status</b>\n\n"
-            f"🔸 Trading: {'⏸️ PAUSED' if self.trading_engine.is_paused else '✅ ACTIVE'}\n"
+            f"🔸 Trading: {'⏸️ PAUSED' if self.trading_engine.state.snapshot().trading_paused else '✅ ACTIVE'}\n"
             f"🔸 Simulation: {'✅ ON' if self.config['simulate_orders'] else '❌ OFF'}\n"
             f"🔸 MT5: {'✅ Connected' if self.trading_engine.mt5_client.initialized else '❌ Disconnected'}\n"
             f"🔸 Balance: ${stats.get('account_balance', 0):.2f}\n"
             f"🔸 Lot Size: {stats.get('current_lot_size', 0.05)}\n\n"
             "<b>Current Modes (XAUUSD):</b>\n"
-            f"LOGIC1: {logic_alignments.get('LOGIC1', 'NEUTRAL')}\n"
-            f"LOGIC2: {logic_alignments.get('LOGIC2', 'NEUTRAL')}\n"
-            f"LOGIC3: {logic_alignments.get('LOGIC3', 'NEUTRAL')}\n\n"
+            f"{modes}\n"
             "<b>Live Signals (XAUUSD):</b>\n"
             f"5min: {xau_trends.get('5m', 'NA')}\n"
             f"15min: {xau_trends.get('15m', 'NA')}\n"
@@ -242,7 +289,7 @@ class TelegramBot:
                 self.send_message(f"❌ Invalid timeframe. Use: {', '.join(valid_timeframes)}")
                 return
             
-            self.trend_manager.set_auto_trend(symbol, timeframe)
+            self._engine_command(self.trend_manager.set_auto_trend, symbol, timeframe)
             current_trend = self.trend_manager.get_trend(symbol, timeframe)
             current_mode = self.trend_manager.get_mode(symbol, timeframe)
             
@@ -321,7 +368,7 @@ class TelegramBot:
                 self.send_message("❌ Trend must be BULLISH, BEARISH, or NEUTRAL")
                 return
             
-            self.trend_manager.set_manual_trend(symbol, timeframe, trend)
+            self._engine_command(self.trend_manager.set_manual_trend, symbol, timeframe, trend)
             
             # Verify the trend was set
             current_trend = self.trend_manager.get_trend(symbol, timeframe)
@@ -384,7 +431,7 @@ class TelegramBot:
                 msg += f"  {tf}: {emoji} {trend} {mode_icon}\n"
             
             # Show logic alignments
-            for logic in ["LOGIC1", "LOGIC2", "LOGIC3"]:
+            for logic in self.trend_manager.strategies.names():
                 alignment = self.trend_manager.check_logic_alignment(symbol, logic)
                 if alignment["aligned"]:
                     msg += f"  ✅ {logic}: {alignment['direction']}\n"
@@ -398,7 +445,7 @@ class TelegramBot:
     def handle_pause(self, message):
         """Handle /pause command"""
         if self.trading_engine:
-            self.trading_engine.is_paused = True
+            self._engine_command(self.trading_engine.set_paused, True)
             self.send_message("⏸️ <b>Trading PAUSED</b>\nNo new trades will be executed")
         else:
             self.send_message("❌ Trading engine not initialized")
@@ -406,7 +453,7 @@ class TelegramBot:
     def handle_resume(self, message):
         """Handle /resume command"""
         if self.trading_engine:
-            self.trading_engine.is_paused = False
+            self._engine_command(self.trading_engine.set_paused, False)
             self.send_message("✅ <b>Trading RESUMED</b>\nReady to execute new trades")
         else:
             self.send_message("❌ Trading engine not initialized")
@@ -454,22 +501,23 @@ class TelegramBot:
             self.send_message("❌ Trading engine not initialized")
             return
             
-        if not self.trading_engine.open_trades:
+        open_trades = self.trading_engine.state.snapshot().open_trades
+        if not open_trades:
             self.send_message("📭 <b>No Open Trades</b>")
             return
         
         rr_ratio = self.config.get("rr_ratio", 1.0)
         trades_msg = "📊 <b>Open Trades</b>\n\n"
-        for i, trade in enumerate(self.trading_engine.open_trades, 1):
-            if trade.status != "closed":
-                chain_info = f" [RE-{trade.chain_level}]" if trade.is_re_entry else ""
+        for i, trade in enumerate(open_trades, 1):
+            if trade["status"] != "closed":
+                chain_info = f" [RE-{trade['chain_level']}]" if trade["is_re_entry"] else ""
                 trades_msg += (
                     f"<b>Trade #{i}{chain_info}</b>\n"
-                    f"Symbol: {trade.symbol} | {trade.direction.upper()}\n"
-                    f"Strategy: {trade.strategy}\n"
-                    f"Entry: {trade.entry:.5f} | SL: {trade.sl:.5f}\n"
-                    f"TP: {trade.tp:.5f} | RR: 1:{rr_ratio}\n"
-                    f"Lot: {trade.lot_size:.2f}\n"
+                    f"Symbol: {trade['symbol']} | {trade['direction'].upper()}\n"
+                    f"Strategy: {trade['strategy']}\n"
+                    f"Entry: {trade['entry']:.5f} | SL: {trade['sl']:.5f}\n"
+                    f"TP: {trade['tp']:.5f} | RR: 1:{rr_ratio}\n"
+                    f"Lot: {trade['lot_size']:.2f}\n"
                     "────────────────────\n"
                 )
         
@@ -481,7 +529,7 @@ class TelegramBot:
             self.send_message("❌ Trading engine not initialized")
             return
         
-        chains = self.trading_engine.reentry_manager.active_chains
+        chains = self.trading_engine.state.snapshot().chains
         
         if not chains:
             self.send_message("🔗 <b>No Active Re-entry Chains</b>")
@@ -490,10 +538,10 @@ class TelegramBot:
         msg = "🔗 <b>Active Re-entry Chains</b>\n\n"
         for chain_id, chain in chains.items():
             msg += (
-                f"<b>{chain.symbol} - {chain.direction.upper()}</b>\n"
-                f"Level: {chain.current_level}/{chain.max_level}\n"
-                f"Total Profit: ${chain.total_profit:.2f}\n"
-                f"Status: {chain.status}\n"
+                f"<b>{chain['symbol']} - {chain['direction'].upper()}</b>\n"
+                f"Level: {chain['current_level']}/{chain['max_level']}\n"
+                f"Total Profit: ${chain['total_profit']:.2f}\n"
+                f"Status: {chain['status']}\n"
                 "────────────────────\n"
             )
         
@@ -502,32 +550,32 @@ class TelegramBot:
     # Logic control handlers
     def handle_logic1_on(self, message):
         if self.trading_engine:
-            self.trading_engine.enable_logic(1)
+            self._engine_command(self.trading_engine.enable_logic, 1)
             self.send_message("✅ LOGIC 1 TRADING ENABLED")
 
     def handle_logic1_off(self, message):
         if self.trading_engine:
-            self.trading_engine.disable_logic(1)
+            self._engine_command(self.trading_engine.disable_logic, 1)
             self.send_message("⛔ LOGIC 1 TRADING DISABLED")
 
     def handle_logic2_on(self, message):
         if self.trading_engine:
-            self.trading_engine.enable_logic(2)
+            self._engine_command(self.trading_engine.enable_logic, 2)
             self.send_message("✅ LOGIC 2 TRADING ENABLED")
 
     def handle_logic2_off(self, message):
         if self.trading_engine:
-            self.trading_engine.disable_logic(2)
+            self._engine_command(self.trading_engine.disable_logic, 2)
             self.send_message("⛔ LOGIC 2 TRADING DISABLED")
 
     def handle_logic3_on(self, message):
         if self.trading_engine:
-            self.trading_engine.enable_logic(3)
+            self._engine_command(self.trading_engine.enable_logic, 3)
             self.send_message("✅ LOGIC 3 TRADING ENABLED")
 
     def handle_logic3_off(self, message):
         if self.trading_engine:
-            self.trading_engine.disable_logic(3)
+            self._engine_command(self.trading_engine.disable_logic, 3)
             self.send_message("⛔ LOGIC 3 TRADING DISABLED")
 
     def handle_logic_status(self, message):
@@ -535,23 +583,30 @@ class TelegramBot:
             self.send_message("❌ Trading engine not initialized")
             return
             
-        status = self.trading_engine.get_logic_status()
-        status_msg = (
-            "🤖 <b>LOGIC STATUS:</b>\n\n"
-            f"LOGIC 1 (1H+15M→5M): {'✅ ENABLED' if status['logic1'] else '❌ DISABLED'}\n"
-            f"LOGIC 2 (1H+15M→15M): {'✅ ENABLED' if status['logic2'] else '❌ DISABLED'}\n"
-            f"LOGIC 3 (1D+1H→1H): {'✅ ENABLED' if status['logic3'] else '❌ DISABLED'}\n\n"
-            "Use /logic1_on, /logic1_off, etc. to control"
-        )
+        strategies = self.trading_engine.strategies
+        status_msg = "🤖 <b>LOGIC STATUS:</b>\n\n"
+        for name in strategies.names():
+            spec = strategies.get(name)
+            status_msg += f"{name} ({spec.label}): {'✅ ENABLED' if strategies.is_enabled(name) else '❌ DISABLED'}\n"
+        commands = ", ".join(f"/{name.lower()}_on, /{name.lower()}_off" for name in strategies.names())
+        status_msg += f"\nUse {commands} to control"
         self.send_message(status_msg)
 
+    def handle_strategy_toggle(self, name: str, enabled: bool):
+        if self.trading_engine:
+            self._engine_command(self.trading_engine.enable_logic if enabled else self.trading_engine.disable_logic, name)
+            self.send_message(f"✅ {name} TRADING ENABLED" if enabled else f"⛔ {name} TRADING DISABLED")
+
     def handle_lot_size_status(self, message):
         """Show current lot size settings"""
         if not self.risk_manager or not self.risk_manager.mt5_client:
             self.send_message("❌ Risk manager not initialized")
             return
         
-        balance = self.risk_manager.mt5_client.get_account_balance()
+        balance = self.risk_manager.get_account_balance()
+        if balance is None:
+            self.send_message("❌ Account balance not loaded yet")
+            return
         current_lot = self.risk_manager.get_fixed_lot_size(balance)
         tier = self.risk_manager.get_risk_tier(balance)
         
@@ -640,10 +695,11 @@ class TelegramBot:
         msg = "📡 <b>Current Signal Status</b>\n\n"
         
         symbols = ["XAUUSD", "EURUSD", "GBPUSD", "USDJPY", "USDCAD"]
+        current_signals = self.trading_engine.state.snapshot().current_signals
         
         for symbol in symbols:
-            if symbol in self.trading_engine.current_signals:
-                signals = self.trading_engine.current_signals[symbol]
+            if symbol in current_signals:
+                signals = current_signals[symbol]
                 msg += f"<b>{symbol}:</b>\n"
                 msg += f"  5m: {signals.get('5m', 'NA')}\n"
                 msg += f"  15m: {signals.get('15m', 'NA')}\n"
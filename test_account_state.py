@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the account state cache
+Hot reads hit the cache; a fill or close forces the next read to refetch
+"""
+
+import asyncio
+from config import Config
+from mt5_client import MT5Client
+from mt5_executor import AsyncMT5Client
+from account_state import AccountStateCache
+
+def make_cache():
+    config = Config()
+    config.config["simulate_orders"] = True
+    config.config["account_cache"] = {"enabled": True, "refresh_interval_seconds": 60, "max_age_seconds": 60}
+    client = MT5Client(config)
+    client.initialized = True
+    fetches = []
+    balances = iter([10000.0, 10250.0, 10500.0])
+
+    def get_account_info():
+        fetches.append(1)
+        balance = next(balances)
+        return {"balance": balance, "equity": balance, "margin": 0.0, "free_margin": balance}
+    client.get_account_info = get_account_info
+
+    mt5 = AsyncMT5Client(client, client.executor)
+    cache = AccountStateCache(config, mt5)
+    mt5.add_trade_listener(cache.invalidate)
+    return cache, mt5, fetches
+
+def test_reads_cached_until_invalidated():
+    cache, mt5, fetches = make_cache()
+
+    async def main():
+        assert await cache.get_balance() == 10000.0
+        assert await cache.get_balance() == 10000.0
+        assert cache.get_balance_sync() == 10000.0
+        assert len(fetches) == 1
+
+        # A close invalidates; concurrent readers share one refetch
+        mt5._notify("close", 123)
+        assert cache.get_stats()["stale"]
+        balances = await asyncio.gather(*(cache.get_balance() for _ in range(5)))
+        assert balances == [10250.0] * 5
+        assert len(fetches) == 2
+        assert not cache.get_stats()["stale"]
+
+    asyncio.run(main())
+    cache.mt5.executor.stop()
+    print("✅ PASS - Cached until invalidated")
+
+def test_failed_refresh_keeps_last_state():
+    cache, mt5, fetches = make_cache()
+
+    async def main():
+        await cache.get_balance()
+        mt5.client.get_account_info = lambda: None
+        cache.invalidate()
+        assert await cache.get_balance() == 10000.0
+        assert cache.get_stats()["failures"] == 1
+
+    asyncio.run(main())
+    cache.mt5.executor.stop()
+    print("✅ PASS - Failed refresh keeps last state")
+
+def test_unknown_balance_is_not_zero():
+    cache, mt5, fetches = make_cache()
+    mt5.client.get_account_info = lambda: None
+
+    async def main():
+        # Never loaded: None (callers reject), not a zero balance to size on
+        assert await cache.get_balance() is None
+        assert cache.get_balance_sync() is None
+
+    asyncio.run(main())
+    cache.mt5.executor.stop()
+    assert cache.get_stats()["failures"] == 1
+    print("✅ PASS - Unknown balance is not zero")
+
+if __name__ == "__main__":
+    test_reads_cached_until_invalidated()
+    test_failed_refresh_keeps_last_state()
+    test_unknown_balance_is_not_zero()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for AlertProcessor validation and duplicate detection
+Covers the precompiled rule tables and the hash-indexed dedup window
+"""
+
+import os
+import tempfile
+import time
+from datetime import timedelta
+from config import Config
+from alert_processor import AlertProcessor
+from idempotency_store import IdempotencyStore
+from models import Alert
+
+def make_alert(**overrides):
+    data = {"type": "entry", "symbol": "EURUSD", "signal": "buy", "tf": "5m", "price": 1.0850}
+    data.update(overrides)
+    return data
+
+def test_validation_rules():
+    """Valid alerts return an Alert, invalid fields return None"""
+    processor = AlertProcessor(Config())
+    
+    alert = processor.validate_alert(make_alert(price="1.0850"))
+    assert isinstance(alert, Alert)
+    assert alert.price == 1.0850
+    assert alert.raw_data["symbol"] == "EURUSD"
+    
+    assert processor.validate_alert(make_alert(signal="bull")) is None      # wrong signal for entry
+    assert processor.validate_alert(make_alert(symbol="BTCUSD")) is None    # unknown symbol
+    assert processor.validate_alert(make_alert(tf="4h")) is None            # unknown timeframe
+    assert processor.validate_alert(make_alert(type="signal")) is None      # unknown type
+    assert processor.validate_alert(make_alert(price="abc")) is None        # bad price
+    assert processor.validate_alert(["not", "a", "dict"]) is None
+    print("✅ PASS - Validation rules")
+
+def test_duplicate_window():
+    """Same type/symbol/tf/signal is rejected inside the window, accepted after it"""
+    processor = AlertProcessor(Config())
+    processor.alert_window = timedelta(seconds=0.2)
+    
+    assert processor.validate_alert(make_alert()) is not None
+    assert processor.validate_alert(make_alert()) is None                   # duplicate
+    assert processor.validate_alert(make_alert(signal="sell")) is not None  # different key
+    assert processor.validate_alert(make_alert(symbol="XAUUSD")) is not None
+    
+    time.sleep(0.25)
+    assert processor.validate_alert(make_alert()) is not None               # window expired
+    print("✅ PASS - Duplicate window")
+
+def test_expiry_cleans_index():
+    """Expired keys are dropped from the dedup index"""
+    processor = AlertProcessor(Config())
+    processor.alert_window = timedelta(seconds=0.1)
+    
+    for symbol in ["EURUSD", "GBPUSD", "USDJPY"]:
+        processor.validate_alert(make_alert(symbol=symbol))
+    assert len(processor._dedup_index) == 3
+    
+    time.sleep(0.15)
+    processor.clean_old_alerts()
+    assert len(processor._dedup_index) == 0
+    assert len(processor._expiry_log) == 0
+    print("✅ PASS - Expiry cleans index")
+
+def test_recent_alerts_filters():
+    """get_recent_alerts serves type/symbol/tf filters from ring buffers"""
+    processor = AlertProcessor(Config())
+    processor.validate_alert(make_alert())
+    processor.validate_alert(make_alert(type="trend", signal="bull", tf="15m"))
+    processor.validate_alert(make_alert(symbol="XAUUSD", type="trend", signal="bear", tf="1h"))
+    
+    assert len(processor.get_recent_alerts()) == 3
+    assert len(processor.get_recent_alerts(symbol="EURUSD")) == 2
+    assert len(processor.get_recent_alerts(alert_type="trend")) == 2
+    assert len(processor.get_recent_alerts(alert_type="trend", symbol="EURUSD")) == 1
+    assert len(processor.get_recent_alerts(tf="1h")) == 1
+    assert processor.get_recent_alerts(symbol="GBPUSD") == []
+    print("✅ PASS - Recent alert filters")
+
+def test_idempotency_survives_restart():
+    """A delivery key accepted before a restart is still rejected after it"""
+    config = Config()
+    db_path = os.path.join(tempfile.mkdtemp(), "idempotency.db")
+    config.config["idempotency"] = {"enabled": True, "ttl_seconds": 60, "db_path": db_path}
+    
+    store = IdempotencyStore(config)
+    processor = AlertProcessor(config, store)
+    first = processor.validate_alert(make_alert(bar_time="2025-10-10T10:05:00Z"))
+    assert first is not None and first.idempotency_key.startswith("h:")
+    store.close()
+    
+    # Fresh process: in-memory dedup window is empty, SQLite still has the key
+    restarted_store = IdempotencyStore(config)
+    restarted = AlertProcessor(config, restarted_store)
+    assert restarted.validate_alert(make_alert(bar_time="2025-10-10T10:05:00Z")) is None
+    assert restarted_store.hits_db == 1
+    
+    # Next bar is a new delivery; client ids take precedence over content hash
+    assert restarted.validate_alert(make_alert(signal="sell", bar_time="2025-10-10T10:10:00Z")) is not None
+    assert restarted_store.make_key({"id": "tv-123", **make_alert()}) == "id:tv-123"
+    restarted_store.close()
+    print("✅ PASS - Idempotency survives restart")
+
+def test_released_alert_accepted_on_retry():
+    """A delivery refused after validation (queue saturated) is accepted when retried"""
+    config = Config()
+    db_path = os.path.join(tempfile.mkdtemp(), "idempotency.db")
+    config.config["idempotency"] = {"enabled": True, "ttl_seconds": 60, "db_path": db_path}
+    
+    store = IdempotencyStore(config)
+    processor = AlertProcessor(config, store)
+    refused = processor.validate_alert(make_alert(bar_time="2025-10-10T10:05:00Z"))
+    assert refused is not None
+    processor.release_alert(refused)
+    
+    retry = processor.validate_alert(make_alert(bar_time="2025-10-10T10:05:00Z"))
+    assert retry is not None and retry.idempotency_key == refused.idempotency_key
+    assert processor.validate_alert(make_alert(bar_time="2025-10-10T10:05:00Z")) is None
+    store.close()
+    print("✅ PASS - Released alert accepted on retry")
+
+def test_replay_keeps_live_decisions():
+    """--speed 0 replay dedups on journaled receive times, not the replay's wall clock"""
+    import asyncio
+    import json
+    from replay_journal import replay
+    
+    journal_dir = tempfile.mkdtemp()
+    start = 1760000000.0
+    # Three bias alerts 10 minutes apart (live: all accepted), then a repeat 1 minute later (live: duplicate)
+    offsets = [0, 600, 1200, 1260]
+    with open(os.path.join(journal_dir, "alerts-0001.jsonl"), "w", encoding="utf-8") as f:
+        for seq, offset in enumerate(offsets):
+            payload = make_alert(type="bias", signal="bull", tf="1h")
+            f.write(json.dumps({"kind": "recv", "seq": seq, "ts": start + offset, "payload": payload}) + "\n")
+    
+    cwd = os.getcwd()
+    try:
+        summary = asyncio.run(replay(journal_dir, 0, tempfile.mkdtemp(), use_queue=False,
+                                     verbose=False, seed_trends=False))
+    finally:
+        os.chdir(cwd)
+    assert (summary["accepted"], summary["rejected"]) == (3, 1)
+    print("✅ PASS - Replay keeps live decisions")
+
+def test_frontend_built_alert_accepted_once():
+    """Alert built in a front-end process survives pickling; engine-side dedup rejects the repeat"""
+    import pickle
+    frontend = AlertProcessor(Config())
+    engine = AlertProcessor(Config())
+    
+    built = frontend.build_alert(make_alert())
+    assert frontend.build_alert(make_alert(symbol="BTCUSD")) is None
+    
+    received = pickle.loads(pickle.dumps(built))
+    assert received.symbol == "EURUSD" and received.raw_data["price"] == 1.0850
+    assert engine.accept_alert(received) is received
+    assert engine.accept_alert(pickle.loads(pickle.dumps(built))) is None
+    print("✅ PASS - Front-end built alert accepted once")
+
+if __name__ == "__main__":
+    test_validation_rules()
+    test_duplicate_window()
+    test_expiry_cleans_index()
+    test_recent_alerts_filters()
+    test_idempotency_survives_restart()
+    test_released_alert_accepted_on_retry()
+    test_replay_keeps_live_decisions()
+    test_frontend_built_alert_accepted_once()
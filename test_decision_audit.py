@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the decision audit log
+Buffered rows are bulk-inserted and aggregated by reject reason
+"""
+
+import pytest
+from decision_audit import DecisionAuditLog
+from models import Alert
+
+def make_audit(config, tmp_path):
+    config.config["decision_audit"] = {
+        "enabled": True,
+        "db_path": str(tmp_path / "decision_audit.db")
+    }
+    return DecisionAuditLog(config)
+
+def test_buffered_until_flush(config, tmp_path):
+    """record() only buffers; flush() writes all rows in one go"""
+    audit = make_audit(config, tmp_path)
+    alert = Alert(type="entry", symbol="EURUSD", signal="buy", tf="5m", price=1.085)
+    
+    audit.record(alert, "executed", "order", logic="LOGIC1", sl=1.083, tp=1.088, lot_size=0.1, trade_id=42)
+    audit.record({"type": "entry", "symbol": "BTCUSD"}, "rejected", "validation", "invalid_symbol")
+    assert audit.get_stats()["buffered"] == 2
+    assert audit.conn.execute("SELECT COUNT(*) FROM decision_audit").fetchone()[0] == 0
+    
+    audit.flush()
+    assert audit.get_stats()["buffered"] == 0
+    row = audit.conn.execute(
+        "SELECT symbol, entry, sl, tp, trade_id FROM decision_audit WHERE decision = 'executed'"
+    ).fetchone()
+    assert row == ("EURUSD", 1.085, 1.083, 1.088, "42")
+    audit.close()
+    print("✅ PASS - Buffered until flush")
+
+def test_report_groups_reject_reasons(config, tmp_path):
+    """Report counts rejects per symbol/logic/reason, most frequent first"""
+    audit = make_audit(config, tmp_path)
+    alert = Alert(type="entry", symbol="GBPUSD", signal="sell", tf="15m", price=1.27)
+    alignment = {"aligned": False, "direction": "NEUTRAL", "details": {"1h": "BULLISH", "15m": "BEARISH"}}
+    
+    for _ in range(3):
+        audit.record(alert, "rejected", "alignment", "trend_not_aligned", logic="LOGIC2", alignment=alignment)
+    audit.record(alert, "rejected", "risk", "risk_limits")
+    audit.record(alert, "executed", "order", logic="LOGIC2")
+    
+    report = audit.report(since_hours=1)
+    assert report["totals"] == {"rejected": 4, "executed": 1}
+    assert report["reject_reasons"] == {"trend_not_aligned": 3, "risk_limits": 1}
+    top = report["rejects"][0]
+    assert (top["symbol"], top["logic"], top["reason"], top["count"]) == ("GBPUSD", "LOGIC2", "trend_not_aligned", 3)
+    
+    assert audit.report(since_hours=1, symbol="EURUSD")["totals"] == {}
+    audit.close()
+    print("✅ PASS - Report groups reject reasons")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
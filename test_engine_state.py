@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the engine state actor
+Commands apply one at a time in arrival order; readers get immutable snapshots
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+from config import Config
+from engine_state import EngineStateActor, thaw
+from trend_coalescer import TrendUpdateCoalescer
+
+class FakeEngine:
+    """Just the state the actor snapshots"""
+
+    def __init__(self):
+        self.open_trades = []
+        self.reentry_manager = SimpleNamespace(active_chains={})
+        self.price_monitor = SimpleNamespace(sl_hunt_pending={}, tp_continuation_pending={},
+                                             exit_continuation_pending={})
+        self.trend_manager = SimpleNamespace(trends={"symbols": {"EURUSD": {"1h": {"trend": "BULLISH"}}}})
+        self.current_signals = {}
+        self.is_paused = False
+        self.trade_count = 0
+
+    def get_logic_status(self):
+        return {"logic1": True, "logic2": True, "logic3": True}
+
+    def set_paused(self, paused):
+        self.is_paused = paused
+
+    def apply_signals(self, alerts):
+        for alert in alerts:
+            self.current_signals.setdefault(alert.symbol, {})[alert.tf] = alert.signal
+
+    def add_signal(self, symbol, tf, signal):
+        self.current_signals.setdefault(symbol, {})[tf] = signal
+        self.trade_count += 1
+        return self.trade_count
+
+def make_actor():
+    engine = FakeEngine()
+    return EngineStateActor(Config(), engine), engine
+
+def test_inline_before_start():
+    actor, engine = make_actor()
+    assert actor.call(engine.set_paused, True) is None
+    assert engine.is_paused
+    assert actor.snapshot().trading_paused
+    print("✅ PASS - Inline before start")
+
+def test_commands_applied_in_order():
+    actor, engine = make_actor()
+
+    async def main():
+        await actor.start()
+        results = await asyncio.gather(*(actor.execute(engine.add_signal, "EURUSD", "5m", f"s{i}")
+                                         for i in range(20)))
+        assert results == list(range(1, 21))
+        assert engine.current_signals["EURUSD"]["5m"] == "s19"
+        await actor.stop()
+
+    asyncio.run(main())
+    snapshot = actor.snapshot()
+    assert snapshot.trade_count == 20
+    assert snapshot.current_signals["EURUSD"]["5m"] == "s19"
+    print("✅ PASS - Commands applied in order")
+
+def test_snapshot_is_immutable():
+    actor, engine = make_actor()
+    snapshot = actor.snapshot()
+    try:
+        snapshot.trends["EURUSD"]["1h"]["trend"] = "BEARISH"
+        assert False, "snapshot should be read-only"
+    except TypeError:
+        pass
+
+    # Later writes do not leak into an already published snapshot
+    actor.call(engine.add_signal, "GBPUSD", "1h", "bull")
+    assert "GBPUSD" not in snapshot.current_signals
+    assert thaw(actor.snapshot().current_signals) == {"GBPUSD": {"1h": "bull"}}
+    print("✅ PASS - Snapshot is immutable")
+
+def test_call_from_other_thread():
+    actor, engine = make_actor()
+    results = []
+
+    async def main():
+        await actor.start()
+        worker = threading.Thread(target=lambda: results.append(actor.call(engine.set_paused, True)))
+        worker.start()
+        await asyncio.to_thread(worker.join)
+        await asyncio.sleep(actor.publish_interval * 2)
+        assert actor.snapshot().trading_paused
+        await actor.stop()
+
+    asyncio.run(main())
+    assert results == [None]
+    assert actor.get_stats()["commands_applied"] == 1
+    print("✅ PASS - Call from other thread")
+
+def test_coalesced_trends_applied_by_actor():
+    actor, engine = make_actor()
+    engine.state = actor
+    engine.telegram_bot = SimpleNamespace(send_message=lambda message: True)
+    coalescer = TrendUpdateCoalescer(Config(), engine)
+    coalescer.window_seconds = 60  # flushed explicitly below
+
+    async def main():
+        await actor.start()
+        for signal in ("bull", "bear"):
+            coalescer.submit(SimpleNamespace(type="trend", symbol="EURUSD", tf="1h", signal=signal))
+        await coalescer.flush("EURUSD")
+        assert engine.current_signals["EURUSD"]["1h"] == "bear"
+        await actor.stop()
+
+    asyncio.run(main())
+    assert actor.get_stats()["commands_applied"] == 1
+    assert thaw(actor.snapshot().current_signals) == {"EURUSD": {"1h": "bear"}}
+    print("✅ PASS - Coalesced trends applied by the actor")
+
+if __name__ == "__main__":
+    test_inline_before_start()
+    test_commands_applied_in_order()
+    test_snapshot_is_immutable()
+    test_call_from_other_thread()
+    test_coalesced_trends_applied_by_actor()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the MT5 executor thread
+All calls run on one thread in order; timed-out queued calls never run
+"""
+
+import asyncio
+import threading
+import time
+from config import Config
+from mt5_executor import MT5Executor, MT5CallTimeout
+
+def make_executor(call_timeout: float = 10):
+    config = Config()
+    config.config["mt5_executor"] = {"call_timeout_seconds": call_timeout}
+    return MT5Executor(config)
+
+def test_calls_run_in_order_on_one_thread():
+    """Async and sync callers share the single worker thread, FIFO"""
+    executor = make_executor()
+    seen = []
+
+    def call(i):
+        seen.append((i, threading.current_thread().name))
+        return i * 2
+
+    async def main():
+        results = await asyncio.gather(*(executor.run(call, i) for i in range(5)))
+        return results + [await asyncio.to_thread(executor.run_sync, call, 5)]
+
+    assert asyncio.run(main()) == [0, 2, 4, 6, 8, 10]
+    assert [i for i, _ in seen] == list(range(6))
+    assert {name for _, name in seen} == {"mt5-executor"}
+
+    # Nested call from the worker thread runs inline instead of deadlocking
+    assert executor.run_sync(lambda: executor.run_sync(call, 6)) == 12
+
+    stats = executor.get_stats()
+    assert stats["completed"] == 7 and stats["errors"] == 0
+    assert stats["queue_wait_ms"]["p50"] is not None
+    executor.stop()
+    print("✅ PASS - Calls serialized on one thread")
+
+def test_timeout_drops_queued_call():
+    """A call still queued when its caller times out is skipped; a running one is reported late"""
+    executor = make_executor(call_timeout=0.05)
+    ran = []
+
+    def slow():
+        time.sleep(0.2)
+        ran.append("slow")
+        return "filled"
+
+    async def main():
+        slow_call = asyncio.ensure_future(executor.run(slow))
+        queued_call = asyncio.ensure_future(executor.run(ran.append, "queued"))
+        for call in (slow_call, queued_call):
+            try:
+                await call
+                assert False, "expected a timeout"
+            except MT5CallTimeout:
+                pass
+
+    asyncio.run(main())
+    executor.stop()
+    assert ran == ["slow"]
+    stats = executor.get_stats()
+    assert stats["timeouts"] == 2
+    assert stats["cancelled"] == 1
+    assert stats["late_completions"] == 1
+    print("✅ PASS - Timed-out queued call dropped")
+
+def test_errors_propagate():
+    executor = make_executor()
+    try:
+        executor.run_sync(lambda: 1 / 0)
+        assert False, "expected ZeroDivisionError"
+    except ZeroDivisionError:
+        pass
+    assert executor.get_stats()["errors"] == 1
+    executor.stop()
+    print("✅ PASS - Errors propagate to the caller")
+
+if __name__ == "__main__":
+    test_calls_run_in_order_on_one_thread()
+    test_timeout_drops_queued_call()
+    test_errors_propagate()
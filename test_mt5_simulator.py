@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the simulated MT5 backend
+MT5Client runs its real order path against SimulatedMT5: fills, server-side
+SL/TP, account accounting and broker rejects
+"""
+
+import pytest
+from mt5_client import MT5Client
+from mt5_simulator import SimulatedMT5
+
+def use_simulator(config, **simulator):
+    config.config["simulate_orders"] = False
+    config.config["broker_backend"] = {"type": "simulator", "simulator": dict(
+        {"tick_source": "manual", "latency_ms": 0, "latency_jitter_ms": 0, "slippage_points": 0,
+         "balance": 10000.0, "leverage": 100, "seed": 7}, **simulator)}
+    return config
+
+def make_client(config, **simulator):
+    client = MT5Client(use_simulator(config, **simulator))
+    assert isinstance(client.mt5, SimulatedMT5)
+    assert client.initialize()
+    return client, client.mt5
+
+def test_order_path_and_server_side_tp(config):
+    client, sim = make_client(config, commission_per_lot=7.0)
+    try:
+        assert client.symbol_cache.get("GOLD").digits == 2  # XAUUSD mapped, metadata from the simulator
+        sim.feed_tick("EURUSD", 1.08500, 1.08510)
+
+        ticket = client.place_order("EURUSD", "buy", 0.1, 1.085, 1.0800, 1.0900)
+        position = sim.positions_get(ticket=ticket)[0]
+        assert position.price_open == 1.08510 and position.volume == 0.1
+
+        account = sim.account_info()
+        assert account.margin == round(0.1 * 100000 * 1.08510 / 100, 2)
+        assert account.equity == round(10000 - 0.7 - 1.0, 2)  # commission + spread
+
+        # Price jumps through TP: closed by the server at the tick price
+        sim.feed_tick("EURUSD", 1.09020, 1.09030)
+        assert sim.positions_get() == ()
+        deals = sim.history_deals_get(position=ticket)
+        assert [d.reason for d in deals] == [sim.DEAL_REASON_EXPERT, sim.DEAL_REASON_TP]
+        assert deals[-1].price == 1.09020 and deals[-1].profit == 51.0
+        assert sim.account_info().balance == round(10000 + 51.0 - 1.4, 2)
+
+        # Closing a position the server already closed is not an error
+        assert client.close_position(ticket)
+    finally:
+        client.executor.stop()
+    print("✅ PASS - Order path and server-side TP")
+
+def test_partial_close_sl_and_jpy_accounting(config):
+    client, sim = make_client(config)
+    try:
+        sim.feed_tick("USDJPY", 150.000, 150.020)
+        ticket = client.place_order("USDJPY", "sell", 0.2, 150.0, 150.500, 149.000)
+        assert client.close_position(ticket, volume=0.1)
+        assert sim.positions_get(ticket=ticket)[0].volume == 0.1
+
+        sim.feed_tick("USDJPY", 150.480, 150.500)  # ask touches SL
+        assert sim.positions_get() == ()
+        sl_deal = sim.history_deals_get(position=ticket)[-1]
+        assert sl_deal.reason == sim.DEAL_REASON_SL
+        # 0.1 lot * 100000 * -0.5 JPY, converted at USDJPY
+        assert sl_deal.profit == round(-0.5 * 0.1 * 100000 / 150.49, 2)
+        assert sim.get_stats()["stopouts"] == {"sl": 1, "tp": 0}
+    finally:
+        client.executor.stop()
+    print("✅ PASS - Partial close, SL and JPY accounting")
+
+def test_broker_rejects(config):
+    client, sim = make_client(config, symbols={"GBPUSD": {"filling_mode": 1}}, balance=100.0)
+    try:
+        sim.feed_tick("EURUSD", 1.08500, 1.08510)
+        request = {"action": sim.TRADE_ACTION_DEAL, "symbol": "EURUSD", "volume": 0.1,
+                   "type": sim.ORDER_TYPE_BUY, "price": 1.08300, "deviation": 20,
+                   "type_filling": sim.ORDER_FILLING_IOC}
+        assert sim.order_send(request).retcode == sim.TRADE_RETCODE_REQUOTE
+        assert sim.order_send(dict(request, price=1.08510, sl=1.0860)).retcode == sim.TRADE_RETCODE_INVALID_STOPS
+        assert sim.order_send(dict(request, price=1.08510, volume=0.015)).retcode == sim.TRADE_RETCODE_INVALID_VOLUME
+        assert sim.order_send(dict(request, price=1.08510, volume=5.0)).retcode == sim.TRADE_RETCODE_NO_MONEY
+
+        # FOK-only symbol: the client's IOC attempt is rejected, FOK fills and is remembered
+        assert client.place_order("GBPUSD", "buy", 0.01, 1.265, 1.2600, 1.2700)
+        assert client.symbol_cache.get("GBPUSD").filling_modes[0] == sim.ORDER_FILLING_FOK
+
+        sim.set_connected(False)
+        assert sim.order_send(request) is None and sim.last_error()[0] == sim.RES_E_NO_IPC
+        assert sim.positions_get() is None
+    finally:
+        client.executor.stop()
+    print("✅ PASS - Broker rejects")
+
+def test_synthetic_and_replayed_ticks(config, tmp_path):
+    now = [1000.0]
+    use_simulator(config, tick_source="synthetic", tick_interval_ms=100, seed=3)
+    walks = []
+    for _ in range(2):
+        now[0] = 1000.0
+        sim = SimulatedMT5(config, clock=lambda: now[0])
+        sim.initialize()
+        prices = []
+        for _ in range(5):
+            now[0] += 0.25
+            tick = sim.symbol_info_tick("EURUSD")
+            assert round(tick.ask - tick.bid, 5) == 0.00015
+            prices.append(tick.bid)
+        walks.append(prices)
+    assert walks[0] == walks[1] and len(set(walks[0])) > 1  # seeded, moving
+
+    path = str(tmp_path / "ticks.csv")
+    with open(path, "w") as f:
+        f.write("symbol,time_msc,bid,ask\nEURUSD,5000,1.1000,1.1001\nEURUSD,6000,1.1010,1.1011\n")
+    now[0] = 1000.0
+    sim = SimulatedMT5(use_simulator(config, tick_source="replay", tick_file=path, replay_speed=2.0),
+                       clock=lambda: now[0])
+    sim.initialize()
+    assert sim.symbol_info_tick("EURUSD").bid == 1.1000
+    now[0] += 0.4
+    assert sim.symbol_info_tick("EURUSD").bid == 1.1000
+    now[0] += 0.1  # 1s of tick time at 2x
+    tick = sim.symbol_info_tick("EURUSD")
+    assert (tick.bid, tick.time_msc) == (1.1010, 6000)
+    print("✅ PASS - Synthetic and replayed ticks")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
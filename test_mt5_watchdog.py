@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the MT5 connection watchdog
+A lost terminal is detected by heartbeat and reconnected in the background;
+orders fail fast or wait for the reconnect, never blocking on mt5_wait sleeps
+"""
+
+import asyncio
+import threading
+import time
+from config import Config
+from mt5_client import MT5Client
+from mt5_executor import AsyncMT5Client
+
+def make_client(on_disconnect: str):
+    config = Config()
+    config.config["simulate_orders"] = False
+    config.config["mt5_wait"] = 5  # a blocking initialize() would be obvious
+    config.config["mt5_watchdog"] = {"enabled": True, "heartbeat_interval_seconds": 0.01, "missed_heartbeats": 1,
+                                     "reconnect_initial_seconds": 0.01, "reconnect_max_seconds": 0.04,
+                                     "on_disconnect": on_disconnect, "queue_timeout_seconds": 2}
+    config.config["broker_backend"] = {"type": "simulator", "simulator": {
+        "tick_source": "manual", "latency_ms": 0, "latency_jitter_ms": 0, "slippage_points": 0}}
+    client = MT5Client(config)
+    assert client.initialize()
+    return client, client.mt5, AsyncMT5Client(client, client.executor)
+
+async def wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+async def run_watched(watchdog, scenario):
+    try:
+        await scenario
+    finally:
+        await watchdog.stop()
+
+ORDER = dict(symbol="EURUSD", order_type="buy", lot_size=0.01, price=1.085, sl=1.08, tp=1.09)
+
+def test_disconnect_fail_fast_and_reconnect():
+    client, sim, mt5 = make_client("fail_fast")
+    watchdog = client.watchdog
+    states = []
+    watchdog.add_listener(states.append)
+
+    async def main():
+        await watchdog.start(mt5)
+        sim.set_connected(False)
+        await wait_for(lambda: watchdog.state == "disconnected")
+        assert not client.initialized
+
+        started = time.monotonic()
+        assert await mt5.place_order(**ORDER) is None
+        assert await mt5.get_account_info() is None  # no blocking lazy initialize
+        assert time.monotonic() - started < 1
+        assert sim.orders_sent == 0
+
+        await wait_for(lambda: watchdog.next_retry_seconds == 0.04)  # 0.01, 0.02, 0.04 - capped
+        assert watchdog.reconnect_attempts >= 3
+        sim.set_connected(True)
+        await wait_for(lambda: watchdog.connected)
+        assert client.initialized and await mt5.place_order(**ORDER)
+
+    try:
+        asyncio.run(run_watched(watchdog, main()))
+    finally:
+        client.executor.stop()
+    stats = watchdog.get_stats()
+    assert states == ["disconnected", "connected"]
+    assert stats["disconnects"] == 1 and stats["orders_rejected"] == 1
+    print("✅ PASS - Disconnect fail fast and reconnect")
+
+def test_orders_queue_until_reconnect():
+    client, sim, mt5 = make_client("queue")
+    watchdog = client.watchdog
+
+    async def main():
+        await watchdog.start(mt5)
+        sim.set_connected(False)
+        await wait_for(lambda: watchdog.state == "disconnected")
+
+        order = asyncio.create_task(mt5.place_order(**ORDER))
+        await asyncio.sleep(0.05)
+        assert not order.done()
+        sim.set_connected(True)
+        assert await asyncio.wait_for(order, 2)
+
+    try:
+        asyncio.run(run_watched(watchdog, main()))
+    finally:
+        client.executor.stop()
+    assert watchdog.get_stats()["orders_queued"] == 1 and sim.orders_sent == 1
+    print("✅ PASS - Orders queue until reconnect")
+
+def test_hung_terminal_detected():
+    client, sim, mt5 = make_client("fail_fast")
+    watchdog = client.watchdog
+    watchdog.missed_heartbeat_timeouts = 2
+    client.executor.call_timeout = 0.05
+    heartbeat = client.heartbeat
+    released = threading.Event()
+
+    def hung_heartbeat():
+        # terminal_info never returns - the MT5 thread is stuck in this call
+        released.wait(5)
+        return heartbeat()
+
+    async def main():
+        await watchdog.start(mt5)
+        await wait_for(lambda: watchdog.heartbeats > 0)
+        client.heartbeat = hung_heartbeat
+        await wait_for(lambda: watchdog.state == "disconnected")
+        assert watchdog.heartbeat_timeouts == 2 and not client.initialized
+        assert await mt5.place_order(**ORDER) is None
+
+        client.heartbeat = heartbeat
+        released.set()
+        await wait_for(lambda: watchdog.connected)
+        assert client.initialized
+
+    try:
+        asyncio.run(run_watched(watchdog, main()))
+    finally:
+        released.set()
+        client.executor.stop()
+    stats = watchdog.get_stats()
+    assert stats["disconnects"] == 1 and stats["heartbeat_failures"] == 0
+    print("✅ PASS - Hung terminal detected")
+
+if __name__ == "__main__":
+    test_disconnect_fail_fast_and_reconnect()
+    test_orders_queue_until_reconnect()
+    test_hung_terminal_detected()
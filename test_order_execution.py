@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the market order pipeline
+Requotes are resent at a fresh price within the retry budget; fills, slippage
+and reject codes are recorded per symbol
+"""
+
+import json
+import pytest
+from mt5_client import MT5Client
+
+def make_client(config, execution=None, **simulator):
+    config.config["simulate_orders"] = False
+    config.config["order_execution"] = dict({"max_retries": 2, "retry_budget_ms": 1000, "retry_delay_ms": 0},
+                                            **(execution or {}))
+    config.config["broker_backend"] = {"type": "simulator", "simulator": dict(
+        {"tick_source": "manual", "latency_ms": 0, "latency_jitter_ms": 0, "slippage_points": 0, "seed": 1},
+        **simulator)}
+    client = MT5Client(config)
+    assert client.initialize()
+    return client, client.mt5
+
+def test_requote_retried_at_fresh_price(config):
+    client, sim = make_client(config)
+    sent = []
+    order_send = sim.order_send
+
+    def moving_market(request):
+        # The market runs 5 pips away while the first request is in flight
+        sent.append(dict(request))
+        if len(sent) == 1:
+            sim.feed_tick("EURUSD", 1.08550, 1.08560)
+        return order_send(request)
+
+    sim.order_send = moving_market
+    try:
+        client.execution.set_deviation("EURUSD", 30)
+        assert json.load(open(client.config.config_file))["order_execution"]["symbol_deviation_points"] == {"EURUSD": 30}
+
+        sim.feed_tick("EURUSD", 1.08500, 1.08510)
+        ticket = client.place_order("EURUSD", "buy", 0.1, 1.085, 1.0800, 1.0900)
+        assert ticket and sim.positions_get(ticket=ticket)[0].price_open == 1.08560
+        assert [r["price"] for r in sent] == [1.08510, 1.08560]
+        assert {r["deviation"] for r in sent} == {30}
+
+        stats = client.execution.get_stats()["symbols"]["EURUSD"]
+        assert (stats["fills"], stats["retries"], stats["rejects"]) == (1, 1, {"REQUOTE": 1})
+        assert stats["slippage_pips"]["max"] == 5.0 and stats["deviation_points"] == 30
+
+        # Closing a buy sells at the bid: symbol stats keyed by the bot's symbol name
+        assert client.close_position(ticket)
+        assert client.execution.get_stats()["symbols"]["EURUSD"]["fills"] == 2
+    finally:
+        client.executor.stop()
+    print("✅ PASS - Requote retried at fresh price")
+
+def test_retries_stop_at_limit(config):
+    client, sim = make_client(config, requote_probability=1.0)
+    try:
+        assert client.place_order("EURUSD", "sell", 0.1, 1.085, 1.0900, 1.0800) is None
+        assert sim.orders_sent == 3  # first send + max_retries
+        stats = client.execution.get_stats()["symbols"]["EURUSD"]
+        assert (stats["fills"], stats["failed"], stats["fill_rate"]) == (0, 1, 0.0)
+        assert stats["rejects"] == {"REQUOTE": 3}
+    finally:
+        client.executor.stop()
+    print("✅ PASS - Retries stop at limit")
+
+def test_order_check_blocks_send(config):
+    client, sim = make_client(config, {"order_check": True}, balance=100.0)
+    try:
+        assert client.place_order("EURUSD", "buy", 1.0, 1.085, 1.0800, 1.0900) is None
+        assert sim.orders_sent == 0
+        assert client.execution.get_stats()["symbols"]["EURUSD"]["rejects"] == {"NO_MONEY": 1}
+
+        assert client.place_order("EURUSD", "buy", 0.01, 1.085, 1.0800, 1.0900)
+        assert sim.orders_sent == 1
+    finally:
+        client.executor.stop()
+    print("✅ PASS - Order check blocks send")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
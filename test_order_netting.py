@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for order netting
+Aligned LOGIC1 / LOGIC2 entries for one symbol go out as one MT5 order and
+come back as separate trades sharing the ticket
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from config import Config
+from risk_manager import RiskManager
+from mt5_client import MT5Client
+from alert_processor import AlertProcessor
+from trading_engine import TradingEngine
+from alert_queue import AlertIngestQueue
+from replay_journal import ReplayTelegram
+from models import Alert
+
+def make_engine(config, orders, closes):
+    config.config["simulate_orders"] = False
+    config.config["order_netting"] = {"enabled": True, "window_ms": 20}
+
+    client = MT5Client(config)
+    client.initialized = True
+
+    def place_order(**order):
+        orders.append(order)
+        return 555001
+    client.place_order = place_order
+    client.close_position = lambda position_id, percentage=100, volume=None: closes.append((position_id, volume)) or True
+
+    telegram = ReplayTelegram()
+    telegram.set_trend_manager = lambda trend_manager: None
+    engine = TradingEngine(config, RiskManager(config), client, telegram, AlertProcessor(config))
+    for tf in ("15m", "1h", "1d"):
+        engine.trend_manager.trends["symbols"].setdefault("EURUSD", {})[tf] = {"trend": "BULLISH", "mode": "AUTO"}
+    return engine
+
+def test_aligned_entries_netted():
+    config = Config()
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())  # trade DB / trends file stay out of the repo
+    orders, closes = [], []
+    try:
+        engine = make_engine(config, orders, closes)
+
+        async def main():
+            results = await asyncio.gather(
+                engine.process_alert(Alert(type="entry", symbol="EURUSD", signal="buy", tf="5m", price=1.0850)),
+                engine.process_alert(Alert(type="entry", symbol="EURUSD", signal="buy", tf="15m", price=1.0852))
+            )
+            assert results == [True, True]
+
+            assert len(orders) == 1
+            trades = list(engine.open_trades)
+            assert sorted(t.strategy for t in trades) == ["LOGIC1", "LOGIC2"]
+            assert all(t.trade_id == 555001 for t in trades)
+            assert orders[0]["lot_size"] == round(sum(t.lot_size for t in trades), 2)
+            assert orders[0]["comment"] == "NET_LOGIC1+LOGIC2"
+            # Each leg keeps its own levels; the broker gets the widest
+            assert trades[0].sl != trades[1].sl
+            assert orders[0]["sl"] == min(t.sl for t in trades)
+            assert orders[0]["tp"] == max(t.tp for t in trades)
+            assert len(engine.reentry_manager.active_chains) == 2
+
+            # Closing one leg closes only its volume of the shared position
+            await engine.close_trade(trades[0], "TP_HIT", trades[0].tp)
+            assert closes == [(555001, trades[0].lot_size)]
+            await engine.close_trade(trades[1], "TP_HIT", trades[1].tp)
+            assert closes[-1] == (555001, None)
+            assert len(engine.open_trades) == 0
+
+        asyncio.run(main())
+        assert engine.order_netter.get_stats()["orders_saved"] == 1
+        engine.mt5_executor.stop()
+    finally:
+        os.chdir(cwd)
+    print("✅ PASS - Aligned entries netted")
+
+def test_queued_entries_netted_in_order():
+    config = Config()
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    orders, closes = [], []
+    try:
+        engine = make_engine(config, orders, closes)
+        seen = []
+        process_alert = engine._process_alert
+
+        async def record(alert, *args):
+            seen.append((alert.type, alert.tf))
+            return await process_alert(alert, *args)
+        engine._process_alert = record
+
+        async def drain(queue):
+            while queue.pending:
+                await asyncio.sleep(0.005)
+
+        async def main():
+            queue = AlertIngestQueue(config, engine.process_alert, engine.order_netter.eligible)
+            queue.start()
+
+            # One symbol worker, yet both entries land in the same netting group
+            loop = asyncio.get_running_loop()
+            waiters = [loop.create_future(), loop.create_future()]
+            queue.submit(Alert(type="entry", symbol="EURUSD", signal="buy", tf="5m", price=1.0850), waiters[0])
+            queue.submit(Alert(type="entry", symbol="EURUSD", signal="buy", tf="15m", price=1.0852), waiters[1])
+            assert await asyncio.gather(*waiters) == [True, True]  # batch ingest waits on these
+            await drain(queue)
+            assert len(orders) == 1 and queue.processed == 2
+
+            # A later exit closes the held group early and runs after it
+            engine.order_netter.window_seconds = 5
+            started = time.monotonic()
+            queue.submit(Alert(type="entry", symbol="EURUSD", signal="buy", tf="5m", price=1.0860))
+            await asyncio.sleep(0.01)
+            queue.submit(Alert(type="exit", symbol="EURUSD", signal="bear", tf="15m", price=1.0858))
+            await drain(queue)
+            assert time.monotonic() - started < 1
+            assert seen[-2:] == [("entry", "5m"), ("exit", "15m")]
+            await queue.stop()
+
+        asyncio.run(main())
+        stats = engine.order_netter.get_stats()
+        assert (stats["groups"], stats["orders_saved"], stats["early_flushes"]) == (2, 1, 1)
+        engine.mt5_executor.stop()
+    finally:
+        os.chdir(cwd)
+    print("✅ PASS - Queued entries netted in order")
+
+def test_batch_trends_saved_before_orders():
+    """Batch trend/bias updates are one trends write, finished before any order is placed"""
+    config = Config()
+    config.config["trend_coalescing"] = {"enabled": False}
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    orders, closes = [], []
+    try:
+        engine = make_engine(config, orders, closes)
+        saves, deferred_at_order = [], []
+        save_trends = engine.trend_manager.save_trends
+        def counted_save():
+            # Count actual file writes (calls inside deferred_save only mark the save pending)
+            if engine.trend_manager._defer_depth == 0:
+                saves.append(1)
+            save_trends()
+        engine.trend_manager.save_trends = counted_save
+        place_order = engine.mt5_client.place_order
+        engine.mt5_client.place_order = lambda **order: deferred_at_order.append(
+            engine.trend_manager._defer_depth) or place_order(**order)
+
+        results = asyncio.run(engine.process_alert_batch([
+            Alert(type="entry", symbol="EURUSD", signal="buy", tf="5m", price=1.0850),
+            Alert(type="entry", symbol="EURUSD", signal="buy", tf="15m", price=1.0852),
+            Alert(type="bias", symbol="EURUSD", signal="bull", tf="1d", price=1.0850),
+            Alert(type="trend", symbol="EURUSD", signal="bull", tf="1h", price=1.0850)
+        ]))
+        assert results == [True, True, True, True]
+        assert len(saves) == 1
+        assert len(orders) == 1 and deferred_at_order == [0]
+        engine.mt5_executor.stop()
+    finally:
+        os.chdir(cwd)
+    print("✅ PASS - Batch trends saved before orders")
+
+if __name__ == "__main__":
+    test_aligned_entries_netted()
+    test_queued_entries_netted_in_order()
+    test_batch_trends_saved_before_orders()
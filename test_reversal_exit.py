@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Tests for batched reversal exits
+All matched trades close back-to-back, one DB commit, one notification
+"""
+
+import asyncio
+import os
+import tempfile
+from datetime import datetime
+from config import Config
+from database import TradeDatabase
+from models import Trade
+from reversal_exit_handler import ReversalExitHandler
+from trade_book import TradeBook
+
+class FakeTelegram:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, message: str):
+        self.messages.append(message)
+        return True
+
+class FakeMT5:
+    """AsyncMT5Client stand-in: closes succeed except for the given tickets"""
+
+    def __init__(self, failing):
+        self.failing = set(failing)
+        self.closed = []
+        self.volumes = []
+
+    async def close_position(self, position_id: int, percentage: float = 100, volume=None) -> bool:
+        self.closed.append(position_id)
+        self.volumes.append(volume)
+        return position_id not in self.failing
+
+class CountingDatabase(TradeDatabase):
+    def __init__(self):
+        super().__init__()
+        self.commits = 0
+
+    def commit(self):
+        if self._transaction_depth == 0:
+            self.commits += 1
+        super().commit()
+
+def test_batch_close_one_commit_one_message():
+    config = Config()
+    config.config["simulate_orders"] = False
+    config.config["re_entry_config"]["exit_continuation_enabled"] = False
+
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        db = CountingDatabase()
+    finally:
+        os.chdir(cwd)
+
+    telegram = FakeTelegram()
+    mt5 = FakeMT5(failing=[1002])
+    handler = ReversalExitHandler(config, None, telegram, db, mt5=mt5)
+
+    trades = [Trade(symbol="EURUSD", entry=1.08, sl=1.07, tp=1.10, lot_size=0.1, direction="buy",
+                    strategy="LOGIC1", trade_id=1000 + i, open_time=datetime.now().isoformat())
+              for i in range(3)]
+    closes = [{"trade": t, "exit_price": 1.09, "exit_reason": "REVERSAL_BEARISH"} for t in trades]
+
+    closed = asyncio.run(handler.execute_reversal_exits(closes))
+
+    assert mt5.closed == [1000, 1001, 1002]
+    assert [t.trade_id for t in closed] == [1000, 1001]
+    assert trades[2].status == "open"
+    assert db.commits == 0  # only the transaction's single commit
+    events = db.conn.execute("SELECT COUNT(*) FROM reversal_exit_events").fetchone()[0]
+    assert events == 2
+    assert len(telegram.messages) == 1
+    assert "REVERSAL EXIT x2" in telegram.messages[0] and "#1002" in telegram.messages[0]
+    print("✅ PASS - Batch close, one commit, one message")
+
+def test_reversed_leg_closes_only_its_volume():
+    """Two netted legs share one ticket - reversing one must not close the other's volume"""
+    config = Config()
+    config.config["simulate_orders"] = False
+    config.config["re_entry_config"]["exit_continuation_enabled"] = False
+
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        db = TradeDatabase()
+    finally:
+        os.chdir(cwd)
+
+    mt5 = FakeMT5(failing=[])
+    handler = ReversalExitHandler(config, None, FakeTelegram(), db, mt5=mt5)
+
+    legs = [Trade(symbol="EURUSD", entry=1.08, sl=1.07, tp=1.10, lot_size=lots, direction="buy",
+                  strategy=strategy, trade_id=555001, open_time=datetime.now().isoformat())
+            for strategy, lots in (("LOGIC1", 0.1), ("LOGIC2", 0.05))]
+    book = TradeBook()
+    for leg in legs:
+        book.add(leg)
+
+    closed = asyncio.run(handler.execute_reversal_exits(
+        [{"trade": legs[0], "exit_price": 1.09, "exit_reason": "REVERSAL_BEARISH"}], book))
+    assert closed == [legs[0]]
+    assert (mt5.closed, mt5.volumes) == ([555001], [0.1])
+    assert legs[1].status == "open"
+
+    # Both legs reversed together: one full close of the ticket
+    legs[0].status = "open"
+    closes = [{"trade": leg, "exit_price": 1.09, "exit_reason": "REVERSAL_BEARISH"} for leg in legs]
+    closed = asyncio.run(handler.execute_reversal_exits(closes, book))
+    assert closed == legs
+    assert (mt5.closed[1:], mt5.volumes[1:]) == ([555001], [None])
+    print("✅ PASS - Reversed netted leg closes only its volume")
+
+def test_transaction_rolls_back_on_error():
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        db = TradeDatabase()
+    finally:
+        os.chdir(cwd)
+
+    trade = Trade(symbol="EURUSD", entry=1.08, sl=1.07, tp=1.10, lot_size=0.1, direction="buy",
+                  strategy="LOGIC1", trade_id=2000, open_time=datetime.now().isoformat())
+    try:
+        with db.transaction():
+            db.save_trade(trade)
+            raise RuntimeError("batch failed halfway")
+    except RuntimeError:
+        pass
+
+    assert db._transaction_depth == 0
+    assert db.conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 0
+    # Later commits are not deferred by the failed block
+    db.save_trade(trade)
+    assert db.conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 1
+    print("✅ PASS - Failed transaction rolled back")
+
+if __name__ == "__main__":
+    test_batch_close_one_commit_one_message()
+    test_reversed_leg_closes_only_its_volume()
+    test_transaction_rolls_back_on_error()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the strategy registry
+Default strategies must route and align exactly like the old LOGIC1/2/3 branches
+"""
+
+import itertools
+import pytest
+from strategy_registry import StrategyRegistry
+
+TRENDS = ["BULLISH", "BEARISH", "NEUTRAL"]
+
+@pytest.fixture
+def default_config(config):
+    # In-code defaults (copy - config.config is default_config when there is no config.json)
+    config.config = {key: value for key, value in config.config.items() if key != "strategy_registry"}
+    return config
+
+def legacy_alignment(symbol_trends, logic):
+    bias_tf, trend_tf = {"LOGIC1": ("1h", "15m"), "LOGIC2": ("1h", "15m"), "LOGIC3": ("1d", "1h")}[logic]
+    bias = symbol_trends.get(bias_tf, {}).get("trend", "NEUTRAL")
+    trend = symbol_trends.get(trend_tf, {}).get("trend", "NEUTRAL")
+    aligned = bias != "NEUTRAL" and bias == trend
+    return {"aligned": aligned, "direction": bias if aligned else "NEUTRAL",
+            "details": {bias_tf: bias, trend_tf: trend}}
+
+def test_default_alignment_matches_legacy(default_config):
+    registry = StrategyRegistry(default_config)
+    for d1, h1, m15 in itertools.product(TRENDS, repeat=3):
+        symbol_trends = {"1d": {"trend": d1}, "1h": {"trend": h1}, "15m": {"trend": m15}}
+        for logic in ("LOGIC1", "LOGIC2", "LOGIC3"):
+            assert registry.check_alignment(symbol_trends, logic) == legacy_alignment(symbol_trends, logic)
+    assert not registry.check_alignment({}, "LOGIC9")["aligned"]
+    print("✅ PASS - Default alignment matches legacy")
+
+def test_routing_and_toggles(default_config):
+    registry = StrategyRegistry(default_config)
+    assert [spec.name for spec in registry.for_timeframe("5m")] == ["LOGIC1"]
+    assert [spec.name for spec in registry.for_timeframe("1h")] == ["LOGIC3"]
+    assert registry.for_timeframe("1d") == ()
+
+    assert registry.set_enabled("LOGIC2", False)
+    assert registry.enabled_for_timeframe("15m") == ()
+    assert registry.status() == {"logic1": True, "logic2": False, "logic3": True}
+    assert not registry.set_enabled("LOGIC9", False)
+    print("✅ PASS - Routing and toggles")
+
+def test_strategy_added_from_config(default_config):
+    config = default_config
+    registry = StrategyRegistry(config)
+    registry.set_enabled("LOGIC1", False)
+
+    strategies = dict(config.default_config["strategy_registry"])
+    strategies["LOGIC4"] = {"entry_tf": "5m", "alignment_tfs": ["1d", "1h", "15m"], "label": "D+1H+15M→5M"}
+    config.update("strategy_registry", strategies)
+
+    assert [spec.name for spec in registry.for_timeframe("5m")] == ["LOGIC1", "LOGIC4"]
+    # Runtime toggle survives the recompile
+    assert [spec.name for spec in registry.enabled_for_timeframe("5m")] == ["LOGIC4"]
+    aligned = {"1d": {"trend": "BEARISH"}, "1h": {"trend": "BEARISH"}, "15m": {"trend": "BEARISH"}}
+    assert registry.check_alignment(aligned, "LOGIC4")["direction"] == "BEARISH"
+    aligned["15m"]["trend"] = "BULLISH"
+    assert not registry.check_alignment(aligned, "LOGIC4")["aligned"]
+    print("✅ PASS - Strategy added from config")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the broker symbol metadata cache
+Orders use cached metadata (no symbol_info on the order path) and fall back
+to the next filling mode when the broker rejects one
+"""
+
+from types import SimpleNamespace
+from config import Config
+import mt5_client
+from mt5_client import MT5Client
+from symbol_metadata import SymbolMetadata
+
+class FakeTerminal:
+    """Just enough of the MetaTrader5 module for order building"""
+    ORDER_TYPE_BUY, ORDER_TYPE_SELL = 0, 1
+    ORDER_FILLING_FOK, ORDER_FILLING_IOC, ORDER_FILLING_RETURN = 0, 1, 2
+    TRADE_ACTION_DEAL = 1
+    ORDER_TIME_GTC = 0
+    TRADE_RETCODE_DONE, TRADE_RETCODE_INVALID_FILL = 10009, 10030
+
+    def __init__(self):
+        self.symbol_info_calls = []
+        self.sent = []
+
+    def symbol_info(self, symbol):
+        self.symbol_info_calls.append(symbol)
+        return SimpleNamespace(visible=True, digits=5, point=0.00001, volume_min=0.01, volume_max=50.0,
+                               volume_step=0.01, trade_stops_level=10, trade_tick_value=1.0,
+                               trade_tick_size=0.00001, filling_mode=3)  # FOK | IOC
+
+    def symbol_info_tick(self, symbol):
+        return SimpleNamespace(bid=1.08500, ask=1.08512)
+
+    def order_send(self, request):
+        self.sent.append(dict(request))
+        # This broker only fills FOK
+        if request["type_filling"] != self.ORDER_FILLING_FOK:
+            return SimpleNamespace(retcode=self.TRADE_RETCODE_INVALID_FILL, comment="Unsupported filling mode")
+        return SimpleNamespace(retcode=self.TRADE_RETCODE_DONE, order=4242, comment="done")
+
+    def last_error(self):
+        return (1, "fake")
+
+def test_normalize_volume():
+    metadata = SymbolMetadata("EURUSD", 5, 0.00001, 0.1, 5.0, 0.1, 0, 1.0, 0.00001, (1,), 0.0)
+    assert metadata.normalize_volume(0.30000000000000004) == 0.3
+    assert metadata.normalize_volume(0.26) == 0.3
+    assert metadata.normalize_volume(0.04) is None  # below volume_min: refused, never raised
+    assert metadata.normalize_volume(9.0) == 5.0
+    print("✅ PASS - Normalize volume")
+
+def test_orders_use_cache_and_learn_filling_mode():
+    terminal = FakeTerminal()
+    saved = (getattr(mt5_client, "mt5", None), mt5_client.MT5_AVAILABLE)
+    mt5_client.mt5, mt5_client.MT5_AVAILABLE = terminal, True
+
+    config = Config()
+    config.config["simulate_orders"] = False
+    client = MT5Client(config)
+    client.initialized = True
+    try:
+        assert client.refresh_symbol_metadata() == len(config["symbol_config"])
+        startup_calls = len(terminal.symbol_info_calls)
+
+        # IOC preferred by the symbol flags, rejected -> FOK, then remembered
+        assert client.place_order("EURUSD", "buy", 0.1, 1.085, 1.07, 1.10) == 4242
+        assert [r["type_filling"] for r in terminal.sent] == [terminal.ORDER_FILLING_IOC, terminal.ORDER_FILLING_FOK]
+
+        terminal.sent.clear()
+        assert client.place_order("EURUSD", "sell", 0.1, 1.085, 1.10, 1.07) == 4242
+        assert [r["type_filling"] for r in terminal.sent] == [terminal.ORDER_FILLING_FOK]
+        assert len(terminal.symbol_info_calls) == startup_calls  # no metadata calls on the order path
+
+        # Risk-sized lot below the broker minimum is refused, not raised to 0.01
+        terminal.sent.clear()
+        assert client.place_order("EURUSD", "buy", 0.004, 1.085, 1.07, 1.10) is None
+        assert terminal.sent == []
+
+        # A periodic refresh keeps the learned mode
+        client.refresh_symbol_metadata()
+        assert client.symbol_cache.get("EURUSD").filling_modes[0] == terminal.ORDER_FILLING_FOK
+    finally:
+        mt5_client.mt5, mt5_client.MT5_AVAILABLE = saved
+        client.executor.stop()
+    print("✅ PASS - Orders use cache and learn filling mode")
+
+if __name__ == "__main__":
+    test_normalize_volume()
+    test_orders_use_cache_and_learn_filling_mode()
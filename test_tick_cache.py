@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the background tick cache
+Price reads come from the cache; MT5 is only asked when a tick is missing or stale
+"""
+
+import asyncio
+import time
+from config import Config
+from mt5_client import MT5Client
+from mt5_executor import AsyncMT5Client
+from tick_cache import TickCache
+
+def make_cache(**overrides):
+    config = Config()
+    config.config["tick_cache"] = dict({"enabled": True, "poll_interval_ms": 10, "max_age_ms": 500,
+                                        "idle_seconds": 60}, **overrides)
+    return TickCache(config)
+
+def test_prices_and_staleness():
+    cache = make_cache()
+    assert cache.price("EURUSD") is None  # nothing polled yet
+
+    cache.update("EURUSD", 1.0850, 1.0852, 1000)
+    assert cache.price("EURUSD", "buy") == 1.0852
+    assert cache.price("EURUSD", "sell") == 1.0850
+    assert abs(cache.price("EURUSD") - 1.0851) < 1e-12
+    assert abs(cache.tick("EURUSD").spread - 0.0002) < 1e-12
+
+    # Same time_msc again is a poll, not a new tick
+    cache.update("EURUSD", 1.0850, 1.0852, 1000)
+    cache.update("EURUSD", 1.0851, 1.0853, 1250)
+    stats = cache.get_stats()["symbols"]["EURUSD"]
+    assert stats["polls"] == 3
+    assert cache._table[cache._rows["EURUSD"]]["ticks"] == 2
+
+    cache.max_age = 0.01
+    time.sleep(0.02)
+    assert cache.price("EURUSD") is None
+    print("✅ PASS - Prices and staleness")
+
+def test_table_grows_and_polls_active_symbols():
+    cache = make_cache()
+    for i in range(40):
+        cache.update(f"SYM{i}", float(i), float(i) + 0.5, i)
+    assert cache.price("SYM39", "buy") == 39.5
+    assert cache.price("SYM0", "sell") == 0.0
+
+    cache = make_cache(idle_seconds=0.01)
+    cache.set_active_symbols(lambda: {"XAUUSD"})
+    cache.price("GBPUSD")  # a read registers interest
+    assert cache.symbols_to_poll() == ["GBPUSD", "XAUUSD"]
+    time.sleep(0.02)
+    assert cache.symbols_to_poll() == ["XAUUSD"]
+    print("✅ PASS - Table grows, active symbols polled")
+
+def test_facade_reads_cache():
+    config = Config()
+    config.config["simulate_orders"] = True
+    config.config["tick_cache"] = {"enabled": True, "poll_interval_ms": 10, "max_age_ms": 1000}
+    client = MT5Client(config)
+    client.initialized = True
+    mt5 = AsyncMT5Client(client, client.executor)
+    client.tick_cache.set_active_symbols(lambda: ["EURUSD"])
+
+    async def main():
+        await client.tick_cache.start(mt5)
+        await asyncio.sleep(0.05)
+        calls = client.executor.get_stats()["completed"]
+        for _ in range(20):
+            assert await mt5.get_current_price("EURUSD") == 1.0850
+        assert client.executor.get_stats()["completed"] == calls  # no broker calls
+        await client.tick_cache.stop()
+
+    asyncio.run(main())
+    client.executor.stop()
+    assert client.tick_cache.get_stats()["poll_cycles"] >= 1
+    print("✅ PASS - Facade reads cache")
+
+if __name__ == "__main__":
+    test_prices_and_staleness()
+    test_table_grows_and_polls_active_symbols()
+    test_facade_reads_cache()
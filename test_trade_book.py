@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed open-trade book
+"""
+
+from datetime import datetime
+from models import Trade
+from trade_book import TradeBook
+
+def make_trade(symbol="EURUSD", direction="buy", strategy="LOGIC1", trade_id=None, chain_id=None):
+    return Trade(symbol=symbol, entry=1.0850, sl=1.0800, tp=1.0925, lot_size=0.1,
+                 direction=direction, strategy=strategy, trade_id=trade_id, chain_id=chain_id,
+                 open_time=datetime.now().isoformat())
+
+def test_indexes_follow_add_and_remove():
+    """Every index sees an added trade and forgets it on remove"""
+    book = TradeBook()
+    eur_buy = make_trade(trade_id=101, chain_id="EURUSD_abc")
+    eur_sell = make_trade(direction="sell", strategy="LOGIC2", trade_id=102)
+    gold = make_trade(symbol="XAUUSD", strategy="LOGIC3", trade_id=103)
+    for trade in (eur_buy, eur_sell, gold):
+        assert book.add(trade)
+    assert not book.add(eur_buy)    # idempotent
+    
+    assert len(book) == 3
+    assert book.get(102) is eur_sell
+    assert book.by_symbol("EURUSD") == [eur_buy, eur_sell]
+    assert book.by_symbol_direction("EURUSD", "sell") == [eur_sell]
+    assert book.by_chain("EURUSD_abc") == [eur_buy]
+    assert book.by_strategy("LOGIC3") == [gold]
+    
+    assert book.remove(eur_buy)
+    assert not book.remove(eur_buy)
+    assert eur_buy not in book and book.get(101) is None
+    assert book.by_symbol("EURUSD") == [eur_sell]
+    assert book.by_chain("EURUSD_abc") == []
+    assert sorted(book.symbols()) == ["EURUSD", "XAUUSD"]
+    print("✅ PASS - Indexes follow add/remove")
+
+def test_trades_without_id_are_distinct():
+    """Simulated trades (no trade_id) are tracked by identity, not merged"""
+    book = TradeBook()
+    first, second = make_trade(), make_trade()
+    book.add(first)
+    book.add(second)
+    book.remove(first)
+    assert list(book) == [second]
+    print("✅ PASS - Trades without id are distinct")
+
+def test_iteration_is_a_snapshot():
+    """Removing trades while iterating neither skips nor raises"""
+    book = TradeBook()
+    trades = [make_trade(trade_id=i) for i in range(5)]
+    for trade in trades:
+        book.add(trade)
+    seen = []
+    for trade in book:
+        seen.append(trade.trade_id)
+        book.remove(trade)
+    assert seen == [0, 1, 2, 3, 4] and len(book) == 0
+    print("✅ PASS - Iteration is a snapshot")
+
+def test_reindex_after_id_assigned():
+    book = TradeBook()
+    trade = make_trade()
+    book.add(trade)
+    trade.trade_id = 555
+    trade.chain_id = "EURUSD_xyz"
+    book.reindex(trade)
+    assert book.get(555) is trade and book.by_chain("EURUSD_xyz") == [trade]
+    print("✅ PASS - Reindex after id assigned")
+
+def test_evaluate_levels_matches_scalar_check():
+    """Vectorized SL/TP sets equal a per-trade check, before and after swap-removes"""
+    import random
+    rng = random.Random(3)
+    symbols = ["EURUSD", "GBPUSD", "XAUUSD"]
+    book = TradeBook()
+    trades = []
+    for i in range(200):
+        direction = rng.choice(("buy", "sell"))
+        entry = 1.0 + rng.random() * 0.01
+        offset = 0.002 + rng.random() * 0.003
+        sign = 1 if direction == "buy" else -1
+        trade = make_trade(symbol=symbols[i % 3], direction=direction, trade_id=i)
+        trade.entry, trade.sl, trade.tp = entry, entry - sign * offset, entry + sign * offset * 1.5
+        trades.append(trade)
+        book.add(trade)
+    prices = {"EURUSD": 1.001, "GBPUSD": 1.0105, "XAUUSD": 0.0}   # XAUUSD: no price
+    
+    def expected(live):
+        sl_hit, tp_hit = set(), set()
+        for t in live:
+            price = prices[t.symbol]
+            if not price:
+                continue
+            if (price <= t.sl) if t.direction == "buy" else (price >= t.sl):
+                sl_hit.add(t.trade_id)
+            elif (price >= t.tp) if t.direction == "buy" else (price <= t.tp):
+                tp_hit.add(t.trade_id)
+        return sl_hit, tp_hit
+    
+    for live_count in (200, 120, 10):     # vectorized, then the small-book loop
+        while len(book) > live_count:
+            book.remove(trades.pop(rng.randrange(len(trades))))
+        sl_hit, tp_hit = book.evaluate_levels(prices)
+        assert ({t.trade_id for t in sl_hit}, {t.trade_id for t in tp_hit}) == expected(trades)
+    print("✅ PASS - Vectorized levels match scalar check")
+
+if __name__ == "__main__":
+    test_indexes_follow_add_and_remove()
+    test_trades_without_id_are_distinct()
+    test_iteration_is_a_snapshot()
+    test_reindex_after_id_assigned()
+    test_evaluate_levels_matches_scalar_check()
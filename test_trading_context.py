@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled trading context
+Table lookups must match the nested-config calculations they replace
+"""
+
+import pytest
+from pip_calculator import PipCalculator
+from risk_manager import RiskManager
+from trading_context import TradingContext, sl_tier, risk_tier
+
+BALANCES = [0, 4999, 5000, 7499, 7500, 9999, 10000, 17499, 17500, 25000,
+            37499, 37500, 50000, 74999, 75000, 100000, 250000]
+
+def legacy_sl_pips(config, symbol, balance):
+    tier = sl_tier(balance)
+    symbol_config = config["symbol_config"][symbol]
+    if config.get("sl_system_enabled", True):
+        try:
+            sl_pips = config["sl_systems"][config.get("active_sl_system", "sl-1")]["symbols"][symbol][tier]["sl_pips"]
+            reductions = config.get("symbol_sl_reductions", {})
+            if symbol in reductions:
+                sl_pips = sl_pips * (1 - reductions[symbol] / 100)
+            return sl_pips
+        except KeyError:
+            pass
+    risk_cap = config["risk_by_account_tier"][tier][symbol_config["volatility"]]["risk_dollars"]
+    lot_size = config["fixed_lot_sizes"].get(tier, 0.05)
+    return risk_cap / (symbol_config["pip_value_per_std_lot"] * lot_size)
+
+def test_tier_thresholds():
+    """SL tiers switch at midpoints, risk tiers at the tier balance"""
+    for balance in BALANCES:
+        expected_sl = ("5000" if balance < 7500 else "10000" if balance < 17500 else
+                       "25000" if balance < 37500 else "50000" if balance < 75000 else "100000")
+        expected_risk = next((t for t in ["100000", "50000", "25000", "10000", "5000"] if balance >= int(t)), "5000")
+        assert sl_tier(balance) == expected_sl, balance
+        assert risk_tier(balance) == expected_risk, balance
+    print("✅ PASS - Tier thresholds")
+
+def test_levels_match_config(config):
+    config.update("symbol_sl_reductions", {"XAUUSD": 20})
+    context = TradingContext(config)
+    for active in ("sl-1", "sl-2"):
+        config.update("active_sl_system", active)
+        for symbol, symbol_config in config["symbol_config"].items():
+            for balance in BALANCES:
+                levels = context.levels(symbol, balance)
+                expected = legacy_sl_pips(config, symbol, balance)
+                assert abs(levels.sl_pips - expected) < 1e-9, (active, symbol, balance)
+                assert abs(levels.sl_distance - expected * symbol_config["pip_size"]) < 1e-9
+                assert abs(levels.tp_distance - levels.sl_distance * config["rr_ratio"]) < 1e-9
+    print("✅ PASS - Compiled levels match config")
+
+def test_recompiled_on_config_change(config):
+    config.update("sl_system_enabled", True)
+    config.update("symbol_sl_reductions", {})
+    calculator = PipCalculator(config)
+    before = calculator._get_sl_from_dual_system("EURUSD", 10000)
+    compilations = calculator.context.compilations
+    calculator._get_sl_from_dual_system("EURUSD", 10000)
+    assert calculator.context.compilations == compilations  # cached
+
+    config.update("symbol_sl_reductions", {"EURUSD": 50})
+    assert calculator._get_sl_from_dual_system("EURUSD", 10000) == before * 0.5
+    config.update("sl_system_enabled", False)
+    assert calculator._get_sl_from_dual_system("EURUSD", 10000) == legacy_sl_pips(config, "EURUSD", 10000)
+    print("✅ PASS - Recompiled on config change")
+
+def test_lot_size_table(config):
+    risk_manager = RiskManager(config)
+    fixed_lots = config["fixed_lot_sizes"]
+    for balance in BALANCES:
+        expected = next((fixed_lots[t] for t in sorted(fixed_lots, key=int, reverse=True)
+                         if balance >= int(t)), 0.05)
+        assert risk_manager.get_fixed_lot_size(balance) == expected, balance
+
+    config.config.setdefault("manual_lot_overrides", {})["12000"] = 0.33
+    config.save_config()
+    assert risk_manager.get_fixed_lot_size(12000) == 0.33
+    print("✅ PASS - Lot size table")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,168 @@
+import asyncio
+import time
+import numpy as np
+from typing import Dict, Any, Callable, Iterable, List, NamedTuple, Optional, Set
+from config import Config
+
+TICK_DTYPE = np.dtype([
+    ("bid", "f8"),
+    ("ask", "f8"),
+    ("spread", "f8"),        # ask - bid, price units
+    ("time_msc", "i8"),      # broker tick time
+    ("polled_at", "f8"),     # local time of the last poll that returned a tick
+    ("changed_at", "f8"),    # local time time_msc last changed (new tick)
+    ("polls", "i8"),
+    ("ticks", "i8")          # polls that brought a new tick
+])
+
+
+class Tick(NamedTuple):
+    bid: float
+    ask: float
+    spread: float
+    time_msc: int
+    age_seconds: float       # since last poll
+
+
+class TickCache:
+    """
+    Latest tick per symbol, polled in the background on the MT5 thread
+    - One row per symbol in a NumPy structured array (bid, ask, spread,
+      time_msc, poll / tick counters); rows are written whole, so readers on
+      the event loop never see half an update
+    - Polls the active symbols (open trades, price monitor, recently read)
+      every poll_interval_ms in one executor call
+    - price() / tick() never call the broker; they return None when the
+      symbol has no tick younger than max_age_ms (callers then ask MT5 once)
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        tick_config = config.get("tick_cache", {})
+        self.enabled = tick_config.get("enabled", True)
+        self.poll_interval = tick_config.get("poll_interval_ms", 250) / 1000
+        self.max_age = tick_config.get("max_age_ms", 2000) / 1000
+        self.idle_seconds = tick_config.get("idle_seconds", 300)
+
+        self._table = np.zeros(16, dtype=TICK_DTYPE)
+        self._rows: Dict[str, int] = {}
+        self._last_read: Dict[str, float] = {}  # symbol -> last time a consumer asked for it
+        self._active_symbols: Callable[[], Iterable[str]] = lambda: ()
+        self._task = None
+        self._started_at = time.time()
+
+        self.hits = 0
+        self.misses = 0
+        self.poll_cycles = 0
+        self.poll_errors = 0
+
+    def set_active_symbols(self, provider: Callable[[], Iterable[str]]):
+        """Symbols that must always be polled (e.g. open trades, pending re-entries)"""
+        self._active_symbols = provider
+
+    def symbols_to_poll(self) -> List[str]:
+        now = time.time()
+        symbols: Set[str] = set(self._active_symbols())
+        for symbol, read_at in list(self._last_read.items()):
+            if now - read_at <= self.idle_seconds:
+                symbols.add(symbol)
+            else:
+                del self._last_read[symbol]
+        return sorted(symbols)
+
+    def update(self, symbol: str, bid: float, ask: float, time_msc: int):
+        """Store one tick (MT5 thread)"""
+        now = time.time()
+        row = self._rows.get(symbol)
+        table = self._table
+        if row is None:
+            row = len(self._rows)
+            if row == len(table):
+                table = np.concatenate([table, np.zeros(len(table), dtype=TICK_DTYPE)])
+                self._table = table
+            polls = ticks = 0
+            changed_at = now
+            changed = True
+        else:
+            _, _, _, last_time_msc, _, changed_at, polls, ticks = table[row].item()
+            changed = last_time_msc != time_msc
+            if changed:
+                changed_at = now
+        # Whole-row assignment: readers copy whole rows, so they see either the old or the new tick
+        table[row] = (bid, ask, ask - bid, time_msc, now, changed_at, polls + 1, ticks + changed)
+        self._rows[symbol] = row
+
+    def tick(self, symbol: str) -> Optional[Tick]:
+        """Latest tick if it is fresh enough - never calls the broker"""
+        self._last_read[symbol] = time.time()
+        row = self._rows.get(symbol)
+        if row is not None and self.enabled:
+            bid, ask, spread, time_msc, polled_at, _, _, _ = self._table[row].item()
+            age = time.time() - polled_at
+            if age <= self.max_age:
+                self.hits += 1
+                return Tick(bid, ask, spread, time_msc, age)
+        self.misses += 1
+        return None
+
+    def price(self, symbol: str, direction: Optional[str] = None) -> Optional[float]:
+        """Ask for buys, bid for sells, mid otherwise - None when no fresh tick"""
+        tick = self.tick(symbol)
+        if tick is None:
+            return None
+        if direction == "buy":
+            return tick.ask
+        if direction == "sell":
+            return tick.bid
+        return (tick.ask + tick.bid) / 2
+
+    async def start(self, mt5):
+        """Background polling through the AsyncMT5Client facade"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._poll_loop(mt5))
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _poll_loop(self, mt5):
+        while True:
+            symbols = self.symbols_to_poll()
+            if symbols:
+                try:
+                    await mt5.poll_ticks(symbols)
+                    self.poll_cycles += 1
+                except Exception as e:
+                    self.poll_errors += 1
+                    print(f"⚠️ Tick poll error: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        symbols = {}
+        for symbol, row in self._rows.items():
+            bid, ask, spread, _, polled_at, changed_at, polls, ticks = self._table[row].item()
+            symbols[symbol] = {
+                "bid": bid,
+                "ask": ask,
+                "spread": round(spread, 6),
+                "age_ms": round((now - polled_at) * 1000, 1),
+                "last_change_ms": round((now - changed_at) * 1000, 1),
+                "polls": polls,
+                "ticks_per_second": round(ticks / max(now - self._started_at, 1e-9), 2)
+            }
+        return {
+            "enabled": self.enabled,
+            "poll_interval_ms": int(self.poll_interval * 1000),
+            "hits": self.hits,
+            "misses": self.misses,
+            "poll_cycles": self.poll_cycles,
+            "poll_errors": self.poll_errors,
+            "symbols": symbols
+        }
@@ -1,14 +1,20 @@
 from typing import Dict, Any, Optional
+from contextlib import contextmanager
 from datetime import datetime
 import json
 import os
+from strategy_registry import StrategyRegistry
 
 class TimeframeTrendManager:
     """Manage trends per timeframe instead of per logic"""
     
-    def __init__(self, config_file="timeframe_trends.json"):
+    def __init__(self, config_file="timeframe_trends.json", strategies: Optional[StrategyRegistry] = None):
         self.config_file = config_file
+        self.strategies = strategies
         self.trends = self.load_trends()
+        # >0 while inside deferred_save() - file is written once at the end
+        self._defer_depth = 0
+        self._save_pending = False
         
     def load_trends(self) -> Dict[str, Any]:
         """Load trends from file with error handling"""
@@ -30,13 +36,29 @@ class TimeframeTrendManager:
             }
     
     def save_trends(self):
-        """Save trends to file"""
+        """Save trends to file (deferred while a batch is open)"""
+        if self._defer_depth > 0:
+            self._save_pending = True
+            return
+        
         try:
             with open(self.config_file, 'w') as f:
                 json.dump(self.trends, f, indent=4)
         except Exception as e:
             print(f"❌ Error saving trends: {str(e)}")
     
+    @contextmanager
+    def deferred_save(self):
+        """Apply several trend updates with a single write of the trends file"""
+        self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            self._defer_depth -= 1
+            if self._defer_depth == 0 and self._save_pending:
+                self._save_pending = False
+                self.save_trends()
+    
     def update_trend(self, symbol: str, timeframe: str, signal: str, mode: str = "AUTO"):
         """Update trend for a specific symbol and timeframe"""
         
@@ -84,50 +106,15 @@ class TimeframeTrendManager:
             return "AUTO"
     
     def check_logic_alignment(self, symbol: str, logic: str) -> Dict[str, Any]:
-        """Check if trends align for a specific trading logic"""
-        
-        result = {
-            "aligned": False,
-            "direction": "NEUTRAL",
-            "details": {}
-        }
-        
-        if symbol not in self.trends["symbols"]:
-            return result
-        
-        symbol_trends = self.trends["symbols"][symbol]
-        
-        if logic == "LOGIC1":  # 1H bias + 15M trend for 5M entries
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            m15_trend = symbol_trends.get("15m", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1h": h1_trend, "15m": m15_trend}
-            
-            if h1_trend != "NEUTRAL" and h1_trend == m15_trend:
-                result["aligned"] = True
-                result["direction"] = h1_trend
-                
-        elif logic == "LOGIC2":  # 1H bias + 15M trend for 15M entries
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            m15_trend = symbol_trends.get("15m", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1h": h1_trend, "15m": m15_trend}
-            
-            if h1_trend != "NEUTRAL" and h1_trend == m15_trend:
-                result["aligned"] = True
-                result["direction"] = h1_trend
-                
-        elif logic == "LOGIC3":  # 1D bias + 1H trend for 1H entries
-            d1_trend = symbol_trends.get("1d", {}).get("trend", "NEUTRAL")
-            h1_trend = symbol_trends.get("1h", {}).get("trend", "NEUTRAL")
-            
-            result["details"] = {"1d": d1_trend, "1h": h1_trend}
-            
-            if d1_trend != "NEUTRAL" and d1_trend == h1_trend:
-                result["aligned"] = True
-                result["direction"] = d1_trend
+        """Check if trends align for a specific trading logic (timeframes from the strategy registry)"""
+        if symbol not in self.trends["symbols"] or self.strategies is None:
+            return {
+                "aligned": False,
+                "direction": "NEUTRAL",
+                "details": {}
+            }
         
-        return result
+        return self.strategies.check_alignment(self.trends["symbols"][symbol], logic)
     
     def set_manual_trend(self, symbol: str, timeframe: str, trend: str):
         """Manually set a trend that won't be overridden by signals"""
@@ -0,0 +1,200 @@
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple, Iterator
+from models import Trade
+
+class TradeBook:
+    """
+    Open trades indexed for O(1) insert / remove / lookup
+    - Keyed by object identity (simulated trades may have no trade_id yet)
+    - Secondary indexes: trade_id, symbol, (symbol, direction), chain_id, strategy
+      (netted orders book several trades under one MT5 ticket)
+    - Shared by TradingEngine, RiskManager and PriceMonitorService
+    - SL, TP, direction and symbol index kept in NumPy arrays (one row per
+      trade, swap-remove on close) so SL/TP checks are vectorized
+    Iteration walks a snapshot, so trades may be added/removed while iterating.
+    """
+
+    INITIAL_CAPACITY = 64
+    # Below this many trades a plain loop beats NumPy's per-call overhead
+    VECTORIZE_MIN_TRADES = 32
+
+    def __init__(self):
+        self._trades: Dict[int, Trade] = {}  # id(trade) -> trade, in insertion order
+        # id(trade) -> (trade_id, symbol, direction, chain_id, strategy) as indexed
+        self._indexed: Dict[int, Tuple] = {}
+        self._by_trade_id: Dict[Any, Dict[int, Trade]] = {}
+        self._by_symbol: Dict[str, Dict[int, Trade]] = {}
+        self._by_symbol_direction: Dict[Tuple[str, str], Dict[int, Trade]] = {}
+        self._by_chain: Dict[str, Dict[int, Trade]] = {}
+        self._by_strategy: Dict[str, Dict[int, Trade]] = {}
+        
+        # Columnar SL/TP levels - rows [0, len) are live, row i belongs to _row_trades[i]
+        self._row_of: Dict[int, int] = {}
+        self._row_trades: List[Trade] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._sl = np.zeros(self.INITIAL_CAPACITY)
+        self._tp = np.zeros(self.INITIAL_CAPACITY)
+        self._is_buy = np.zeros(self.INITIAL_CAPACITY, dtype=bool)
+        self._symbol_idx = np.zeros(self.INITIAL_CAPACITY, dtype=np.int32)
+
+    def add(self, trade: Trade) -> bool:
+        """Add a trade (no-op if it is already in the book)"""
+        key = id(trade)
+        if key in self._trades:
+            return False
+        self._trades[key] = trade
+        self._indexed[key] = (trade.trade_id, trade.symbol, trade.direction, trade.chain_id, trade.strategy)
+        if trade.trade_id is not None:
+            self._index(self._by_trade_id, trade.trade_id, key, trade)
+        self._index(self._by_symbol, trade.symbol, key, trade)
+        self._index(self._by_symbol_direction, (trade.symbol, trade.direction), key, trade)
+        if trade.chain_id:
+            self._index(self._by_chain, trade.chain_id, key, trade)
+        self._index(self._by_strategy, trade.strategy, key, trade)
+        self._add_row(key, trade)
+        return True
+
+    def remove(self, trade: Trade) -> bool:
+        """Remove a trade (no-op if it is not in the book)"""
+        key = id(trade)
+        if self._trades.pop(key, None) is None:
+            return False
+        # Unindex by the values it was indexed under, even if fields changed since
+        trade_id, symbol, direction, chain_id, strategy = self._indexed.pop(key)
+        if trade_id is not None:
+            self._unindex(self._by_trade_id, trade_id, key)
+        self._unindex(self._by_symbol, symbol, key)
+        self._unindex(self._by_symbol_direction, (symbol, direction), key)
+        if chain_id:
+            self._unindex(self._by_chain, chain_id, key)
+        self._unindex(self._by_strategy, strategy, key)
+        self._remove_row(key)
+        return True
+
+    def reindex(self, trade: Trade):
+        """Refresh indexes after e.g. trade_id / chain_id was assigned to a booked trade"""
+        if self.remove(trade):
+            self.add(trade)
+
+    def _add_row(self, key: int, trade: Trade):
+        row = len(self._row_trades)
+        if row == len(self._sl):
+            # Grow all columns together (amortized O(1))
+            capacity = len(self._sl) * 2
+            self._sl = np.resize(self._sl, capacity)
+            self._tp = np.resize(self._tp, capacity)
+            self._is_buy = np.resize(self._is_buy, capacity)
+            self._symbol_idx = np.resize(self._symbol_idx, capacity)
+        
+        symbol_id = self._symbol_ids.get(trade.symbol)
+        if symbol_id is None:
+            symbol_id = len(self._symbol_ids)
+            self._symbol_ids[trade.symbol] = symbol_id
+        
+        self._sl[row] = trade.sl
+        self._tp[row] = trade.tp
+        self._is_buy[row] = trade.direction == "buy"
+        self._symbol_idx[row] = symbol_id
+        self._row_of[key] = row
+        self._row_trades.append(trade)
+
+    def _remove_row(self, key: int):
+        """Move the last row into the freed slot - O(1), no shifting"""
+        row = self._row_of.pop(key)
+        last = len(self._row_trades) - 1
+        if row != last:
+            moved = self._row_trades[last]
+            self._sl[row] = self._sl[last]
+            self._tp[row] = self._tp[last]
+            self._is_buy[row] = self._is_buy[last]
+            self._symbol_idx[row] = self._symbol_idx[last]
+            self._row_trades[row] = moved
+            self._row_of[id(moved)] = row
+        self._row_trades.pop()
+
+    def evaluate_levels(self, prices: Dict[str, float]) -> Tuple[List[Trade], List[Trade]]:
+        """
+        Vectorized SL/TP check for every open trade against one price per symbol
+        Returns (sl_hit, tp_hit). Symbols without a price (missing or 0) are skipped;
+        a trade that hits SL is not also reported as TP.
+        """
+        count = len(self._row_trades)
+        if count == 0:
+            return [], []
+        
+        if count < self.VECTORIZE_MIN_TRADES:
+            sl_hits, tp_hits = [], []
+            for trade in self._row_trades:
+                price = prices.get(trade.symbol) or 0.0
+                if not price:
+                    continue
+                if (price <= trade.sl) if trade.direction == "buy" else (price >= trade.sl):
+                    sl_hits.append(trade)
+                elif (price >= trade.tp) if trade.direction == "buy" else (price <= trade.tp):
+                    tp_hits.append(trade)
+            return sl_hits, tp_hits
+        
+        price_by_symbol = np.zeros(len(self._symbol_ids))
+        for symbol, symbol_id in self._symbol_ids.items():
+            price_by_symbol[symbol_id] = prices.get(symbol) or 0.0
+        
+        price = price_by_symbol[self._symbol_idx[:count]]
+        is_buy = self._is_buy[:count]
+        sl = self._sl[:count]
+        tp = self._tp[:count]
+        
+        has_price = price != 0
+        sl_hit = has_price & np.where(is_buy, price <= sl, price >= sl)
+        tp_hit = has_price & ~sl_hit & np.where(is_buy, price >= tp, price <= tp)
+        
+        rows = self._row_trades
+        return ([rows[i] for i in np.flatnonzero(sl_hit)],
+                [rows[i] for i in np.flatnonzero(tp_hit)])
+
+    @staticmethod
+    def _index(index: Dict, value, key: int, trade: Trade):
+        bucket = index.get(value)
+        if bucket is None:
+            bucket = {}
+            index[value] = bucket
+        bucket[key] = trade
+
+    @staticmethod
+    def _unindex(index: Dict, value, key: int):
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del index[value]
+
+    # Lookups - each returns a snapshot list
+    def get(self, trade_id: Any) -> Optional[Trade]:
+        bucket = self._by_trade_id.get(trade_id)
+        return next(iter(bucket.values())) if bucket else None
+
+    def by_trade_id(self, trade_id: Any) -> List[Trade]:
+        return list(self._by_trade_id.get(trade_id, {}).values())
+
+    def by_symbol(self, symbol: str) -> List[Trade]:
+        return list(self._by_symbol.get(symbol, {}).values())
+
+    def by_symbol_direction(self, symbol: str, direction: str) -> List[Trade]:
+        return list(self._by_symbol_direction.get((symbol, direction), {}).values())
+
+    def by_chain(self, chain_id: str) -> List[Trade]:
+        return list(self._by_chain.get(chain_id, {}).values())
+
+    def by_strategy(self, strategy: str) -> List[Trade]:
+        return list(self._by_strategy.get(strategy, {}).values())
+
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol.keys())
+
+    def __contains__(self, trade: Trade) -> bool:
+        return id(trade) in self._trades
+
+    def __len__(self) -> int:
+        return len(self._trades)
+
+    def __iter__(self) -> Iterator[Trade]:
+        return iter(list(self._trades.values()))
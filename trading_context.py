@@ -0,0 +1,137 @@
+from bisect import bisect_right
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+from config import Config
+
+ACCOUNT_TIERS = ("5000", "10000", "25000", "50000", "100000")
+
+# SL tables switch tier halfway between tier balances (7,500 -> "10000" ...)
+SL_TIER_BOUNDS = (7500, 17500, 37500, 75000)
+# Risk limits use the tier the balance has reached (below 5,000 -> "5000")
+RISK_TIER_BOUNDS = (10000, 25000, 50000, 100000)
+
+def sl_tier(balance: float) -> str:
+    """Account tier for SL tables (dual SL system, fallback risk caps)"""
+    return ACCOUNT_TIERS[bisect_right(SL_TIER_BOUNDS, balance)]
+
+def risk_tier(balance: float) -> str:
+    """Account tier for daily / lifetime loss limits"""
+    return ACCOUNT_TIERS[bisect_right(RISK_TIER_BOUNDS, balance)]
+
+
+class TierLevels(NamedTuple):
+    """Precomputed entry levels for one symbol at one account tier"""
+    sl_pips: float               # after symbol reduction
+    sl_pips_original: float      # as configured (before reduction)
+    sl_distance: float           # sl_pips * pip_size
+    tp_distance: float           # sl_distance * rr_ratio
+    risk_cap: Optional[float]    # dollars, for validate_trade_risk
+    source: str                  # "sl_system" / "fallback" / "missing" (SL table entry not found)
+
+
+class SymbolContext(NamedTuple):
+    pip_size: float
+    pip_value_per_std_lot: float
+    volatility: str
+    reduction_percent: float
+    tiers: Tuple[Optional[TierLevels], ...]  # indexed like ACCOUNT_TIERS
+
+
+class TradingContext:
+    """
+    Compiled per-symbol / per-tier trading tables
+    - Flattens symbol_config, the active SL system, symbol_sl_reductions,
+      rr_ratio, risk caps and fixed lot sizes into lookup tables
+    - Recompiled lazily when Config.version changes (every update() /
+      save_config()), so entry-time sizing never walks nested config dicts
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+        self._version = None
+        self._symbols: Dict[str, SymbolContext] = {}
+        self._lot_bounds: List[int] = []
+        self._lot_sizes: List[float] = []
+        self._manual_lots: Dict[str, float] = {}
+        self.compilations = 0
+
+    def _ensure(self):
+        if self._version != self.config.version:
+            self._compile()
+
+    def _compile(self):
+        config = self.config
+        version = config.version
+        active_system = config.get("active_sl_system", "sl-1")
+        sl_system_enabled = config.get("sl_system_enabled", True)
+        sl_table = config.get("sl_systems", {}).get(active_system, {}).get("symbols", {})
+        reductions = config.get("symbol_sl_reductions", {})
+        risk_by_tier = config.get("risk_by_account_tier", {})
+        fixed_lots = config.get("fixed_lot_sizes", {})
+        rr_ratio = config.get("rr_ratio", 1.0)
+
+        symbols = {}
+        for symbol, symbol_config in config.get("symbol_config", {}).items():
+            pip_size = symbol_config["pip_size"]
+            pip_value_std = symbol_config["pip_value_per_std_lot"]
+            volatility = symbol_config["volatility"]
+            reduction = reductions.get(symbol, 0)
+
+            tiers = []
+            for tier in ACCOUNT_TIERS:
+                fallback_cap = risk_by_tier.get(tier, {}).get(volatility, {}).get("risk_dollars")
+                sl_data = sl_table.get(symbol, {}).get(tier)
+
+                if sl_system_enabled and sl_data is not None:
+                    original = sl_data["sl_pips"]
+                    sl_pips = original * (1 - reduction / 100) if symbol in reductions else original
+                    source = "sl_system"
+                elif fallback_cap is not None:
+                    # Old risk-cap based SL: risk dollars / pip value at the tier's fixed lot
+                    original = sl_pips = fallback_cap / (pip_value_std * fixed_lots.get(tier, 0.05))
+                    source = "fallback" if not sl_system_enabled else "missing"
+                else:
+                    tiers.append(None)
+                    continue
+
+                sl_distance = sl_pips * pip_size
+                risk_cap = sl_data["risk_dollars"] if sl_data is not None else fallback_cap
+                tiers.append(TierLevels(sl_pips, original, sl_distance, sl_distance * rr_ratio, risk_cap, source))
+
+            symbols[symbol] = SymbolContext(pip_size, pip_value_std, volatility, reduction, tuple(tiers))
+
+        lot_tiers = sorted(fixed_lots.items(), key=lambda item: int(item[0]))
+        self._lot_bounds = [int(tier) for tier, _ in lot_tiers]
+        self._lot_sizes = [lot for _, lot in lot_tiers]
+        self._manual_lots = dict(config.get("manual_lot_overrides", {}))
+        self._symbols = symbols
+        self._version = version
+        self.compilations += 1
+
+    def symbol(self, symbol: str) -> SymbolContext:
+        self._ensure()
+        return self._symbols[symbol]
+
+    def levels(self, symbol: str, balance: float) -> TierLevels:
+        """SL / TP / risk cap for a symbol at the balance's SL tier"""
+        self._ensure()
+        tier_index = bisect_right(SL_TIER_BOUNDS, balance)
+        levels = self._symbols[symbol].tiers[tier_index]
+        if levels is None:
+            raise KeyError(f"No SL data for {symbol} @ {ACCOUNT_TIERS[tier_index]}")
+        return levels
+
+    def lot_size(self, balance: float) -> float:
+        """Fixed lot size: manual override for the exact balance, else the highest tier reached"""
+        self._ensure()
+        manual = self._manual_lots.get(str(int(balance)))
+        if manual is not None:
+            return manual
+        index = bisect_right(self._lot_bounds, balance)
+        return self._lot_sizes[index - 1] if index else 0.05  # Default minimum
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "config_version": self._version,
+            "compilations": self.compilations,
+            "symbols": len(self._symbols)
+        }
@@ -1,6 +1,7 @@
 import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Set, Union
 from models import Alert, Trade, ReEntryChain
 from config import Config
 from risk_manager import RiskManager
@@ -12,6 +13,14 @@ from timeframe_trend_manager import TimeframeTrendManager
 from reentry_manager import ReEntryManager
 from price_monitor_service import PriceMonitorService
 from reversal_exit_handler import ReversalExitHandler
+from trend_coalescer import TrendUpdateCoalescer
+from decision_audit import DecisionAuditLog
+from trade_book import TradeBook
+from mt5_executor import AsyncMT5Client, MT5CallTimeout
+from account_state import AccountStateCache
+from engine_state import EngineStateActor
+from order_netting import OrderNetter, NettingLeg
+from strategy_registry import StrategyRegistry
 import json
 
 class TradingEngine:
@@ -30,9 +39,25 @@ class TradingEngine:
         # Database for trade history
         self.db = TradeDatabase()
         
+        # Every MT5 call runs on the client's dedicated executor thread (the MT5
+        # API is not thread-safe) so it never stalls the event loop
+        self.mt5_executor = mt5_client.executor
+        self.mt5 = AsyncMT5Client(mt5_client, self.mt5_executor)
+        
+        # Cached balance / equity / margin, refreshed in the background and
+        # invalidated by every fill or close
+        self.account_state = AccountStateCache(config, self.mt5)
+        self.mt5.add_trade_listener(self.account_state.invalidate)
+        self.risk_manager.set_account_state(self.account_state)
+        
+        # Per-symbol locks: same-symbol work strictly ordered, symbols interleave
+        self._symbol_locks: Dict[str, asyncio.Lock] = {}
+        
         # Core managers
         self.pip_calculator = PipCalculator(config)
-        self.trend_manager = TimeframeTrendManager()
+        # Strategy definitions (entry tf, alignment tfs, enabled) - routing tables
+        self.strategies = StrategyRegistry(config)
+        self.trend_manager = TimeframeTrendManager(strategies=self.strategies)
         self.reentry_manager = ReEntryManager(config)
         
         # NEW: Advanced re-entry and exit handlers
@@ -41,27 +66,45 @@ class TradingEngine:
             self.trend_manager, self.pip_calculator, self
         )
         self.reversal_handler = ReversalExitHandler(
-            config, mt5_client, telegram_bot, self.db, price_monitor=self.price_monitor
+            config, mt5_client, telegram_bot, self.db, price_monitor=self.price_monitor,
+            mt5=self.mt5
         )
         
         # Current signals per symbol
         self.current_signals = {}
         
-        self.open_trades: List[Trade] = []
+        # Bias/trend bursts are applied once per (symbol, tf) window
+        self.trend_coalescer = TrendUpdateCoalescer(config, self)
+        
+        # Final decision for every alert (buffered, bulk-inserted)
+        self.decision_audit = DecisionAuditLog(config)
+        
+        # Indexed open-trade book, shared with the risk manager
+        self.open_trades = TradeBook()
+        self.risk_manager.set_trade_book(self.open_trades)
+        mt5_client.tick_cache.set_active_symbols(self.active_symbols)
         self.is_paused = False
         self.trade_count = 0
         
-        # Logic control flags
-        self.logic1_enabled = True
-        self.logic2_enabled = True  
-        self.logic3_enabled = True
+        # Single writer for trades / chains / flags; readers use its snapshots
+        self.state = EngineStateActor(config, self)
+        
+        # Optional: same-symbol / same-direction entries sent as one order
+        self.order_netter = OrderNetter(config, self)
+        self._netting_legs: Dict[str, List[NettingLeg]] = {}  # symbol -> legs of the group in progress
 
     async def initialize(self):
         """Initialize the trading engine"""
-        success = self.mt5_client.initialize()
+        success = await self.mt5.initialize()
         if success:
             self.telegram_bot.send_message("✅ MT5 Connection Established")
             self.telegram_bot.set_trend_manager(self.trend_manager)
+            await self.account_state.start()
+            await self.mt5_client.symbol_cache.start(self.mt5)
+            await self.mt5_client.tick_cache.start(self.mt5)
+            self.mt5_client.watchdog.add_listener(self._on_mt5_connection)
+            await self.mt5_client.watchdog.start(self.mt5)
+            await self.state.start()
             
             # Start background price monitor
             await self.price_monitor.start()
@@ -70,6 +113,26 @@ class TradingEngine:
             print("✅ Price monitor service started")
         return success
 
+    def _on_mt5_connection(self, state: str):
+        """Watchdog state change -> Telegram"""
+        if state == "connected":
+            self.telegram_bot.send_message("✅ MT5 connection restored")
+        else:
+            self.telegram_bot.send_message("⚠️ MT5 terminal disconnected - reconnecting in the background\n"
+                                           f"Orders: {self.mt5_client.watchdog.on_disconnect}")
+
+    def symbol_lock(self, symbol: str) -> asyncio.Lock:
+        """Lock serializing all alert / re-entry work for one symbol"""
+        lock = self._symbol_locks.get(symbol)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._symbol_locks[symbol] = lock
+        return lock
+
+    async def run_broker(self, fn, *args, **kwargs):
+        """Run a blocking MT5 call on the MT5 executor thread"""
+        return await self.mt5.run(fn, *args, **kwargs)
+
     def initialize_symbol_signals(self, symbol: str):
         """Initialize signal tracking for a new symbol"""
         if symbol not in self.current_signals:
@@ -80,14 +143,50 @@ class TradingEngine:
                 '1d': None
             }
 
-    async def process_alert(self, data: Dict[str, Any]) -> bool:
-        """Process incoming alert from webhook"""
+    async def process_alert(self, data: Union[Alert, Dict[str, Any]], signal_applied: bool = False) -> bool:
+        """
+        Process incoming alert from webhook
+        Accepts the Alert already validated by AlertProcessor (no rebuild),
+        or a raw dict from internal callers. Alerts for the same symbol run
+        strictly in order; different symbols run concurrently.
+        signal_applied: bias/trend state already applied (batch pre-pass)
+        """
+        if isinstance(data, Alert) and self.order_netter.eligible(data):
+            return await self.order_netter.submit(data)
+        symbol = data.symbol if isinstance(data, Alert) else data.get("symbol")
+        # Entries held for netting arrived first - they run first
+        await self.order_netter.flush(symbol)
+        async with self.symbol_lock(symbol):
+            return await self._process_alert(data, signal_applied)
+
+    async def process_netted(self, alerts: List[Alert]) -> List[bool]:
+        """
+        Process a group of same-symbol / same-direction entry alerts (order netting)
+        Each alert runs the normal path; fresh orders among them are sent as one
+        aggregated MT5 order, then booked as separate trades
+        """
+        symbol = alerts[0].symbol
+        async with self.symbol_lock(symbol):
+            legs = self._netting_legs[symbol] = []
+            try:
+                results = [await self._process_alert(alert) for alert in alerts]
+            finally:
+                del self._netting_legs[symbol]
+            if legs:
+                await self.place_netted_order(legs)
+            return results
+
+    async def _process_alert(self, data: Union[Alert, Dict[str, Any]], signal_applied: bool = False) -> bool:
+        started = time.perf_counter()
+        alert = data
         try:
-            alert = Alert(**data)
+            alert = data if isinstance(data, Alert) else Alert(**data)
             symbol = alert.symbol
+            decision = {"decision": "applied", "stage": alert.type}
             
             # Initialize symbol signals if not exists
-            self.initialize_symbol_signals(symbol)
+            if symbol not in self.current_signals:
+                await self.state.execute(self.initialize_symbol_signals, symbol)
             
             # NEW: Check for reversal exit FIRST before processing other alerts
             if alert.type in ['reversal', 'trend', 'entry', 'exit']:
@@ -95,39 +194,37 @@ class TradingEngine:
                     alert, self.open_trades
                 )
                 
-                for close_info in trades_to_close:
-                    await self.reversal_handler.execute_reversal_exit(
-                        close_info['trade'],
-                        close_info['exit_price'],
-                        close_info['exit_reason']
-                    )
-                    # Remove from open trades
-                    if close_info['trade'] in self.open_trades:
-                        self.open_trades.remove(close_info['trade'])
-                        self.risk_manager.remove_closed_trade(close_info['trade'])
-                    
-                    # Stop TP continuation monitoring for this symbol (opposite signal received)
-                    self.price_monitor.stop_tp_continuation(
-                        close_info['trade'].symbol, 
-                        f"Exit due to {close_info['exit_reason']}"
-                    )
+                # All matched trades close as one batch (MT5 closes back-to-back,
+                # one DB commit, one notification)
+                closed = await self.reversal_handler.execute_reversal_exits(trades_to_close, self.open_trades)
+                # Book the exits (MT5 close failures stay open)
+                closed_ids = {id(trade) for trade in closed}
+                closed_infos = [info for info in trades_to_close if id(info['trade']) in closed_ids]
+                if closed_infos:
+                    await self.state.execute(self.book_reversal_exits, closed_infos)
             
             # Update based on alert type
-            if alert.type == 'bias':
+            if alert.type in ('bias', 'trend') and self.trend_coalescer.enabled:
+                # Coalesced - latest state per (symbol, tf) is applied when the window closes
+                self.trend_coalescer.submit(alert)
+            
+            elif alert.type == 'bias':
                 # Update timeframe trend for bias
-                self.trend_manager.update_trend(symbol, alert.tf, alert.signal)
-                self.current_signals[symbol][alert.tf] = alert.signal
+                if not signal_applied:
+                    await self.state.execute(self.apply_signal, symbol, alert.tf, alert.signal)
                 self.telegram_bot.send_message(f"📊 {symbol} {alert.tf.upper()} Bias Updated: {alert.signal.upper()}")
                 
             elif alert.type == 'trend':
                 # Update timeframe trend for trend signals
-                self.trend_manager.update_trend(symbol, alert.tf, alert.signal)
-                self.current_signals[symbol][alert.tf] = alert.signal
+                if not signal_applied:
+                    await self.state.execute(self.apply_signal, symbol, alert.tf, alert.signal)
                 self.telegram_bot.send_message(f"📊 {symbol} {alert.tf.upper()} Trend Updated: {alert.signal.upper()}")
             
             elif alert.type == 'entry':
+                # Apply any coalesced trend updates for this symbol first
+                await self.trend_coalescer.flush(symbol)
                 # Execute trade based on entry signal
-                await self.execute_trades(alert)
+                decision = await self.execute_trades(alert)
             
             elif alert.type == 'reversal':
                 # Reversal alerts are handled above in exit check
@@ -138,50 +235,112 @@ class TradingEngine:
                 exit_direction = "Bullish" if alert.signal == 'bull' else "Bearish"
                 self.telegram_bot.send_message(f"⚠️ {symbol} Exit Appeared: {exit_direction}")
             
+            if decision["decision"] == "netted":
+                decision["started"] = started  # audited once the netted order is placed
+            else:
+                self.decision_audit.record(alert, latency_ms=(time.perf_counter() - started) * 1000, **decision)
             return True
             
         except Exception as e:
+            self.decision_audit.record(alert, "error", "processing", "processing_error", detail=str(e),
+                                       latency_ms=(time.perf_counter() - started) * 1000)
             error_msg = f"Alert processing error: {str(e)}"
             self.telegram_bot.send_message(f"❌ {error_msg}")
             print(f"Error: {e}")
             return False
 
-    async def execute_trades(self, alert: Alert):
-        """Execute trades based on current mode and alert"""
-        if self.is_paused:
-            return
-            
-        symbol = alert.symbol
+    # Batch processing order: trend state first, then exits, then entries
+    BATCH_ORDER = {'bias': 0, 'trend': 0, 'reversal': 1, 'exit': 1, 'entry': 2}
+
+    async def process_alert_batch(self, alerts: List[Alert]) -> List[bool]:
+        """
+        Process several validated alerts in one pass (ingest queue disabled)
+        Trend/bias state is applied first as one state command (one trends file
+        write, nothing awaited while the save is deferred), then exits and
+        entries run so entries see the newest trend state. Each alert takes its
+        symbol lock like process_alert. DB rows are not batched into one
+        transaction: they commit per operation, since broker orders are awaited
+        in between. Results are returned in input order.
+        """
+        order = sorted(range(len(alerts)),
+                       key=lambda i: self.BATCH_ORDER.get(alerts[i].type, 2))
+        results = [False] * len(alerts)
         
-        # Check if specific logic is enabled
-        if alert.tf == '5m' and not self.logic1_enabled:
-            return
-        if alert.tf == '15m' and not self.logic2_enabled:
-            return
-        if alert.tf == '1h' and not self.logic3_enabled:
-            return
-            
-        # Check risk limits before trading
-        if not self.risk_manager.can_trade():
+        signal_applied = False
+        if not self.trend_coalescer.enabled:
+            trend_alerts = [alerts[i] for i in order if alerts[i].type in ('bias', 'trend')]
+            if trend_alerts:
+                await self.state.execute(self.apply_signals, trend_alerts)
+                signal_applied = True
+        
+        netted: Dict[tuple, List[int]] = {}
+        flushed = set()
+        for i in order:
+            alert = alerts[i]
+            if alert.type == 'entry' and alert.symbol not in flushed:
+                # Coalesced trend updates from this batch land before its entries
+                flushed.add(alert.symbol)
+                await self.trend_coalescer.flush(alert.symbol)
+            if self.order_netter.eligible(alert):
+                netted.setdefault((alert.symbol, alert.signal), []).append(i)
+                continue
+            results[i] = await self.process_alert(alert, signal_applied)
+        
+        # Netted entries: one group (and one order) per symbol / direction, no window wait
+        for indexes in netted.values():
+            await self.order_netter.flush(alerts[indexes[0]].symbol)
+            group_results = await self.process_netted([alerts[i] for i in indexes])
+            for i, result in zip(indexes, group_results):
+                results[i] = result
+        
+        return results
+
+    async def execute_trades(self, alert: Alert) -> Dict[str, Any]:
+        """
+        Execute trades based on current mode and alert
+        Returns the decision (stage reached, reject reason, SL/TP) for the audit log
+        """
+        if self.is_paused:
+            return {"decision": "rejected", "stage": "paused", "reason": "trading_paused"}
+            
+        # Strategies taking entries on this timeframe (strategy registry dispatch table)
+        strategies = self.strategies.enabled_for_timeframe(alert.tf)
+        registered = self.strategies.for_timeframe(alert.tf)
+        if registered and not strategies:
+            return {"decision": "rejected", "stage": "logic", "reason": "logic_disabled",
+                    "logic": registered[0].name}
+            
+        # Check risk limits before trading - never size or gate on an unknown balance
+        account_balance = await self.account_state.get_balance()
+        if account_balance is None:
+            return {"decision": "rejected", "stage": "risk", "reason": "balance_unknown"}
+        if not self.risk_manager.can_trade(account_balance):
             self.telegram_bot.send_message("⛔ Trading paused due to risk limits")
-            return
-        
-        # Determine which logic this trade belongs to
-        if alert.tf == '5m':
-            logic = "LOGIC1"
-        elif alert.tf == '15m':
-            logic = "LOGIC2"
-        elif alert.tf == '1h':
-            logic = "LOGIC3"
-        else:
-            return
+            return {"decision": "rejected", "stage": "risk", "reason": "risk_limits"}
+        
+        if not strategies:
+            return {"decision": "rejected", "stage": "logic", "reason": "no_logic_for_timeframe"}
+        
+        # Several strategies on one timeframe each get their own trade; the
+        # alert's audit decision is the first executed one (else the last)
+        decision = None
+        for spec in strategies:
+            result = await self.execute_strategy(alert, spec.name)
+            if decision is None or decision["decision"] not in ("executed", "netted"):
+                decision = result
+        return decision
+
+    async def execute_strategy(self, alert: Alert, logic: str) -> Dict[str, Any]:
+        """Alignment check, then fresh or re-entry order for one strategy"""
+        symbol = alert.symbol
         
         # Check trend alignment for the logic
         alignment = self.trend_manager.check_logic_alignment(symbol, logic)
         
         if not alignment["aligned"]:
             print(f"❌ Trend not aligned for {logic}: {alignment['details']}")
-            return
+            return {"decision": "rejected", "stage": "alignment", "reason": "trend_not_aligned",
+                    "logic": logic, "alignment": alignment}
         
         # Check if signal matches the aligned direction
         signal_direction = "BULLISH" if alert.signal == "buy" else "BEARISH"
@@ -193,45 +352,42 @@ class TradingEngine:
             )
             
             if reentry_info["is_reentry"]:
-                await self.place_reentry_order(alert, logic, reentry_info)
+                decision = await self.place_reentry_order(alert, logic, reentry_info)
             else:
-                await self.place_fresh_order(alert, logic)
+                decision = await self.place_fresh_order(alert, logic)
         else:
             print(f"❌ Signal {signal_direction} doesn't match trend {alignment['direction']}")
+            decision = {"decision": "rejected", "stage": "alignment", "reason": "signal_mismatch"}
+        
+        decision.update(logic=logic, alignment=alignment)
+        return decision
 
-    async def place_fresh_order(self, alert: Alert, strategy: str):
-        """Place a new trade order"""
+    async def place_fresh_order(self, alert: Alert, strategy: str) -> Dict[str, Any]:
+        """Place a new trade order - returns the audit decision"""
         try:
             # Get account balance and lot size
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.account_state.get_balance()
             lot_size = self.risk_manager.get_fixed_lot_size(account_balance)
             
             if lot_size <= 0:
                 self.telegram_bot.send_message("⚠️ Invalid lot size")
-                return
+                return {"decision": "rejected", "stage": "sizing", "reason": "invalid_lot_size"}
             
-            # Get symbol config for logging
-            symbol_config = self.config["symbol_config"][alert.symbol]
+            # SL / TP from the compiled symbol / tier table
+            symbol_context = self.pip_calculator.context.symbol(alert.symbol)
             account_tier = self.pip_calculator._get_account_tier(account_balance)
-            
-            # Calculate SL and TP using pip calculator
-            sl_price, sl_distance = self.pip_calculator.calculate_sl_price(
-                alert.symbol, alert.price, alert.signal, lot_size, account_balance
-            )
-            
-            tp_price = self.pip_calculator.calculate_tp_price(
-                alert.price, sl_price, alert.signal, self.config["rr_ratio"]
+            sl_price, sl_distance, tp_price, sl_pips = self.pip_calculator.entry_levels(
+                alert.symbol, alert.price, alert.signal, account_balance
             )
             
             # Log SL/TP calculation details
-            sl_pips = abs(alert.price - sl_price) / symbol_config["pip_size"]
-            tp_pips = abs(tp_price - alert.price) / symbol_config["pip_size"]
+            tp_pips = abs(tp_price - alert.price) / symbol_context.pip_size
             print(f"📊 SL/TP Calculation:")
             print(f"   Symbol: {alert.symbol} | Lot: {lot_size:.2f}")
             print(f"   Entry: {alert.price:.5f}")
             print(f"   SL: {sl_price:.5f} ({sl_pips:.1f} pips)")
             print(f"   TP: {tp_price:.5f} ({tp_pips:.1f} pips)")
-            print(f"   Risk: ${account_tier} tier | Volatility: {symbol_config['volatility']}")
+            print(f"   Risk: ${account_tier} tier | Volatility: {symbol_context.volatility}")
             
             # Validate trade risk before execution
             validation = self.pip_calculator.validate_trade_risk(
@@ -263,9 +419,17 @@ class TradingEngine:
                 original_sl_distance=sl_distance
             )
             
+            # Order netting: sent with the rest of its group by place_netted_order
+            legs = self._netting_legs.get(alert.symbol)
+            if legs is not None:
+                decision = {"decision": "netted", "stage": "order", "sl": sl_price, "tp": tp_price,
+                            "lot_size": lot_size}
+                legs.append(NettingLeg(alert, trade, strategy, decision))
+                return decision
+            
             # Execute trade
             if not self.config["simulate_orders"]:
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.mt5.place_order(
                     symbol=alert.symbol,
                     order_type=alert.signal,
                     lot_size=lot_size,
@@ -278,52 +442,87 @@ class TradingEngine:
                     trade.trade_id = trade_id
                 else:
                     self.telegram_bot.send_message(f"❌ Order placement failed for {alert.symbol}")
-                    return
+                    return {"decision": "rejected", "stage": "order", "reason": "order_failed",
+                            "sl": sl_price, "tp": tp_price, "lot_size": lot_size}
             
-            # Create re-entry chain for this trade
-            chain = self.reentry_manager.create_chain(trade)
-            
-            # NEW: Register for SL hunt monitoring (preemptively)
-            if self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
-                self.price_monitor.register_sl_hunt(trade, strategy)
-            
-            self.open_trades.append(trade)
-            self.risk_manager.add_open_trade(trade)
-            self.trade_count += 1
+            return await self.book_fresh_order(alert, trade, strategy)
             
-            # Send notification
-            rr_ratio = self.config["rr_ratio"]
-            message = (
-                f"🎯 NEW TRADE #{self.trade_count}\n"
-                f"Strategy: {strategy}\n"
-                f"Symbol: {alert.symbol}\n"
-                f"Direction: {alert.signal.upper()}\n"
-                f"Entry: {alert.price:.5f}\n"
-                f"SL: {sl_price:.5f}\n"
-                f"TP: {tp_price:.5f}\n"
-                f"Lots: {lot_size:.2f}\n"
-                f"Risk: 1:{rr_ratio} RR"
-            )
-            self.telegram_bot.send_message(message)
+        except MT5CallTimeout as e:
+            # The order may still fill late - the executor logs its outcome
+            self.telegram_bot.send_message(f"⏱️ MT5 did not answer in time for {alert.symbol} - check the terminal")
+            print(f"Error: {e}")
+            return {"decision": "error", "stage": "order", "reason": "broker_timeout", "detail": str(e)}
             
         except Exception as e:
             error_msg = f"Trade execution error: {str(e)}"
             self.telegram_bot.send_message(f"❌ {error_msg}")
             print(f"Error: {e}")
+            return {"decision": "error", "stage": "order", "reason": "execution_error", "detail": str(e)}
 
-    async def place_reentry_order(self, alert: Alert, strategy: str, reentry_info: Dict):
-        """Place a re-entry trade"""
+    async def book_fresh_order(self, alert: Alert, trade: Trade, strategy: str) -> Dict[str, Any]:
+        """Book a filled fresh order and notify - returns the executed decision"""
+        # Book it: re-entry chain, SL hunt monitoring, open-trade book
+        await self.state.execute(self.book_fresh_trade, trade, strategy)
+        
+        # Send notification
+        rr_ratio = self.config["rr_ratio"]
+        message = (
+            f"🎯 NEW TRADE #{self.trade_count}\n"
+            f"Strategy: {strategy}\n"
+            f"Symbol: {alert.symbol}\n"
+            f"Direction: {alert.signal.upper()}\n"
+            f"Entry: {alert.price:.5f}\n"
+            f"SL: {trade.sl:.5f}\n"
+            f"TP: {trade.tp:.5f}\n"
+            f"Lots: {trade.lot_size:.2f}\n"
+            f"Risk: 1:{rr_ratio} RR"
+        )
+        self.telegram_bot.send_message(message)
+        return {"decision": "executed", "stage": "order", "sl": trade.sl, "tp": trade.tp,
+                "lot_size": trade.lot_size, "trade_id": trade.trade_id}
+
+    async def place_netted_order(self, legs: List[NettingLeg]):
+        """One MT5 order for all legs of a netting group, then book each leg as its own trade"""
+        symbol = legs[0].alert.symbol
+        outcome = None
+        try:
+            if not self.config["simulate_orders"]:
+                ticket = await self.order_netter.place(legs)
+                if ticket:
+                    for leg in legs:
+                        leg.trade.trade_id = ticket
+                else:
+                    self.telegram_bot.send_message(f"❌ Netted order placement failed for {symbol} ({len(legs)} entries)")
+                    outcome = {"decision": "rejected", "stage": "order", "reason": "order_failed"}
+        except MT5CallTimeout as e:
+            # The order may still fill late - the executor logs its outcome
+            self.telegram_bot.send_message(f"⏱️ MT5 did not answer in time for {symbol} - check the terminal")
+            print(f"Error: {e}")
+            outcome = {"decision": "error", "stage": "order", "reason": "broker_timeout", "detail": str(e)}
+        except Exception as e:
+            self.telegram_bot.send_message(f"❌ Trade execution error: {str(e)}")
+            print(f"Error: {e}")
+            outcome = {"decision": "error", "stage": "order", "reason": "execution_error", "detail": str(e)}
+        
+        for leg in legs:
+            decision = leg.decision
+            started = decision.pop("started", None)
+            decision.update(outcome or await self.book_fresh_order(leg.alert, leg.trade, leg.strategy))
+            latency_ms = (time.perf_counter() - started) * 1000 if started else None
+            self.decision_audit.record(leg.alert, latency_ms=latency_ms, **decision)
+
+    async def place_reentry_order(self, alert: Alert, strategy: str, reentry_info: Dict) -> Dict[str, Any]:
+        """Place a re-entry trade - returns the audit decision"""
         try:
             # Get account balance and lot size
-            account_balance = self.mt5_client.get_account_balance()
+            account_balance = await self.account_state.get_balance()
             lot_size = self.risk_manager.get_fixed_lot_size(account_balance)
             
             # Get original SL distance from chain
             chain = self.reentry_manager.active_chains.get(reentry_info["chain_id"])
             if not chain:
                 # No chain found, place fresh order instead
-                await self.place_fresh_order(alert, strategy)
-                return
+                return await self.place_fresh_order(alert, strategy)
             
             # Calculate adjusted SL distance for re-entry level
             adjusted_sl_distance = self.pip_calculator.adjust_sl_for_reentry(
@@ -360,7 +559,7 @@ class TradingEngine:
             
             # Execute trade
             if not self.config["simulate_orders"]:
-                trade_id = self.mt5_client.place_order(
+                trade_id = await self.mt5.place_order(
                     symbol=alert.symbol,
                     order_type=alert.signal,
                     lot_size=lot_size,
@@ -373,17 +572,14 @@ class TradingEngine:
                     trade.trade_id = trade_id
                 else:
                     self.telegram_bot.send_message(f"❌ Re-entry order failed for {alert.symbol}")
-                    return
+                    return {"decision": "rejected", "stage": "reentry_order", "reason": "order_failed",
+                            "sl": sl_price, "tp": tp_price, "lot_size": lot_size}
             else:
                 # Simulation mode: generate pseudo trade ID
                 trade.trade_id = int(datetime.now().timestamp() * 1000) % 1000000
             
             # Update chain with new trade (both live and simulation modes)
-            self.reentry_manager.update_chain_level(reentry_info["chain_id"], trade.trade_id)
-            
-            self.open_trades.append(trade)
-            self.risk_manager.add_open_trade(trade)
-            self.trade_count += 1
+            await self.state.execute(self.book_chain_trade, trade, reentry_info["chain_id"])
             
             # Send notification
             re_type = "TP Continuation" if reentry_info["type"] == "tp_continuation" else "SL Recovery"
@@ -399,29 +595,38 @@ class TradingEngine:
                 f"Lots: {lot_size:.2f}"
             )
             self.telegram_bot.send_message(message)
+            return {"decision": "executed", "stage": "reentry_order", "sl": sl_price, "tp": tp_price,
+                    "lot_size": lot_size, "trade_id": trade.trade_id}
+            
+        except MT5CallTimeout as e:
+            # The order may still fill late - the executor logs its outcome
+            self.telegram_bot.send_message(f"⏱️ MT5 did not answer in time for {alert.symbol} - check the terminal")
+            print(f"Error: {e}")
+            return {"decision": "error", "stage": "reentry_order", "reason": "broker_timeout", "detail": str(e)}
             
         except Exception as e:
             error_msg = f"Re-entry execution error: {str(e)}"
             self.telegram_bot.send_message(f"❌ {error_msg}")
             print(f"Error: {e}")
+            return {"decision": "error", "stage": "reentry_order", "reason": "execution_error", "detail": str(e)}
 
     async def reconcile_with_mt5(self):
         """Sync bot's trade list with MT5 positions - auto-close orphaned trades"""
         try:
-            import MetaTrader5 as mt5
-            
             # Get all open positions from MT5
-            mt5_positions = mt5.positions_get()
-            mt5_ticket_ids = {pos.ticket for pos in mt5_positions} if mt5_positions else set()
+            mt5_positions = await self.mt5.get_positions()
+            if mt5_positions is None:
+                return  # Terminal unavailable / API error - not "no positions"
+            mt5_ticket_ids = {pos.ticket for pos in mt5_positions}
             
             # Check each bot trade against MT5
-            for trade in self.open_trades[:]:  # Use slice to avoid modifying list during iteration
+            for trade in self.open_trades:  # TradeBook iterates a snapshot
                 if trade.status == "closed":
                     continue
                     
                 if trade.trade_id and trade.trade_id not in mt5_ticket_ids:
                     # Position doesn't exist in MT5 - was auto-closed by TP/SL
-                    current_price = self.mt5_client.get_current_price(trade.symbol)
+                    current_price = await self.mt5.get_current_price(trade.symbol)
                     print(f"🔄 Auto-reconciliation: Position {trade.trade_id} already closed in MT5")
                     await self.close_trade(trade, "MT5_AUTO_CLOSED", current_price)
                     
@@ -436,44 +641,8 @@ class TradingEngine:
                 if not self.config["simulate_orders"]:
                     await self.reconcile_with_mt5()
                 
-                # Remove closed trades from list
-                self.open_trades = [t for t in self.open_trades if t.status != "closed"]
-                
-                for trade in self.open_trades:
-                    if trade.status == "closed":
-                        continue
-                    
-                    # Get current price
-                    current_price = self.mt5_client.get_current_price(trade.symbol)
-                    if current_price == 0:
-                        continue
-                    
-                    # Check SL hit
-                    if ((trade.direction == "buy" and current_price <= trade.sl) or
-                        (trade.direction == "sell" and current_price >= trade.sl)):
-                        await self.close_trade(trade, "SL_HIT", current_price)
-                        self.reentry_manager.record_sl_hit(trade)
-                        
-                        # NEW: Register for SL hunt re-entry monitoring
-                        if self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
-                            self.price_monitor.register_sl_hunt(trade, trade.strategy)
-                        continue
-                    
-                    # Check TP hit
-                    if ((trade.direction == "buy" and current_price >= trade.tp) or
-                        (trade.direction == "sell" and current_price <= trade.tp)):
-                        await self.close_trade(trade, "TP_HIT", current_price)
-                        self.reentry_manager.record_tp_hit(trade, current_price)
-                        
-                        # NEW: Register for TP continuation re-entry monitoring
-                        if self.config["re_entry_config"]["tp_reentry_enabled"]:
-                            self.price_monitor.register_tp_continuation(trade, current_price, trade.strategy)
-                        continue
-                    
-                    # Check trend reversal exit
-                    if self.should_exit_by_trend_reversal(trade):
-                        await self.close_trade(trade, "TREND_REVERSAL", current_price)
-                        continue
+                if len(self.open_trades):
+                    await self.evaluate_open_trades()
                 
                 await asyncio.sleep(5)
                 
@@ -482,6 +651,52 @@ class TradingEngine:
                 print(f"Error: {e}")
                 await asyncio.sleep(30)
 
+    async def get_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """One price per symbol - from the tick cache, MT5 only for symbols without a fresh tick"""
+        return {symbol: await self.mt5.get_current_price(symbol) for symbol in symbols}
+
+    def active_symbols(self) -> Set[str]:
+        """Symbols the tick cache keeps polling: open trades and pending re-entries"""
+        return set(self.open_trades.symbols()) | self.price_monitor.monitored_symbols
+
+    async def evaluate_open_trades(self):
+        """
+        One management cycle: fetch one price per symbol, find SL/TP hits for
+        all open trades with vectorized comparisons, then check trend reversal
+        for the rest. Closes take the symbol lock so they stay ordered with alerts.
+        """
+        prices = await self.get_prices(self.open_trades.symbols())
+        sl_hits, tp_hits = self.open_trades.evaluate_levels(prices)
+        handled = set()
+        
+        for trade in sl_hits:
+            handled.add(id(trade))
+            current_price = prices[trade.symbol]
+            async with self.symbol_lock(trade.symbol):
+                if trade not in self.open_trades:
+                    continue
+                await self.close_trade(trade, "SL_HIT", current_price)
+            await self.state.execute(self.book_sl_hit, trade)
+        
+        for trade in tp_hits:
+            handled.add(id(trade))
+            current_price = prices[trade.symbol]
+            async with self.symbol_lock(trade.symbol):
+                if trade not in self.open_trades:
+                    continue
+                await self.close_trade(trade, "TP_HIT", current_price)
+            await self.state.execute(self.book_tp_hit, trade, current_price)
+        
+        # Check trend reversal exit for trades that did not hit SL/TP
+        for trade in self.open_trades:
+            current_price = prices.get(trade.symbol, 0)
+            if id(trade) in handled or not current_price:
+                continue
+            if self.should_exit_by_trend_reversal(trade):
+                async with self.symbol_lock(trade.symbol):
+                    if trade in self.open_trades:
+                        await self.close_trade(trade, "TREND_REVERSAL", current_price)
+
     def should_exit_by_trend_reversal(self, trade: Trade) -> bool:
         """Check if we should exit due to trend reversal"""
         # Grace period: Don't exit trades within first 5 minutes of entry
@@ -513,19 +728,18 @@ class TradingEngine:
         try:
             # Try to close in MT5 (skip if simulating)
             if not self.config["simulate_orders"] and trade.trade_id:
-                success = self.mt5_client.close_position(trade.trade_id)
+                # Netted position shared with other open trades: close only this trade's volume
+                shared = any(other is not trade for other in self.open_trades.by_trade_id(trade.trade_id))
+                success = await self.mt5.close_position(
+                    trade.trade_id, volume=trade.lot_size if shared else None
+                )
                 if not success:
                     self.telegram_bot.send_message(f"❌ Failed to close trade {trade.trade_id} - will retry on next cycle")
                     return  # Don't mark as closed if MT5 close failed - keep retrying!
             
             # Only mark as closed if MT5 close succeeded or we're in simulation
-            trade.status = "closed"
-            trade.close_time = datetime.now().isoformat()
-            self.risk_manager.remove_open_trade(trade)
-            
-            # Remove from open trades list immediately
-            if trade in self.open_trades:
-                self.open_trades.remove(trade)
+            # Removed from the open-trade book immediately (shared with the risk manager)
+            await self.state.execute(self.book_closed_trade, trade)
             
             # Calculate PnL using proper pip values per symbol
             symbol_config = self.config["symbol_config"][trade.symbol]
@@ -571,26 +785,94 @@ class TradingEngine:
             error_msg = f"Trade close error: {str(e)}"
             self.telegram_bot.send_message(f"❌ {error_msg}")
 
-    # Logic control methods
-    def enable_logic(self, logic_number: int):
-        if logic_number == 1:
-            self.logic1_enabled = True
-        elif logic_number == 2:
-            self.logic2_enabled = True
-        elif logic_number == 3:
-            self.logic3_enabled = True
-
-    def disable_logic(self, logic_number: int):
-        if logic_number == 1:
-            self.logic1_enabled = False
-        elif logic_number == 2:
-            self.logic2_enabled = False
-        elif logic_number == 3:
-            self.logic3_enabled = False
+    # State commands - applied one at a time by the state actor (self.state)
+    def book_fresh_trade(self, trade: Trade, strategy: str):
+        """New trade: re-entry chain, SL hunt monitoring, open-trade book"""
+        self.reentry_manager.create_chain(trade)
+        
+        # NEW: Register for SL hunt monitoring (preemptively)
+        if self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
+            self.price_monitor.register_sl_hunt(trade, strategy)
+        
+        self.open_trades.add(trade)
+        self.trade_count += 1
+
+    def book_chain_trade(self, trade: Trade, chain_id: str, count: bool = True):
+        """Re-entry trade: advance its chain and add it to the open-trade book"""
+        self.reentry_manager.update_chain_level(chain_id, trade.trade_id)
+        self.open_trades.add(trade)
+        if count:
+            self.trade_count += 1
+
+    def apply_signal(self, symbol: str, timeframe: str, signal: str):
+        """Bias / trend alert: timeframe trend and current signal"""
+        self.initialize_symbol_signals(symbol)
+        self.trend_manager.update_trend(symbol, timeframe, signal)
+        self.current_signals[symbol][timeframe] = signal
+
+    def apply_signals(self, alerts: List[Alert]):
+        """Batch of bias / trend alerts: one command, one trends file write"""
+        with self.trend_manager.deferred_save():
+            for alert in alerts:
+                self.apply_signal(alert.symbol, alert.tf, alert.signal)
+
+    def book_closed_trade(self, trade: Trade):
+        trade.status = "closed"
+        trade.close_time = datetime.now().isoformat()
+        self.open_trades.remove(trade)
+
+    def book_sl_hit(self, trade: Trade):
+        """SL hit: chain bookkeeping, SL hunt re-entry monitoring"""
+        self.reentry_manager.record_sl_hit(trade)
+        
+        # NEW: Register for SL hunt re-entry monitoring
+        if self.config["re_entry_config"]["sl_hunt_reentry_enabled"]:
+            self.price_monitor.register_sl_hunt(trade, trade.strategy)
+
+    def book_tp_hit(self, trade: Trade, tp_price: float):
+        """TP hit: chain bookkeeping, TP continuation re-entry monitoring"""
+        self.reentry_manager.record_tp_hit(trade, tp_price)
+        
+        # NEW: Register for TP continuation re-entry monitoring
+        if self.config["re_entry_config"]["tp_reentry_enabled"]:
+            self.price_monitor.register_tp_continuation(trade, tp_price, trade.strategy)
+
+    # Exit reasons that keep monitoring for a continuation re-entry
+    EXIT_CONTINUATION_REASONS = ('EXIT_APPEARED', 'TREND_REVERSAL', 'REVERSAL_', 'OPPOSITE_SIGNAL')
+
+    def book_reversal_exits(self, closed_infos: List[Dict[str, Any]]):
+        """Reversal exits: open-trade book, TP continuation stop, exit continuation monitoring"""
+        continuation = self.config["re_entry_config"].get("exit_continuation_enabled", True)
+        for info in closed_infos:
+            trade = info['trade']
+            self.open_trades.remove(trade)
+            
+            # Stop TP continuation monitoring for this symbol (opposite signal received)
+            self.price_monitor.stop_tp_continuation(trade.symbol, f"Exit due to {info['exit_reason']}")
+            
+            # After Exit Appeared/Reversal exit, continue monitoring for re-entry with price gap
+            if continuation and any(reason in info['exit_reason'] for reason in self.EXIT_CONTINUATION_REASONS):
+                self.price_monitor.register_exit_continuation(
+                    trade=trade,
+                    exit_price=info['exit_price'],
+                    exit_reason=info['exit_reason'],
+                    logic=trade.strategy,
+                    timeframe='15M'  # Default timeframe
+                )
+
+    def set_paused(self, paused: bool):
+        self.is_paused = paused
+
+    # Logic control methods - 1 / "LOGIC1" / any registered strategy name
+    def enable_logic(self, logic: Union[int, str]) -> bool:
+        return self.strategies.set_enabled(self._strategy_name(logic), True)
+
+    def disable_logic(self, logic: Union[int, str]) -> bool:
+        return self.strategies.set_enabled(self._strategy_name(logic), False)
+
+    @staticmethod
+    def _strategy_name(logic: Union[int, str]) -> str:
+        return f"LOGIC{logic}" if isinstance(logic, int) else logic.upper()
 
     def get_logic_status(self) -> Dict[str, bool]:
-        return {
-            "logic1": self.logic1_enabled,
-            "logic2": self.logic2_enabled,
-            "logic3": self.logic3_enabled
-        }
\ No newline at end of file
+        return self.strategies.status()
\ No newline at end of file
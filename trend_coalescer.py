@@ -0,0 +1,87 @@
+import asyncio
+from typing import Dict, Tuple, Optional, List
+from models import Alert
+from config import Config
+
+class TrendUpdateCoalescer:
+    """
+    Coalesce bursts of bias/trend alerts
+    1. Keeps only the latest signal per (symbol, tf) within a short window
+    2. Applies all pending updates with a single trends-file write
+    3. Sends one combined Telegram notification per flush
+    Entry alerts call flush(symbol) first, so they always see the newest trend state.
+    """
+
+    def __init__(self, config: Config, trading_engine):
+        self.config = config
+        self.trading_engine = trading_engine
+
+        coalesce_config = config.get("trend_coalescing", {})
+        self.enabled = coalesce_config.get("enabled", True)
+        self.window_seconds = coalesce_config.get("window_ms", 250) / 1000
+
+        # (symbol, tf) -> latest bias/trend alert; insertion order = first arrival
+        self.pending: Dict[Tuple[str, str], Alert] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # A flush waiting on the state actor holds this - a concurrent entry's
+        # flush(symbol) waits until those updates are applied
+        self._lock = asyncio.Lock()
+
+        self.alerts_received = 0
+        self.updates_applied = 0
+        self.flushes = 0
+
+    def submit(self, alert: Alert):
+        """Hold a bias/trend alert until the window closes (later alerts replace earlier ones)"""
+        self.pending[(alert.symbol, alert.tf)] = alert
+        self.alerts_received += 1
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.window_seconds)
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"❌ Trend coalescer flush error: {str(e)}")
+
+    async def flush(self, symbol: Optional[str] = None):
+        """Apply pending updates - all symbols, or just one before its entry is evaluated"""
+        engine = self.trading_engine
+
+        async with self._lock:
+            if symbol is None:
+                keys = list(self.pending.keys())
+            else:
+                keys = [key for key in self.pending if key[0] == symbol]
+
+            if not keys:
+                return
+
+            alerts = [self.pending.pop(key) for key in keys]
+            # One state command, one trends file write
+            await engine.state.execute(engine.apply_signals, alerts)
+
+        lines: List[str] = []
+        for alert in alerts:
+            label = "Bias" if alert.type == 'bias' else "Trend"
+            lines.append(f"{alert.symbol} {alert.tf.upper()} {label} Updated: {alert.signal.upper()}")
+
+        self.updates_applied += len(keys)
+        self.flushes += 1
+
+        if len(lines) == 1:
+            engine.telegram_bot.send_message(f"📊 {lines[0]}")
+        else:
+            engine.telegram_bot.send_message(f"📊 Trend Updates ({len(lines)})\n" + "\n".join(lines))
+
+    def get_stats(self):
+        return {
+            "enabled": self.enabled,
+            "window_ms": int(self.window_seconds * 1000),
+            "pending": len(self.pending),
+            "alerts_received": self.alerts_received,
+            "updates_applied": self.updates_applied,
+            "flushes": self.flushes
+        }